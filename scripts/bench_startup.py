@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+MCP 서버 시작 시간 측정 스크립트
+
+새 프로세스에서 src.mcp_server를 import하는 시간을 여러 번 측정하고,
+stdio 모드에서 웹 스택(FastAPI)이 로드되지 않는지 확인합니다.
+중앙값이 예산(STARTUP_BUDGET_MS)을 넘거나 FastAPI가 로드되면 실패합니다.
+"""
+
+import sys
+import os
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import src.mcp_server\n"
+    "print((time.perf_counter() - start) * 1000)\n"
+    "print(int('fastapi' in sys.modules))\n"
+)
+
+def measure(runs: int) -> tuple[list[float], bool]:
+    """import 시간(ms) 목록과 FastAPI 로드 여부 반환"""
+    timings = []
+    loaded_fastapi = False
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        elapsed, fastapi_flag = result.stdout.split()
+        timings.append(float(elapsed))
+        loaded_fastapi = loaded_fastapi or fastapi_flag == "1"
+    return timings, loaded_fastapi
+
+def top_imports(limit: int) -> list[tuple[int, str]]:
+    """-X importtime 결과에서 src.mcp_server가 직접 불러온 모듈 중 누적 시간이 큰 순으로 반환"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.mcp_server"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 들여쓰기 깊이: 최상위(src 패키지) 1칸, 그 아래 단계마다 2칸씩
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 2:
+            modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP 서버 시작 시간 측정")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수")
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.getenv("STARTUP_BUDGET_MS", "1000")),
+                        help="import 시간 중앙값 예산 (ms)")
+    parser.add_argument("--top", type=int, default=10, help="표시할 최상위 import 수")
+    args = parser.parse_args()
+
+    print("=== MCP 서버 시작 시간 측정 ===\n")
+    timings, loaded_fastapi = measure(args.runs)
+    median = statistics.median(timings)
+    print(f"import src.mcp_server: 중앙값 {median:.0f}ms, 최소 {min(timings):.0f}ms, 최대 {max(timings):.0f}ms ({args.runs}회)")
+    print(f"예산: {args.budget_ms:.0f}ms")
+
+    print(f"\n누적 import 시간 상위 {args.top}개:")
+    for cumulative, name in top_imports(args.top):
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    failed = False
+    if loaded_fastapi:
+        print("\n❌ stdio 모드 import 중 FastAPI가 로드되었습니다.")
+        failed = True
+    if median > args.budget_ms:
+        print(f"\n❌ 시작 시간이 예산을 초과했습니다: {median:.0f}ms > {args.budget_ms:.0f}ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("\n✅ 시작 시간 예산 이내입니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+로컬 Graph 모의 서버를 상대로 한 성능 벤치마크
+
+scripts/mock_graph.py를 별도 프로세스로 띄우고 OutlookClient와 MCP 도구(handle_call_tool)를
+시나리오별로 반복 실행하여 처리량과 p50/p95/p99 지연 시간을 출력합니다.
+실제 Graph나 Azure 앱 등록 없이 오프라인(CI)에서 실행할 수 있습니다.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+import json
+import math
+import socket
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+SCENARIOS = [
+    "calendar_view", "events_filter", "batch_create", "get_schedule",
+    "token_refresh", "tool_get_events", "tool_find_meeting_times"
+]
+
+def percentile(values: List[float], p: float) -> float:
+    """최근접 순위 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_mock_server(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    """모의 서버 프로세스를 띄우고 응답할 때까지 대기"""
+    process = subprocess.Popen([
+        sys.executable, os.path.join(os.path.dirname(__file__), "mock_graph.py"),
+        "--port", str(port),
+        "--events", str(args.events),
+        "--latency-ms", str(args.latency_ms),
+        "--max-page-size", str(args.max_page_size),
+        "--throttle-rate", str(args.throttle_rate),
+        "--retry-after", str(args.retry_after)
+    ], stdout=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise Exception("모의 서버가 시작되지 않았습니다")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise Exception("모의 서버 시작 대기 시간 초과")
+
+def configure_environment(port: int, workdir: str):
+    """src 모듈을 import하기 전에 모의 서버와 임시 저장소를 가리키도록 설정"""
+    os.environ.update({
+        "GRAPH_API_ENDPOINT": f"http://127.0.0.1:{port}/v1.0",
+        "AUTHORITY": f"http://127.0.0.1:{port}/common",
+        "AZURE_CLIENT_ID": "benchmark-client",
+        "AZURE_CLIENT_SECRET": "benchmark-secret",
+        "TOKEN_FILE": os.path.join(workdir, "token.json"),
+        "TOKEN_DB_FILE": os.path.join(workdir, "tokens.db"),
+        "SYNC_DB_FILE": os.path.join(workdir, "events.db"),
+        "SEARCH_DB_FILE": os.path.join(workdir, "search.db"),
+        "DEFAULT_ACCOUNT": "",
+        "HTTP_WARMUP": "false",
+        "WEB_SERVER": "never"
+    })
+
+async def run_scenario(operation: Callable[[int], Awaitable[bool]], iterations: int,
+                       concurrency: int) -> Dict[str, Any]:
+    """operation을 concurrency개씩 동시에 iterations번 실행하고 지연 시간 통계 반환"""
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_once(index: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                ok = await operation(index)
+            except Exception:
+                ok = False
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_once(index) for index in range(iterations)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "iterations": iterations,
+        "errors": errors,
+        "throughput": iterations / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99)
+    }
+
+async def run_benchmarks(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    from src import mcp_server
+    from src.graph_scheduler import graph_scheduler
+    from src.http_client import close_http_client
+
+    # 토큰 엔드포인트와 /me를 거쳐 로그인
+    auth_manager = mcp_server.auth_manager
+    token_data = await auth_manager.exchange_code_for_token("benchmark-code")
+    account = token_data["account"]
+    client = mcp_server.get_outlook_client(account)
+
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = today.strftime("%Y-%m-%dT%H:%M:%SZ")
+    end = (today + timedelta(days=args.range_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    attendees = [f"user{index}@example.com" for index in range(args.attendees)]
+
+    async def calendar_view(index: int) -> bool:
+        await client.get_events(start, end, max_results=0)
+        return True
+
+    async def events_filter(index: int) -> bool:
+        await client.get_events(start_date=start, max_results=args.max_results)
+        return True
+
+    async def batch_create(index: int) -> bool:
+        slot = today + timedelta(days=1, minutes=30 * index)
+        results = await client.batch_create_events([
+            {
+                "subject": f"벤치마크 생성 {index}-{item}",
+                "start_time": (slot + timedelta(days=item)).strftime("%Y-%m-%dT%H:%M:%S"),
+                "end_time": (slot + timedelta(days=item, minutes=30)).strftime("%Y-%m-%dT%H:%M:%S")
+            }
+            for item in range(args.batch_size)
+        ])
+        return all(200 <= result.get("status", 0) < 300 for result in results)
+
+    async def get_schedule(index: int) -> bool:
+        schedules = await client.get_schedule(attendees, start, end)
+        return not any(schedule["error"] for schedule in schedules.values())
+
+    async def token_refresh(index: int) -> bool:
+        await auth_manager.refresh_token("mock-refresh", account)
+        return True
+
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> bool:
+        result = await mcp_server.handle_call_tool(name, {**arguments, "account": account})
+        return not result[0].text.startswith("오류 발생")
+
+    def shifted_range(index: int) -> Dict[str, str]:
+        """반복마다 범위를 1시간씩 옮김 (같은 인자를 반복하면 응답 캐시 적중만 측정하게 됨)"""
+        shift = timedelta(hours=index)
+        return {
+            "start_date": (today + shift).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "end_date": (today + shift + timedelta(days=args.range_days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        }
+
+    async def tool_get_events(index: int) -> bool:
+        return await call_tool("get_events", {**shifted_range(index), "format": "compact"})
+
+    async def tool_find_meeting_times(index: int) -> bool:
+        return await call_tool("find_meeting_times", {
+            **shifted_range(index), "attendees": attendees, "duration_minutes": 30
+        })
+
+    operations = {
+        "calendar_view": calendar_view,
+        "events_filter": events_filter,
+        "batch_create": batch_create,
+        "get_schedule": get_schedule,
+        "token_refresh": token_refresh,
+        "tool_get_events": tool_get_events,
+        "tool_find_meeting_times": tool_find_meeting_times
+    }
+
+    results = {}
+    try:
+        for name in args.scenarios:
+            # 첫 호출(커넥션 수립, 미러 초기 동기화)은 측정에서 제외
+            await operations[name](-1)
+            results[name] = await run_scenario(operations[name], args.iterations, args.concurrency)
+            print_result(name, results[name])
+        results["_graph"] = graph_scheduler.stats()
+    finally:
+        await close_http_client()
+    return results
+
+def print_result(name: str, result: Dict[str, Any]):
+    print(
+        f"{name:<24} {result['iterations']:>6} {result['errors']:>6} {result['throughput']:>9.1f} "
+        f"{result['p50']:>9.1f} {result['p95']:>9.1f} {result['p99']:>9.1f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 Graph 모의 서버 기반 벤치마크")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS, help="실행할 시나리오")
+    parser.add_argument("--iterations", type=int, default=50, help="시나리오별 반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 실행 수")
+    parser.add_argument("--events", type=int, default=2000, help="모의 캘린더 일정 개수")
+    parser.add_argument("--latency-ms", type=float, default=20, help="모의 서버 응답 지연 (ms)")
+    parser.add_argument("--max-page-size", type=int, default=100, help="모의 서버 페이지당 최대 일정 수")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="모의 서버 429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="429 응답의 Retry-After (초)")
+    parser.add_argument("--range-days", type=int, default=7, help="조회 범위 (일)")
+    parser.add_argument("--max-results", type=int, default=200, help="events_filter 최대 결과 수")
+    parser.add_argument("--batch-size", type=int, default=10, help="batch_create 한 번에 생성할 일정 수")
+    parser.add_argument("--attendees", type=int, default=5, help="get_schedule 참석자 수")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 (CI 비교용)")
+    args = parser.parse_args()
+
+    port = free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        process = start_mock_server(args, port)
+        try:
+            configure_environment(port, workdir)
+            print(f"=== Graph 모의 서버 벤치마크 (일정 {args.events}개, 지연 {args.latency_ms}ms, "
+                  f"동시 {args.concurrency}, 반복 {args.iterations}) ===\n")
+            print(f"{'scenario':<24} {'ops':>6} {'errors':>6} {'ops/s':>9} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+            results = asyncio.run(run_benchmarks(args))
+        finally:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+if __name__ == "__main__":
+    main()
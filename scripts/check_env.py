@@ -35,6 +35,8 @@ def check_environment():
     print(f"HOST: {config.HOST}")
     print(f"PORT: {config.PORT}")
     print(f"TOKEN_FILE: {config.TOKEN_FILE}")
+    print(f"TOKEN_DB_FILE: {config.TOKEN_DB_FILE}")
+    print(f"DEFAULT_ACCOUNT: {config.DEFAULT_ACCOUNT or '(가장 최근 로그인한 계정)'}")
 
     # Graph API
     print(f"\nMicrosoft Graph:")
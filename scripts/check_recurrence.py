@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+반복 일정 로컬 전개 검증 스크립트
+
+Graph 형식의 시리즈 마스터 예제를 src.recurrence.expand_series로 전개하고
+기대한 회차(UTC 시작 시각)와 비교합니다. 네트워크 없이 실행되며, 하나라도 다르면 실패합니다.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from src.outlook_client import SERIES_MASTER_FIELDS
+from src.recurrence import expand_series
+
+def master(master_id: str, start: str, end: str, pattern: Dict[str, Any], recurrence_range: Dict[str, Any],
+           **extra: Any) -> Dict[str, Any]:
+    """UTC로 조회한 시리즈 마스터"""
+    return {
+        "id": master_id,
+        "subject": master_id,
+        "type": "seriesMaster",
+        "start": {"dateTime": start + ".0000000", "timeZone": "UTC"},
+        "end": {"dateTime": end + ".0000000", "timeZone": "UTC"},
+        "recurrence": {"pattern": pattern, "range": recurrence_range},
+        **extra
+    }
+
+def utc(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+CASES: List[Dict[str, Any]] = [
+    {
+        "name": "평일 스탠드업 (취소 1회, 이동 1회)",
+        "master": master(
+            "standup", "2024-03-04T00:30:00", "2024-03-04T00:45:00",
+            {"type": "weekly", "interval": 1, "daysOfWeek": ["monday", "tuesday", "wednesday", "thursday", "friday"],
+             "firstDayOfWeek": "sunday"},
+            {"type": "noEnd", "startDate": "2024-03-04", "recurrenceTimeZone": "Korea Standard Time"},
+            cancelledOccurrences=["OID.standup.2024-03-06"],
+            exceptionOccurrences=[{
+                "id": "standup-moved", "type": "exception", "subject": "standup",
+                "originalStart": "2024-03-07T00:30:00Z",
+                "start": {"dateTime": "2024-03-07T05:00:00.0000000", "timeZone": "UTC"},
+                "end": {"dateTime": "2024-03-07T05:15:00.0000000", "timeZone": "UTC"}
+            }]
+        ),
+        "window": ("2024-03-04T00:00:00", "2024-03-11T00:00:00"),
+        "expected": [
+            "2024-03-04T00:30:00", "2024-03-05T00:30:00", "2024-03-07T05:00:00", "2024-03-08T00:30:00"
+        ]
+    },
+    {
+        "name": "매월 마지막 금요일",
+        "master": master(
+            "last-friday", "2024-01-26T09:00:00", "2024-01-26T10:00:00",
+            {"type": "relativeMonthly", "interval": 1, "daysOfWeek": ["friday"], "index": "last"},
+            {"type": "noEnd", "startDate": "2024-01-26", "recurrenceTimeZone": "UTC"}
+        ),
+        "window": ("2024-01-01T00:00:00", "2024-05-01T00:00:00"),
+        "expected": [
+            "2024-01-26T09:00:00", "2024-02-23T09:00:00", "2024-03-29T09:00:00", "2024-04-26T09:00:00"
+        ]
+    },
+    {
+        "name": "매월 31일 (짧은 달은 마지막 날)",
+        "master": master(
+            "month-end", "2024-01-31T12:00:00", "2024-01-31T13:00:00",
+            {"type": "absoluteMonthly", "interval": 1, "dayOfMonth": 31},
+            {"type": "endDate", "startDate": "2024-01-31", "endDate": "2024-04-30", "recurrenceTimeZone": "UTC"}
+        ),
+        "window": ("2024-01-01T00:00:00", "2024-12-31T00:00:00"),
+        "expected": [
+            "2024-01-31T12:00:00", "2024-02-29T12:00:00", "2024-03-31T12:00:00", "2024-04-30T12:00:00"
+        ]
+    },
+    {
+        "name": "이틀마다 5회",
+        "master": master(
+            "numbered", "2024-06-01T08:00:00", "2024-06-01T08:30:00",
+            {"type": "daily", "interval": 2},
+            {"type": "numbered", "startDate": "2024-06-01", "numberOfOccurrences": 5, "recurrenceTimeZone": "UTC"},
+            cancelledOccurrences=["OID.numbered.2024-06-05"]
+        ),
+        "window": ("2024-05-01T00:00:00", "2024-07-01T00:00:00"),
+        "expected": [
+            "2024-06-01T08:00:00", "2024-06-03T08:00:00", "2024-06-07T08:00:00", "2024-06-09T08:00:00"
+        ]
+    },
+    {
+        "name": "매년 3월 둘째 화요일 (범위 중간부터)",
+        "master": master(
+            "yearly", "2020-03-10T15:00:00", "2020-03-10T16:00:00",
+            {"type": "relativeYearly", "interval": 1, "month": 3, "daysOfWeek": ["tuesday"], "index": "second"},
+            {"type": "noEnd", "startDate": "2020-03-10", "recurrenceTimeZone": "UTC"}
+        ),
+        "window": ("2023-01-01T00:00:00", "2026-01-01T00:00:00"),
+        "expected": ["2023-03-14T15:00:00", "2024-03-12T15:00:00", "2025-03-11T15:00:00"]
+    },
+    {
+        "name": "서머타임 전환 (현지 09:00 유지)",
+        "master": master(
+            "dst", "2024-03-08T17:00:00", "2024-03-08T17:30:00",
+            {"type": "daily", "interval": 1},
+            {"type": "endDate", "startDate": "2024-03-08", "endDate": "2024-03-12",
+             "recurrenceTimeZone": "Pacific Standard Time"}
+        ),
+        "window": ("2024-03-01T00:00:00", "2024-04-01T00:00:00"),
+        "expected": [
+            "2024-03-08T17:00:00", "2024-03-09T17:00:00", "2024-03-10T16:00:00",
+            "2024-03-11T16:00:00", "2024-03-12T16:00:00"
+        ]
+    },
+    {
+        "name": "격주 월/목 (주 시작 월요일)",
+        "master": master(
+            "biweekly", "2024-01-04T10:00:00", "2024-01-04T11:00:00",
+            {"type": "weekly", "interval": 2, "daysOfWeek": ["monday", "thursday"], "firstDayOfWeek": "monday"},
+            {"type": "noEnd", "startDate": "2024-01-04", "recurrenceTimeZone": "UTC"}
+        ),
+        "window": ("2024-01-01T00:00:00", "2024-01-20T00:00:00"),
+        "expected": ["2024-01-04T10:00:00", "2024-01-15T10:00:00", "2024-01-18T10:00:00"]
+    },
+    {
+        "name": "취소/예외 회차 필드가 없는 마스터 (모든 회차 전개)",
+        "master": master(
+            "plain", "2024-05-06T01:00:00", "2024-05-06T02:00:00",
+            {"type": "weekly", "interval": 1, "daysOfWeek": ["monday"], "firstDayOfWeek": "sunday"},
+            {"type": "numbered", "startDate": "2024-05-06", "numberOfOccurrences": 3,
+             "recurrenceTimeZone": "Korea Standard Time"}
+        ),
+        "window": ("2024-05-01T00:00:00", "2024-06-01T00:00:00"),
+        "expected": ["2024-05-06T01:00:00", "2024-05-13T01:00:00", "2024-05-20T01:00:00"]
+    }
+]
+
+def main():
+    print("=== 반복 일정 로컬 전개 검증 ===\n")
+    failed = 0
+
+    # cancelledOccurrences는 $select하지 않으면 Graph가 돌려주지 않아 취소된 회차가 다시 나타남
+    if "cancelledOccurrences" in SERIES_MASTER_FIELDS:
+        print("✅ 시리즈 마스터 조회에 cancelledOccurrences 포함")
+    else:
+        failed += 1
+        print("❌ 시리즈 마스터 조회에 cancelledOccurrences 없음")
+
+    for case in CASES:
+        window_start, window_end = (utc(value) for value in case["window"])
+        occurrences = expand_series(case["master"], window_start, window_end)
+        actual = [event["start"]["dateTime"].split(".")[0] for event in occurrences]
+        if actual == case["expected"]:
+            print(f"✅ {case['name']}")
+        else:
+            failed += 1
+            print(f"❌ {case['name']}\n   기대: {case['expected']}\n   결과: {actual}")
+
+    if failed:
+        print(f"\n{failed}개 실패")
+        sys.exit(1)
+    print(f"\n{len(CASES) + 1}개 모두 통과")
+
+if __name__ == "__main__":
+    main()
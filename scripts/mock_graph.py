@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+벤치마크용 로컬 Microsoft Graph 모의 서버
+
+/me/events, /me/calendarView(/delta), $batch, getSchedule, 토큰 엔드포인트를 흉내 내며
+응답 지연, 페이지 크기, 스로틀링(429 + Retry-After), 일정 개수를 설정할 수 있습니다.
+단건 일정은 ETag 조건부 요청(If-None-Match -> 304, If-Match 불일치 -> 412)을 지원합니다.
+/subscriptions로 구독하면 validationToken 검증 후 일정이 바뀔 때마다 notificationUrl로 변경 알림을 보냅니다.
+--calendars로 /me/calendars에 보조 캘린더(읽기 전용, 각자 calendarView 제공)를 추가할 수 있습니다.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlencode, urlsplit, parse_qsl
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from src.time_utils import format_utc, parse_graph_datetime
+
+Result = Tuple[int, Dict[str, str], Optional[Dict[str, Any]]]
+
+def spread_slot(index: int, count: int, slots: int) -> int:
+    """count개 일정 중 index번째의 슬롯 (slots개 슬롯에 균등 분포, 7919와 서로소이면 순서를 섞음)"""
+    position = (index * 7919) % count if math.gcd(7919, count) == 1 else index
+    return position * slots // count
+
+class MockGraph:
+    """모의 일정 데이터와 Graph 요청 처리"""
+
+    def __init__(self, events: int = 2000, latency_ms: float = 20, jitter_ms: float = 5,
+                 max_page_size: int = 100, throttle_rate: float = 0.0, retry_after: float = 1,
+                 seed: int = 42, calendars: int = 0, calendar_events: int = 200):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.max_page_size = max_page_size
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.base_url = ""
+
+        # 변경 이력 (델타 조회용): version마다 (id, 삭제 여부)
+        self.version = 0
+        self.changes: List[Tuple[int, str, bool]] = []
+        self.events: Dict[str, Dict[str, Any]] = {}
+
+        # 변경 알림 구독과 아직 보내지 않은 알림 (notificationUrl, 본문)
+        self.subscriptions: Dict[str, Dict[str, Any]] = {}
+        self.outbox: List[Tuple[str, Dict[str, Any]]] = []
+        # 전송 중인 알림 작업 (서버 종료 시 취소)
+        self._deliveries: Set[asyncio.Task] = set()
+
+        # 오늘 기준 -30일 ~ +180일 범위에 30분 단위로 고르게 분산 (일정 수와 관계없이 어느 구간에나 일정이 있도록
+        # 구간을 일정 수만큼 균등하게 나누고, ID 순서와 시간 순서가 같지 않도록 순서만 섞음)
+        window_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=30)
+        slots = 210 * 48
+        for index in range(events):
+            start = window_start + timedelta(minutes=30 * spread_slot(index, events, slots))
+            self._put(self._make_event(f"event-{index:06d}", f"벤치마크 일정 {index}", start,
+                                       start + timedelta(minutes=30 * (1 + index % 3))))
+        self.changes.clear()
+
+        # 보조 캘린더: 캘린더 ID -> {일정 ID: 일정} (기본 캘린더와 시간이 겹치지 않도록 15분 어긋나게)
+        self.calendars: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for number in range(1, calendars + 1):
+            calendar_id = f"calendar-{number}"
+            self.calendars[calendar_id] = {}
+            for index in range(calendar_events):
+                slot = (spread_slot(index, calendar_events, slots) + number * 7) % slots
+                start = window_start + timedelta(minutes=30 * slot + 15)
+                event = self._make_event(f"{calendar_id}-event-{index:06d}", f"캘린더 {number} 일정 {index}",
+                                         start, start + timedelta(minutes=30))
+                event["@odata.etag"] = 'W/"0"'
+                self.calendars[calendar_id][event["id"]] = event
+
+    @staticmethod
+    def _make_event(event_id: str, subject: str, start: datetime, end: datetime) -> Dict[str, Any]:
+        return {
+            "id": event_id,
+            "subject": subject,
+            "bodyPreview": "",
+            "body": {"contentType": "text", "content": ""},
+            "start": {"dateTime": format_utc(start) + ".0000000", "timeZone": "UTC"},
+            "end": {"dateTime": format_utc(end) + ".0000000", "timeZone": "UTC"},
+            "location": {"displayName": "회의실 A"},
+            "attendees": [],
+            "organizer": {"emailAddress": {"address": "bench@example.com"}},
+            "showAs": "busy",
+            "isCancelled": False,
+            "type": "singleInstance"
+        }
+
+    def _put(self, event: Dict[str, Any]):
+        change_type = "updated" if event["id"] in self.events else "created"
+        self.version += 1
+        event["@odata.etag"] = f'W/"{self.version}"'
+        self.events[event["id"]] = event
+        self.changes.append((self.version, event["id"], False))
+        self._notify(event["id"], change_type)
+
+    def _remove(self, event_id: str):
+        del self.events[event_id]
+        self.version += 1
+        self.changes.append((self.version, event_id, True))
+        self._notify(event_id, "deleted")
+
+    def _notify(self, event_id: str, change_type: str):
+        """구독마다 변경 알림을 보낼 목록에 추가"""
+        for subscription in self.subscriptions.values():
+            if change_type not in subscription["changeType"].split(","):
+                continue
+            self.outbox.append((subscription["notificationUrl"], {"value": [{
+                "subscriptionId": subscription["id"],
+                "clientState": subscription.get("clientState"),
+                "changeType": change_type,
+                "resource": f"Users/bench-user/Events/{event_id}",
+                "resourceData": {"@odata.type": "#Microsoft.Graph.Event", "id": event_id},
+                "subscriptionExpirationDateTime": subscription["expirationDateTime"]
+            }]}))
+
+    def schedule_delivery(self):
+        """쌓인 변경 알림이 있으면 백그라운드에서 전송"""
+        if not self.outbox:
+            return
+        task = asyncio.create_task(self.deliver())
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+    async def stop_deliveries(self):
+        """전송 중인 알림 작업 취소"""
+        tasks = list(self._deliveries)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def deliver(self):
+        """쌓인 변경 알림 전송 (응답은 확인하지 않음)"""
+        outbox, self.outbox = self.outbox, []
+        async with httpx.AsyncClient(timeout=5) as client:
+            for url, payload in outbox:
+                try:
+                    await client.post(url, json=payload)
+                except httpx.HTTPError as e:
+                    print(f"변경 알림 전송 실패: {url} {e}")
+
+    async def validate(self, notification_url: str) -> bool:
+        """구독 생성 전 notificationUrl 검증 (validationToken을 그대로 돌려줘야 함)"""
+        token = uuid.uuid4().hex
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.post(notification_url, params={"validationToken": token})
+        except httpx.HTTPError:
+            return False
+        return response.status_code == 200 and response.text == token
+
+    async def delay(self):
+        """응답 지연"""
+        await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+
+    def throttled(self) -> Optional[Result]:
+        """throttle_rate 확률로 429 응답"""
+        if self.throttle_rate and self.random.random() < self.throttle_rate:
+            return 429, {"Retry-After": str(self.retry_after)}, {
+                "error": {"code": "TooManyRequests", "message": "모의 스로틀링"}
+            }
+        return None
+
+    @staticmethod
+    def _project(event: Dict[str, Any], select: Optional[str]) -> Dict[str, Any]:
+        if not select:
+            return event
+        fields = set(select.split(",")) | {"id", "@odata.etag"}
+        return {key: value for key, value in event.items() if key in fields}
+
+    def _range(self, start: Optional[datetime], end: Optional[datetime], by_start_only: bool = False,
+               events: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """범위 내 일정 (시작 시간 순, events를 지정하지 않으면 기본 캘린더)"""
+        result = []
+        for event in (self.events if events is None else events).values():
+            event_start = parse_graph_datetime(event["start"]["dateTime"])
+            event_end = parse_graph_datetime(event["end"]["dateTime"])
+            if by_start_only:
+                if (start and event_start < start) or (end and event_end > end):
+                    continue
+            elif (start and event_end <= start) or (end and event_start >= end):
+                continue
+            result.append(event)
+        return sorted(result, key=lambda event: event["start"]["dateTime"])
+
+    def _page(self, path: str, params: Dict[str, str], items: List[Dict[str, Any]],
+              page_size: int) -> Dict[str, Any]:
+        """$skip 기반 페이지와 @odata.nextLink"""
+        skip = int(params.get("$skip", 0))
+        page_size = max(1, min(page_size, self.max_page_size))
+        page = items[skip:skip + page_size]
+        body: Dict[str, Any] = {"value": [self._project(event, params.get("$select")) for event in page]}
+        if skip + page_size < len(items):
+            body["@odata.nextLink"] = f"{self.base_url}{path}?" + urlencode({**params, "$skip": skip + page_size})
+        return body
+
+    @staticmethod
+    def _max_page_size(headers: Dict[str, str], default: int) -> int:
+        match = re.search(r"odata\.maxpagesize=(\d+)", headers.get("prefer", ""))
+        return int(match.group(1)) if match else default
+
+    def dispatch(self, method: str, url: str, body: Optional[Dict[str, Any]],
+                 headers: Dict[str, str]) -> Result:
+        """Graph 요청 하나 처리 (url은 /v1.0 이후 경로와 쿼리)"""
+        parts = urlsplit(url)
+        path = parts.path.rstrip("/")
+        params = dict(parse_qsl(parts.query))
+
+        if path == "/me" and method == "GET":
+            return 200, {}, {
+                "id": "bench-user", "displayName": "Benchmark User",
+                "mail": "bench@example.com", "userPrincipalName": "bench@example.com"
+            }
+
+        if path == "/me/calendarView" and method == "GET":
+            items = self._range(parse_graph_datetime(params["startDateTime"]),
+                                parse_graph_datetime(params["endDateTime"]))
+            return 200, {}, self._page(path, params, items, int(params.get("$top", 10)))
+
+        if path == "/me/calendars" and method == "GET":
+            calendars = [{"id": "calendar-default", "name": "Calendar", "canEdit": True, "isDefaultCalendar": True,
+                          "owner": {"name": "Benchmark User", "address": "bench@example.com"}}]
+            calendars.extend(
+                {"id": calendar_id, "name": f"보조 캘린더 {calendar_id.split('-')[1]}", "canEdit": False,
+                 "isDefaultCalendar": False, "owner": {"name": "Shared", "address": f"{calendar_id}@example.com"}}
+                for calendar_id in self.calendars
+            )
+            return 200, {}, {"value": calendars}
+
+        match = re.fullmatch(r"/me/calendars/([^/]+)/calendarView", path)
+        if match and method == "GET":
+            if match.group(1) not in self.calendars:
+                return 404, {}, {"error": {"code": "ErrorItemNotFound", "message": "캘린더 없음"}}
+            items = self._range(parse_graph_datetime(params["startDateTime"]),
+                                parse_graph_datetime(params["endDateTime"]), events=self.calendars[match.group(1)])
+            return 200, {}, self._page(path, params, items, int(params.get("$top", 10)))
+
+        if path == "/me/calendarView/delta" and method == "GET":
+            return self._delta(path, params, headers)
+
+        if path == "/me/events" and method == "GET":
+            query = params.get("$filter", "")
+            # 모의 캘린더에는 단일 일정만 있음
+            if "type eq 'seriesMaster'" in query:
+                return 200, {}, {"value": []}
+            overlap_end = re.search(r"start/dateTime lt '([^']+)'", query)
+            overlap_start = re.search(r"end/dateTime gt '([^']+)'", query)
+            if overlap_end or overlap_start:
+                items = self._range(parse_graph_datetime(overlap_start.group(1)) if overlap_start else None,
+                                    parse_graph_datetime(overlap_end.group(1)) if overlap_end else None)
+                return 200, {}, self._page(path, params, items, int(params.get("$top", 10)))
+            start = re.search(r"start/dateTime ge '([^']+)'", query)
+            end = re.search(r"end/dateTime le '([^']+)'", query)
+            items = self._range(parse_graph_datetime(start.group(1)) if start else None,
+                                parse_graph_datetime(end.group(1)) if end else None, by_start_only=True)
+            return 200, {}, self._page(path, params, items, int(params.get("$top", 10)))
+
+        if path == "/me/events" and method == "POST":
+            # 같은 transactionId로 다시 만들면 Graph처럼 기존 일정을 반환
+            existing = next((event for event in self.events.values()
+                             if body.get("transactionId") and event.get("transactionId") == body["transactionId"]), None)
+            if existing is not None:
+                return 201, {}, existing
+            event = self._make_event(
+                str(uuid.uuid4()), body.get("subject", ""),
+                parse_graph_datetime(body["start"]["dateTime"]), parse_graph_datetime(body["end"]["dateTime"])
+            )
+            event.update({key: value for key, value in body.items() if key not in ("start", "end")})
+            self._put(event)
+            return 201, {}, event
+
+        match = re.fullmatch(r"/me/events/([^/]+)", path)
+        if match:
+            event = self.events.get(match.group(1))
+            if event is None:
+                return 404, {}, {"error": {"code": "ErrorItemNotFound", "message": "일정 없음"}}
+            etag = event["@odata.etag"]
+            if method == "GET":
+                if headers.get("if-none-match") == etag:
+                    return 304, {"ETag": etag}, None
+                return 200, {"ETag": etag}, self._project(event, params.get("$select"))
+            if headers.get("if-match") not in (None, "*", etag):
+                return 412, {}, {"error": {"code": "ErrorIrresolvableConflict", "message": "ETag 불일치"}}
+            if method == "PATCH":
+                event = {**event, **body}
+                self._put(event)
+                return 200, {}, event
+            if method == "DELETE":
+                self._remove(event["id"])
+                return 204, {}, None
+
+        if path == "/me/calendar/getSchedule" and method == "POST":
+            return 200, {}, self._schedule(body)
+
+        if path == "/subscriptions" and method == "POST":
+            subscription = {**body, "id": str(uuid.uuid4())}
+            self.subscriptions[subscription["id"]] = subscription
+            return 201, {}, subscription
+
+        match = re.fullmatch(r"/subscriptions/([^/]+)", path)
+        if match:
+            subscription = self.subscriptions.get(match.group(1))
+            if subscription is None:
+                return 404, {}, {"error": {"code": "ResourceNotFound", "message": "구독 없음"}}
+            if method == "PATCH":
+                subscription["expirationDateTime"] = body["expirationDateTime"]
+                return 200, {}, subscription
+            if method == "DELETE":
+                del self.subscriptions[subscription["id"]]
+                return 204, {}, None
+
+        return 404, {}, {"error": {"code": "NotFound", "message": f"{method} {path}"}}
+
+    def _delta(self, path: str, params: Dict[str, str], headers: Dict[str, str]) -> Result:
+        """calendarView 델타 (초기 동기화는 $skip 페이지, 이후에는 변경 이력)"""
+        if "$deltatoken" in params:
+            since = int(params["$deltatoken"])
+            latest: Dict[str, bool] = {}
+            for version, event_id, removed in self.changes:
+                if version > since:
+                    latest[event_id] = removed
+            value = [
+                {"id": event_id, "@removed": {"reason": "deleted"}} if removed else self.events[event_id]
+                for event_id, removed in latest.items()
+            ]
+            return 200, {}, {"value": value, "@odata.deltaLink": self._delta_link(path)}
+
+        items = self._range(parse_graph_datetime(params["startDateTime"]), parse_graph_datetime(params["endDateTime"]))
+        body = self._page(path, params, items, self._max_page_size(headers, 100))
+        if "@odata.nextLink" not in body:
+            body["@odata.deltaLink"] = self._delta_link(path)
+        return 200, {}, body
+
+    def _delta_link(self, path: str) -> str:
+        return f"{self.base_url}{path}?" + urlencode({"$deltatoken": self.version})
+
+    def _schedule(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """참석자마다 일정의 일부를 바쁜 시간으로 반환"""
+        start = parse_graph_datetime(body["startTime"]["dateTime"])
+        end = parse_graph_datetime(body["endTime"]["dateTime"])
+        events = self._range(start, end)
+        value = []
+        for offset, email in enumerate(body["schedules"]):
+            value.append({
+                "scheduleId": email,
+                "scheduleItems": [
+                    {"status": "busy", "start": event["start"], "end": event["end"]}
+                    for index, event in enumerate(events) if (index + offset) % 3 == 0
+                ]
+            })
+        return {"value": value}
+
+def create_mock_app(mock: MockGraph) -> FastAPI:
+    """모의 Graph 서버 앱"""
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await mock.stop_deliveries()
+
+    app = FastAPI(title="Mock Microsoft Graph", lifespan=lifespan)
+
+    def to_response(result: Result) -> Response:
+        status, headers, body = result
+        content = json.dumps(body, ensure_ascii=False) if body is not None else None
+        return Response(content, status_code=status, headers=headers, media_type="application/json")
+
+    @app.post("/{tenant}/oauth2/v2.0/token")
+    async def token(tenant: str):
+        await mock.delay()
+        return to_response((200, {}, {
+            "token_type": "Bearer",
+            "access_token": f"mock-access-{uuid.uuid4().hex}",
+            "refresh_token": "mock-refresh",
+            "expires_in": 3600
+        }))
+
+    @app.post("/v1.0/$batch")
+    async def batch(request: Request):
+        await mock.delay()
+        throttled = mock.throttled()
+        if throttled:
+            return to_response(throttled)
+
+        requests = (await request.json()).get("requests", [])
+        if len(requests) > 20:
+            return to_response((400, {}, {"error": {"code": "BadRequest", "message": "요청은 최대 20개"}}))
+
+        responses = []
+        for item in requests:
+            status, headers, body = mock.throttled() or mock.dispatch(
+                item["method"].upper(), item["url"], item.get("body"),
+                {key.lower(): value for key, value in (item.get("headers") or {}).items()}
+            )
+            responses.append({"id": item["id"], "status": status, "headers": headers, "body": body})
+        mock.schedule_delivery()
+        return to_response((200, {}, {"responses": responses}))
+
+    @app.api_route("/v1.0/{path:path}", methods=["GET", "POST", "PATCH", "DELETE"])
+    async def graph(path: str, request: Request):
+        await mock.delay()
+        throttled = mock.throttled()
+        if throttled:
+            return to_response(throttled)
+
+        raw_body = await request.body()
+        body = json.loads(raw_body) if raw_body else None
+        if path == "subscriptions" and request.method == "POST" and not await mock.validate(body["notificationUrl"]):
+            return to_response((400, {}, {"error": {"code": "ValidationError", "message": "notificationUrl 검증 실패"}}))
+
+        url = "/" + path + (f"?{request.url.query}" if request.url.query else "")
+        headers = {key.lower(): value for key, value in request.headers.items()}
+        result = mock.dispatch(request.method, url, body, headers)
+        mock.schedule_delivery()
+        return to_response(result)
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 Graph 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--events", type=int, default=2000, help="일정 개수")
+    parser.add_argument("--latency-ms", type=float, default=20, help="응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=5, help="응답 지연 편차 (ms)")
+    parser.add_argument("--max-page-size", type=int, default=100, help="페이지당 최대 일정 수")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=1, help="429 응답의 Retry-After (초)")
+    parser.add_argument("--calendars", type=int, default=0, help="보조 캘린더 개수")
+    parser.add_argument("--calendar-events", type=int, default=200, help="보조 캘린더당 일정 개수")
+    args = parser.parse_args()
+
+    mock = MockGraph(args.events, args.latency_ms, args.jitter_ms, args.max_page_size,
+                     args.throttle_rate, args.retry_after, calendars=args.calendars,
+                     calendar_events=args.calendar_events)
+    mock.base_url = f"http://{args.host}:{args.port}/v1.0"
+
+    print(f"Graph 모의 서버: {mock.base_url} (일정 {args.events}개, 지연 {args.latency_ms}ms)")
+    uvicorn.run(create_mock_app(mock), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,7 @@ from src.auth_manager import AuthManager
 async def test_outlook_client():
     """Outlook 클라이언트 기능 테스트"""
     auth_manager = AuthManager()
-    outlook_client = OutlookClient()
+    outlook_client = OutlookClient(auth_manager)
 
     print("=== Outlook Calendar MCP Server 테스트 ===\n")
 
@@ -1,25 +1,44 @@
-import json
-import os
+import asyncio
+import logging
 import time
-import httpx
 import secrets
-import base64
-from urllib.parse import urlencode, parse_qs
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from urllib.parse import urlencode
+from typing import Optional, Dict, Any, List
 from .config import config
+from .http_client import get_http_client
+from .metrics import CACHE_REQUESTS, TOKEN_REFRESHES, TOKEN_REFRESH_DURATION
+from .state_store import StateBackend, create_state_backend, cross_process_lock
+
+logger = logging.getLogger("outlook-mcp")
 
 class AuthManager:
-    def __init__(self):
-        self.token_file = config.TOKEN_FILE
+    def __init__(self, token_store: Optional[StateBackend] = None):
         self.client_id = config.AZURE_CLIENT_ID
         self.client_secret = config.AZURE_CLIENT_SECRET
         self.redirect_uri = config.REDIRECT_URI
         self.scopes = " ".join(config.SCOPES)
         self.authority = config.AUTHORITY
 
-    def get_authorization_url(self) -> tuple[str, str]:
-        """OAuth 인증 URL 생성"""
+        # 계정별 메모리 토큰 캐시 (LRU, 오래 쓰지 않은 계정은 제거)
+        self._token_store = token_store
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._refresh_locks: Dict[str, asyncio.Lock] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._default_account: Optional[str] = None
+
+    @property
+    def token_store(self) -> StateBackend:
+        """상태 저장소 (DB 파일은 처음 사용할 때 생성)"""
+        if self._token_store is None:
+            self._token_store = create_state_backend()
+        return self._token_store
+
+    def get_authorization_url(self, login_hint: Optional[str] = None) -> tuple[str, str]:
+        """OAuth 인증 URL 생성 (state는 어느 워커로 callback이 와도 확인할 수 있도록 상태 저장소에 기록)"""
         state = secrets.token_urlsafe(32)
+        self.token_store.set_value("oauth_state", state, {"login_hint": login_hint}, config.OAUTH_STATE_TTL)
 
         params = {
             "client_id": self.client_id,
@@ -29,10 +48,16 @@ class AuthManager:
             "state": state,
             "response_mode": "query"
         }
+        if login_hint:
+            params["login_hint"] = login_hint
 
         auth_url = f"{self.authority}/oauth2/v2.0/authorize?" + urlencode(params)
         return auth_url, state
 
+    def consume_state(self, state: str) -> bool:
+        """callback의 state 확인 (한 번만 사용 가능, OAUTH_STATE_TTL이 지나면 무효)"""
+        return self.token_store.pop_value("oauth_state", state) is not None
+
     async def exchange_code_for_token(self, code: str) -> Dict[str, Any]:
         """인증 코드를 액세스 토큰으로 교환"""
         # 환경 변수 확인
@@ -52,25 +77,40 @@ class AuthManager:
             "scope": self.scopes
         }
 
-        print(f"토큰 요청 URL: {token_url}")
-        print(f"클라이언트 ID: {self.client_id[:8] if self.client_id else 'None'}...")
+        logger.debug("토큰 요청: %s", token_url,
+                     extra={"fields": {"client_id": f"{self.client_id[:8]}..." if self.client_id else None}})
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(token_url, data=data)
-            if response.status_code != 200:
-                print(f"에러 응답: {response.status_code}")
-                print(f"에러 내용: {response.text}")
-            response.raise_for_status()
-            token_data = response.json()
+        client = get_http_client()
+        response = await client.post(token_url, data=data)
+        if response.status_code != 200:
+            logger.error("토큰 요청 실패: %s", response.status_code, extra={"fields": {"response": response.text}})
+        response.raise_for_status()
+        token_data = response.json()
 
         # 토큰 만료 시간 계산
         token_data['expires_at'] = time.time() + token_data.get('expires_in', 3600)
 
-        # 토큰 저장
-        await self.save_token(token_data)
+        # 로그인한 사용자로 계정 키 결정
+        token_data['account'] = await self._lookup_account(token_data['access_token'])
+
+        # 토큰 저장 (새로 로그인한 계정을 기본 계정으로 사용)
+        await self.save_token(token_data, token_data['account'])
+        self._default_account = token_data['account']
         return token_data
 
-    async def refresh_token(self, refresh_token: str) -> Dict[str, Any]:
+    async def _lookup_account(self, access_token: str) -> str:
+        """액세스 토큰의 사용자 이메일(UPN)을 계정 키로 사용"""
+        client = get_http_client()
+        response = await client.get(
+            f"{config.GRAPH_API_ENDPOINT}/me",
+            params={"$select": "mail,userPrincipalName"},
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+        response.raise_for_status()
+        user_info = response.json()
+        return normalize_account(user_info.get("mail") or user_info["userPrincipalName"])
+
+    async def refresh_token(self, refresh_token: str, account: str) -> Dict[str, Any]:
         """리프레시 토큰을 사용하여 새 액세스 토큰 획득"""
         token_url = f"{self.authority}/oauth2/v2.0/token"
 
@@ -82,55 +122,187 @@ class AuthManager:
             "scope": self.scopes
         }
 
-        async with httpx.AsyncClient() as client:
+        client = get_http_client()
+        started = time.perf_counter()
+        try:
             response = await client.post(token_url, data=data)
             response.raise_for_status()
-            token_data = response.json()
+        except Exception:
+            TOKEN_REFRESHES.labels("error").inc()
+            raise
+        finally:
+            TOKEN_REFRESH_DURATION.labels().observe(time.perf_counter() - started)
+        TOKEN_REFRESHES.labels("success").inc()
+        token_data = response.json()
 
+        # 응답에 새 리프레시 토큰이 없으면 기존 값 유지
+        token_data.setdefault('refresh_token', refresh_token)
         token_data['expires_at'] = time.time() + token_data.get('expires_in', 3600)
-        await self.save_token(token_data)
+        token_data['account'] = account
+        await self.save_token(token_data, account)
         return token_data
 
-    async def get_valid_token(self) -> Optional[str]:
+    async def resolve_account(self, account: Optional[str] = None) -> Optional[str]:
+        """계정 지정이 없으면 DEFAULT_ACCOUNT 또는 가장 최근 로그인한 계정 사용"""
+        if account:
+            return normalize_account(account)
+        if config.DEFAULT_ACCOUNT:
+            return normalize_account(config.DEFAULT_ACCOUNT)
+        if self._default_account is None:
+            accounts = self.token_store.list_accounts()
+            self._default_account = accounts[0] if accounts else None
+        return self._default_account
+
+    def list_accounts(self) -> List[str]:
+        """저장된 계정 목록"""
+        return self.token_store.list_accounts()
+
+    def _is_expiring(self, token_data: Dict[str, Any], margin: float) -> bool:
+        """margin초 이내에 만료되는지 확인"""
+        return time.time() + margin >= token_data.get('expires_at', 0)
+
+    def _remember(self, account: str, token_data: Dict[str, Any]):
+        """메모리 캐시에 저장하고 LRU 한도를 넘으면 가장 오래된 계정 제거"""
+        self._cache[account] = token_data
+        self._cache.move_to_end(account)
+        self._last_used[account] = time.time()
+        while len(self._cache) > config.TOKEN_CACHE_SIZE:
+            evicted, _ = self._cache.popitem(last=False)
+            self._last_used.pop(evicted, None)
+
+    def _evict_idle(self):
+        """TOKEN_CACHE_IDLE초 동안 쓰지 않은 계정을 메모리에서 제거 (저장소에는 남음)"""
+        threshold = time.time() - config.TOKEN_CACHE_IDLE
+        for account in [account for account, used in self._last_used.items() if used < threshold]:
+            self._cache.pop(account, None)
+            self._last_used.pop(account, None)
+            self._refresh_locks.pop(account, None)
+
+    async def _refresh_single_flight(self, account: str, stale_token: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """동시에 여러 요청(워커)이 만료를 감지해도 계정당 갱신 요청은 하나만 전송"""
+        lock = self._refresh_locks.setdefault(account, asyncio.Lock())
+
+        # 프로세스 안에서는 asyncio.Lock, 워커 사이에서는 상태 저장소 잠금으로 직렬화
+        # (refresh token이 회전되므로 두 워커가 같은 토큰으로 갱신하면 한쪽이 실패함)
+        async with lock, cross_process_lock(self.token_store, f"refresh:{account}"):
+            # 대기하는 동안 다른 요청(또는 다른 프로세스)이 이미 갱신했으면 그 결과를 사용
+            current = await self.load_token(account, use_cache=False)
+            if current and current.get('access_token') != stale_token.get('access_token'):
+                return current
+
+            if not current or 'refresh_token' not in current:
+                return None
+
+            try:
+                return await self.refresh_token(current['refresh_token'], account)
+            except Exception as e:
+                logger.error("토큰 갱신 실패: %s", e, extra={"fields": {"account": account}})
+                return None
+
+    async def get_valid_token(self, account: Optional[str] = None) -> Optional[str]:
         """유효한 액세스 토큰 반환"""
-        token_data = await self.load_token()
+        account = await self.resolve_account(account)
+        if not account:
+            return None
+
+        token_data = await self.load_token(account)
         if not token_data:
             return None
 
-        # 토큰이 만료되었는지 확인
-        if time.time() >= token_data.get('expires_at', 0):
-            if 'refresh_token' in token_data:
-                try:
-                    token_data = await self.refresh_token(token_data['refresh_token'])
-                except Exception:
-                    return None
-            else:
+        # 토큰이 곧 만료되면 갱신
+        if self._is_expiring(token_data, config.TOKEN_EXPIRY_MARGIN):
+            token_data = await self._refresh_single_flight(account, token_data)
+            if not token_data:
                 return None
 
         return token_data.get('access_token')
 
-    async def save_token(self, token_data: Dict[str, Any]):
-        """토큰을 파일에 저장"""
-        with open(self.token_file, 'w') as f:
-            json.dump(token_data, f, indent=2)
+    async def save_token(self, token_data: Dict[str, Any], account: str):
+        """토큰을 메모리와 저장소에 저장"""
+        self._remember(account, token_data)
+        self.token_store.put(account, token_data)
 
-    async def load_token(self) -> Optional[Dict[str, Any]]:
-        """파일에서 토큰 로드"""
-        if not os.path.exists(self.token_file):
-            return None
+    async def load_token(self, account: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """토큰 로드 (메모리 캐시 우선)"""
+        if use_cache:
+            if account in self._cache:
+                CACHE_REQUESTS.labels("token", "hit").inc()
+                self._cache.move_to_end(account)
+                self._last_used[account] = time.time()
+                return self._cache[account]
+            CACHE_REQUESTS.labels("token", "miss").inc()
 
-        try:
-            with open(self.token_file, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return None
+        token_data = self.token_store.get(account)
+        if token_data:
+            self._remember(account, token_data)
+        return token_data
 
-    async def is_authenticated(self) -> bool:
-        """인증 상태 확인"""
-        token = await self.get_valid_token()
-        return token is not None
+    async def is_authenticated(self, account: Optional[str] = None) -> bool:
+        """인증 상태 확인 (네트워크 요청 없이 저장된 토큰으로 판단)"""
+        account = await self.resolve_account(account)
+        if not account:
+            return False
+        token_data = await self.load_token(account)
+        if not token_data:
+            return False
+        return not self._is_expiring(token_data, 0) or 'refresh_token' in token_data
+
+    async def _background_refresh(self):
+        """메모리에 있는 계정의 토큰을 만료 전에 미리 갱신 (예상치 못한 오류는 기록하고 다음 주기에 다시 시도)"""
+        while True:
+            next_check = config.TOKEN_REFRESH_AHEAD
+            try:
+                next_check = await self._refresh_due_tokens()
+            except Exception as e:
+                logger.error("백그라운드 토큰 갱신 중 오류: %s", e, exc_info=True)
+
+            # 새로 로그인한 계정을 반영하도록 최대 1분 간격으로 확인
+            await asyncio.sleep(max(1.0, min(next_check, 60.0)))
+
+    async def _refresh_due_tokens(self) -> float:
+        """만료가 가까운 토큰을 갱신하고 다음 확인까지 남은 시간(초) 반환"""
+        self._evict_idle()
+
+        next_check = config.TOKEN_REFRESH_AHEAD
+        for account, token_data in list(self._cache.items()):
+            delay = token_data.get('expires_at', 0) - time.time() - config.TOKEN_REFRESH_AHEAD
+            if delay > 0:
+                next_check = min(next_check, delay)
+                continue
 
-    async def clear_token(self):
+            logger.info("토큰 만료 전 백그라운드 갱신", extra={"fields": {"account": account}})
+            if not await self._refresh_single_flight(account, token_data):
+                # 갱신할 수 없는 계정은 다시 로그인할 때까지 메모리에서 제거
+                self._cache.pop(account, None)
+                self._last_used.pop(account, None)
+        return next_check
+
+    def start_background_refresh(self):
+        """백그라운드 토큰 갱신 작업 시작"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def stop_background_refresh(self):
+        """백그라운드 토큰 갱신 작업 종료"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def clear_token(self, account: Optional[str] = None):
         """저장된 토큰 삭제"""
-        if os.path.exists(self.token_file):
-            os.remove(self.token_file)
\ No newline at end of file
+        account = await self.resolve_account(account)
+        if not account:
+            return
+        self._cache.pop(account, None)
+        self._last_used.pop(account, None)
+        self.token_store.delete(account)
+        if self._default_account == account:
+            self._default_account = None
+
+def normalize_account(account: str) -> str:
+    """계정 키 정규화 (이메일 대소문자 무시)"""
+    return account.strip().lower()
\ No newline at end of file
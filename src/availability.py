@@ -0,0 +1,75 @@
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Iterable, Iterator, List, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """겹치거나 맞닿은 구간을 합침 (시작 시간 정렬 후 한 번 훑기)"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def working_windows(window_start: datetime, window_end: datetime, work_start: time, work_end: time,
+                    tz: tzinfo, include_weekends: bool = False) -> Iterator[Interval]:
+    """조회 범위 안의 날짜별 근무 시간 구간 (tz 기준 근무 시간을 UTC로 변환)"""
+    day: date = window_start.astimezone(tz).date()
+    last_day: date = window_end.astimezone(tz).date()
+    while day <= last_day:
+        if include_weekends or day.weekday() < 5:
+            start = datetime.combine(day, work_start, tzinfo=tz).astimezone(timezone.utc)
+            end = datetime.combine(day, work_end, tzinfo=tz).astimezone(timezone.utc)
+            start, end = max(start, window_start), min(end, window_end)
+            if start < end:
+                yield start, end
+        day += timedelta(days=1)
+
+def _align(value: datetime, step: timedelta) -> datetime:
+    """step 단위로 올림 (예: 30분 단위 회의 시작 시각)"""
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    remainder = (value - epoch) % step
+    return value if not remainder else value + (step - remainder)
+
+def find_free_slots(busy: Iterable[Interval], window_start: datetime, window_end: datetime,
+                    duration: timedelta, work_start: time, work_end: time, tz: tzinfo,
+                    include_weekends: bool = False, step: timedelta = timedelta(minutes=30),
+                    limit: int = 5) -> List[Interval]:
+    """모든 참석자의 바쁜 구간을 피해 근무 시간 안에서 duration 길이의 후보 시간을 앞에서부터 limit개 반환"""
+    merged = merge_intervals(busy)
+    slots: List[Interval] = []
+    index = 0
+
+    for day_start, day_end in working_windows(window_start, window_end, work_start, work_end, tz, include_weekends):
+        cursor = day_start
+
+        # 근무 구간보다 먼저 끝나는 바쁜 구간은 건너뜀 (merged는 정렬되어 있으므로 포인터만 전진)
+        while index < len(merged) and merged[index][1] <= day_start:
+            index += 1
+
+        busy_index = index
+        while cursor < day_end:
+            if busy_index < len(merged) and merged[busy_index][0] < day_end:
+                gap_end = min(merged[busy_index][0], day_end)
+                next_cursor = merged[busy_index][1]
+                busy_index += 1
+            else:
+                gap_end = day_end
+                next_cursor = day_end
+
+            # 빈 구간에서 duration 간격으로 후보를 만듦
+            start = _align(cursor, step)
+            while start + duration <= gap_end:
+                slots.append((start, start + duration))
+                if len(slots) >= limit:
+                    return slots
+                start += max(step, duration)
+
+            cursor = max(cursor, next_cursor)
+
+    return slots
@@ -0,0 +1,591 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .config import config
+from .recurrence import WEEKDAYS, resolve_time_zone
+from .time_utils import event_time, format_utc, parse_graph_datetime
+
+logger = logging.getLogger("outlook-mcp")
+
+FORMATS = ("ndjson", "ics")
+
+# 내보낼 필드 (calendarView 기준이므로 반복 일정은 회차별로 내보냄)
+EXPORT_FIELDS = [
+    "id", "iCalUId", "subject", "body", "start", "end", "isAllDay", "location", "attendees",
+    "organizer", "showAs", "isCancelled", "categories", "importance", "sensitivity", "type", "seriesMasterId"
+]
+
+# NDJSON 가져오기에서 새 일정에 복사하는 필드 (나머지는 Graph가 정하는 읽기 전용 값)
+IMPORT_FIELDS = [
+    "subject", "body", "start", "end", "isAllDay", "location", "showAs",
+    "categories", "importance", "sensitivity", "recurrence"
+]
+
+ICS_HEADER = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//outlook-mcp//calendar export//KO\r\nCALSCALE:GREGORIAN\r\n"
+ICS_FOOTER = "END:VCALENDAR\r\n"
+
+ICS_WEEKDAYS = {"MO": "monday", "TU": "tuesday", "WE": "wednesday", "TH": "thursday",
+                "FR": "friday", "SA": "saturday", "SU": "sunday"}
+ICS_INDEXES = {1: "first", 2: "second", 3: "third", 4: "fourth", -1: "last"}
+
+_BYDAY = re.compile(r"^([+-]?\d+)?(MO|TU|WE|TH|FR|SA|SU)$")
+_DURATION = re.compile(r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """파일 형식 (지정하지 않으면 확장자로 판단, .ics 외에는 NDJSON)"""
+    fmt = (fmt or ("ics" if path.lower().endswith((".ics", ".ical")) else "ndjson")).lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (가능한 값: {', '.join(FORMATS)})")
+    return fmt
+
+def resolve_tool_path(path: str) -> str:
+    """MCP 도구로 받은 경로를 EXPORT_DIR 안의 실제 경로로 변환 (절대 경로, .., 디렉터리 밖을 가리키는 링크는 거부)"""
+    if not path or os.path.isabs(path) or os.path.splitdrive(path)[0] or ".." in path.replace("\\", "/").split("/"):
+        raise ValueError(f"경로는 내보내기 디렉터리 안의 상대 경로여야 합니다: {path}")
+    base = os.path.realpath(config.EXPORT_DIR)
+    resolved = os.path.realpath(os.path.join(base, path))
+    if os.path.commonpath([base, resolved]) != base or resolved == base:
+        raise ValueError(f"경로가 내보내기 디렉터리를 벗어납니다: {path}")
+    os.makedirs(os.path.dirname(resolved), exist_ok=True)
+    return resolved
+
+# ---------------------------------------------------------------- 체크포인트
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """체크포인트 읽기 (없으면 None)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_checkpoint(path: str, state: Dict[str, Any]):
+    """체크포인트 저장 (중간에 종료되어도 이전 체크포인트가 깨지지 않도록 임시 파일을 교체)"""
+    temp = path + ".tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(temp, path)
+
+def _resume_state(checkpoint_path: str, operation: str, path: str, resume: bool) -> Optional[Dict[str, Any]]:
+    if not resume:
+        return None
+    state = load_checkpoint(checkpoint_path)
+    if state and (state.get("operation") != operation or state.get("path") != os.path.abspath(path)):
+        raise ValueError(f"체크포인트가 다른 작업의 것입니다: {checkpoint_path}")
+    return state
+
+# ---------------------------------------------------------------- iCalendar 쓰기
+
+def _escape(value: str) -> str:
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+def _fold(line: str) -> str:
+    """75바이트마다 줄 접기 (UTF-8 문자를 중간에 자르지 않음)"""
+    lines, current, size = [], "", 0
+    for char in line:
+        length = len(char.encode("utf-8"))
+        if size + length > 75:
+            lines.append(current)
+            current, size = " ", 1
+        current += char
+        size += length
+    lines.append(current)
+    return "\r\n".join(lines) + "\r\n"
+
+def _ics_time(name: str, event: Dict[str, Any], key: str) -> str:
+    if event.get("isAllDay"):
+        # 종일 일정은 일정 자체 시간대의 날짜 그대로 (UTC로 바꾸면 앞뒤 날짜로 밀림)
+        day = (event.get(key) or {}).get("dateTime", "")[:10]
+        return f"{name};VALUE=DATE:{day.replace('-', '')}"
+    value = parse_graph_datetime(event_time(event, key))
+    return f"{name}:{value.strftime('%Y%m%dT%H%M%SZ')}"
+
+def _ics_address(name: str, address: Dict[str, Any], params: str = "") -> str:
+    display_name = (address.get("name") or "").replace('"', "'")
+    cn = f';CN="{display_name}"' if display_name else ""
+    return f"{name}{cn}{params}:mailto:{address.get('address', '')}"
+
+def event_to_ics(event: Dict[str, Any]) -> str:
+    """Graph 일정을 VEVENT 문자열로 변환"""
+    start = parse_graph_datetime(event_time(event, "start"))
+    uid = event.get("iCalUId") or event["id"]
+    if event.get("type", "singleInstance") != "singleInstance":
+        # 회차는 같은 iCalUId를 공유하므로 시작 시각으로 구분
+        uid = f"{uid}-{start.strftime('%Y%m%dT%H%M%SZ')}"
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}",
+        _ics_time("DTSTART", event, "start"),
+        _ics_time("DTEND", event, "end"),
+        f"SUMMARY:{_escape(event.get('subject') or '')}"
+    ]
+    description = (event.get("body") or {}).get("content") or event.get("bodyPreview")
+    if description:
+        lines.append(f"DESCRIPTION:{_escape(description)}")
+    location = (event.get("location") or {}).get("displayName")
+    if location:
+        lines.append(f"LOCATION:{_escape(location)}")
+    organizer = (event.get("organizer") or {}).get("emailAddress")
+    if organizer and organizer.get("address"):
+        lines.append(_ics_address("ORGANIZER", organizer))
+    for attendee in event.get("attendees") or []:
+        address = attendee.get("emailAddress") or {}
+        if address.get("address"):
+            role = "OPT-PARTICIPANT" if attendee.get("type") == "optional" else "REQ-PARTICIPANT"
+            lines.append(_ics_address("ATTENDEE", address, f";ROLE={role}"))
+    if event.get("categories"):
+        lines.append("CATEGORIES:" + ",".join(_escape(category) for category in event["categories"]))
+    lines.append("STATUS:CANCELLED" if event.get("isCancelled") else "STATUS:CONFIRMED")
+    if event.get("showAs") == "free":
+        lines.append("TRANSP:TRANSPARENT")
+    if event.get("sensitivity") in ("private", "confidential"):
+        lines.append("CLASS:PRIVATE")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+def event_to_ndjson(event: Dict[str, Any]) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+# ---------------------------------------------------------------- iCalendar 읽기
+
+IcsProperty = Tuple[str, Dict[str, str], str]
+
+def _logical_lines(f, offset: int) -> Iterator[Tuple[str, int]]:
+    """접힌 줄을 펼친 논리 줄과 그 줄이 끝나는 바이트 위치"""
+    pending, pending_end, position = None, offset, offset
+    for raw in f:
+        position += len(raw)
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            pending_end = position
+            continue
+        if pending is not None:
+            yield pending, pending_end
+        pending, pending_end = line, position
+    if pending is not None:
+        yield pending, pending_end
+
+def _parse_property(line: str) -> IcsProperty:
+    """NAME;PARAM=VALUE:값 형식의 줄 분해 (따옴표 안의 :는 값 구분자가 아님)"""
+    in_quotes = False
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            break
+    else:
+        return line.upper(), {}, ""
+
+    name, *params = line[:index].split(";")
+    parsed = {}
+    for param in params:
+        key, _, value = param.partition("=")
+        parsed[key.upper()] = value.strip('"')
+    return name.upper(), parsed, line[index + 1:]
+
+def iter_ics_events(path: str, offset: int = 0) -> Iterator[Tuple[List[IcsProperty], int]]:
+    """.ics 파일의 VEVENT를 하나씩 읽음 (파일 전체를 메모리에 올리지 않음, 끝 위치는 재개용)"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        properties: Optional[List[IcsProperty]] = None
+        depth = 0
+        for line, end in _logical_lines(f, offset):
+            if not line:
+                continue
+            name, params, value = _parse_property(line)
+            if name == "BEGIN":
+                if properties is not None:
+                    depth += 1
+                elif value.upper() == "VEVENT":
+                    properties = []
+            elif name == "END":
+                if properties is not None and depth:
+                    depth -= 1
+                elif properties is not None and value.upper() == "VEVENT":
+                    yield properties, end
+                    properties = None
+            elif properties is not None and not depth:
+                # VALARM 등 하위 구성 요소의 속성은 무시
+                properties.append((name, params, value))
+
+def iter_ndjson_events(path: str, offset: int = 0) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """NDJSON 파일의 일정을 한 줄씩 읽음"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        position = offset
+        for raw in f:
+            position += len(raw)
+            if raw.strip():
+                yield json.loads(raw), position
+
+def _unescape(value: str) -> str:
+    return re.sub(r"\\([\\;,nN])", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+def _parse_ics_time(params: Dict[str, str], value: str) -> Tuple[datetime, bool, Optional[str]]:
+    """DTSTART/DTEND 값 -> (시각, 종일 여부, 시간대 이름) (시간대가 없는 시각은 UTC로 간주)"""
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d").replace(tzinfo=timezone.utc), True, None
+    if value.endswith("Z"):
+        return datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc), False, None
+    tzid = params.get("TZID")
+    zone = resolve_time_zone(tzid.lstrip("/")) if tzid else timezone.utc
+    return datetime.strptime(value, "%Y%m%dT%H%M%S").replace(tzinfo=zone), False, getattr(zone, "key", None)
+
+def _parse_duration(value: str) -> timedelta:
+    match = _DURATION.match(value.strip().upper())
+    if not match:
+        raise ValueError(f"알 수 없는 DURATION: {value}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                         minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -duration if sign == "-" else duration
+
+def rrule_to_recurrence(rrule: str, start: datetime, time_zone: Optional[str]) -> Dict[str, Any]:
+    """RRULE을 Graph patternedRecurrence로 변환 (Graph로 표현할 수 없는 규칙은 ValueError)"""
+    parts = dict(part.split("=", 1) for part in rrule.upper().split(";") if "=" in part)
+    frequency = parts.get("FREQ")
+    interval = int(parts.get("INTERVAL", "1"))
+    local_start = start.date()
+
+    byday = []
+    for item in filter(None, parts.get("BYDAY", "").split(",")):
+        match = _BYDAY.match(item)
+        if not match:
+            raise ValueError(f"지원하지 않는 BYDAY: {item}")
+        byday.append((int(match.group(1)) if match.group(1) else None, ICS_WEEKDAYS[match.group(2)]))
+    if "BYSETPOS" in parts:
+        byday = [(int(parts["BYSETPOS"]), day) for _, day in byday]
+    ordinals = {ordinal for ordinal, _ in byday}
+
+    pattern: Dict[str, Any] = {"interval": interval}
+    if frequency == "DAILY" and not byday:
+        pattern["type"] = "daily"
+    elif frequency == "WEEKLY" or (frequency == "DAILY" and ordinals == {None}):
+        pattern["type"] = "weekly"
+        pattern["daysOfWeek"] = [day for _, day in byday] or [list(WEEKDAYS)[local_start.weekday()]]
+        pattern["firstDayOfWeek"] = ICS_WEEKDAYS.get(parts.get("WKST", "MO"), "monday")
+    elif frequency in ("MONTHLY", "YEARLY"):
+        prefix = "Monthly" if frequency == "MONTHLY" else "Yearly"
+        if frequency == "YEARLY":
+            pattern["month"] = int(parts.get("BYMONTH", local_start.month))
+        if byday:
+            if len(ordinals) != 1 or next(iter(ordinals)) not in ICS_INDEXES:
+                raise ValueError(f"지원하지 않는 반복 규칙: {rrule}")
+            pattern["type"] = "relative" + prefix
+            pattern["daysOfWeek"] = [day for _, day in byday]
+            pattern["index"] = ICS_INDEXES[next(iter(ordinals))]
+        else:
+            day_of_month = int(parts.get("BYMONTHDAY", local_start.day))
+            if day_of_month < 1:
+                raise ValueError(f"지원하지 않는 반복 규칙: {rrule}")
+            pattern["type"] = "absolute" + prefix
+            pattern["dayOfMonth"] = day_of_month
+    else:
+        raise ValueError(f"지원하지 않는 반복 규칙: {rrule}")
+
+    recurrence_range: Dict[str, Any] = {
+        "type": "noEnd", "startDate": local_start.isoformat(), "recurrenceTimeZone": time_zone or "UTC"
+    }
+    if "COUNT" in parts:
+        recurrence_range.update(type="numbered", numberOfOccurrences=int(parts["COUNT"]))
+    elif "UNTIL" in parts:
+        until = parts["UNTIL"]
+        until_date = (
+            _parse_ics_time({}, until)[0].astimezone(start.tzinfo).date() if "T" in until
+            else date(int(until[:4]), int(until[4:6]), int(until[6:8]))
+        )
+        recurrence_range.update(type="endDate", endDate=until_date.isoformat())
+    return {"pattern": pattern, "range": recurrence_range}
+
+def _transaction_id(*values: str) -> str:
+    """같은 원본 일정은 같은 transactionId (재개/재시도 시 Graph가 중복 생성을 막음)"""
+    return hashlib.sha1("|".join(values).encode("utf-8")).hexdigest()
+
+def _graph_time(value: datetime, time_zone: Optional[str], all_day: bool) -> Dict[str, str]:
+    if all_day:
+        return {"dateTime": value.strftime("%Y-%m-%dT00:00:00"), "timeZone": "UTC"}
+    if time_zone:
+        return {"dateTime": value.strftime("%Y-%m-%dT%H:%M:%S"), "timeZone": time_zone}
+    return {"dateTime": format_utc(value), "timeZone": "UTC"}
+
+def ics_to_event(properties: List[IcsProperty], include_attendees: bool = False) -> Dict[str, Any]:
+    """VEVENT 속성을 Graph 일정 생성 본문으로 변환 (가져올 수 없는 일정은 ValueError)"""
+    values: Dict[str, IcsProperty] = {}
+    attendees = []
+    categories: List[str] = []
+    for prop in properties:
+        if prop[0] == "ATTENDEE":
+            attendees.append(prop)
+        elif prop[0] == "CATEGORIES":
+            categories.extend(_unescape(category) for category in re.split(r"(?<!\\),", prop[2]) if category)
+        else:
+            values.setdefault(prop[0], prop)
+
+    if "RECURRENCE-ID" in values:
+        raise ValueError("반복 일정의 수정된 회차는 가져올 수 없습니다")
+    if "DTSTART" not in values:
+        raise ValueError("DTSTART가 없습니다")
+    if values.get("STATUS", ("", {}, ""))[2].upper() == "CANCELLED":
+        raise ValueError("취소된 일정")
+
+    start, all_day, time_zone = _parse_ics_time(values["DTSTART"][1], values["DTSTART"][2])
+    if "DTEND" in values:
+        end = _parse_ics_time(values["DTEND"][1], values["DTEND"][2])[0]
+    elif "DURATION" in values:
+        end = start + _parse_duration(values["DURATION"][2])
+    else:
+        end = start + (timedelta(days=1) if all_day else timedelta())
+
+    # 반복 일정만 원래 시간대로 보내 서머타임이 바뀌어도 현지 시각을 유지
+    recurring = "RRULE" in values
+    event_zone = time_zone if recurring else None
+    event: Dict[str, Any] = {
+        "subject": _unescape(values.get("SUMMARY", ("", {}, ""))[2]),
+        "start": _graph_time(start if event_zone else start.astimezone(timezone.utc), event_zone, all_day),
+        "end": _graph_time(end if event_zone else end.astimezone(timezone.utc), event_zone, all_day),
+        "isAllDay": all_day,
+        "transactionId": _transaction_id(values.get("UID", ("", {}, ""))[2], values["DTSTART"][2])
+    }
+    if "DESCRIPTION" in values:
+        event["body"] = {"contentType": "text", "content": _unescape(values["DESCRIPTION"][2])}
+    if "LOCATION" in values:
+        event["location"] = {"displayName": _unescape(values["LOCATION"][2])}
+    if categories:
+        event["categories"] = categories
+    if values.get("TRANSP", ("", {}, ""))[2].upper() == "TRANSPARENT":
+        event["showAs"] = "free"
+    if values.get("CLASS", ("", {}, ""))[2].upper() in ("PRIVATE", "CONFIDENTIAL"):
+        event["sensitivity"] = "private"
+    if recurring:
+        event["recurrence"] = rrule_to_recurrence(values["RRULE"][2], start, time_zone)
+        if "EXDATE" in values:
+            logger.warning("EXDATE(제외된 회차)는 가져오지 않습니다", extra={"fields": {"subject": event["subject"]}})
+    if include_attendees and attendees:
+        event["attendees"] = [
+            {
+                "emailAddress": {"address": value.split(":", 1)[-1], "name": params.get("CN", "")},
+                "type": "optional" if params.get("ROLE") == "OPT-PARTICIPANT" else "required"
+            }
+            for _, params, value in attendees if value.lower().startswith("mailto:")
+        ]
+    return event
+
+def ndjson_to_event(record: Dict[str, Any], include_attendees: bool = False) -> Dict[str, Any]:
+    """내보낸 Graph 일정을 생성 본문으로 변환 (읽기 전용 필드 제외)"""
+    if "start" not in record or "end" not in record:
+        raise ValueError("start/end가 없습니다")
+    if record.get("isCancelled"):
+        raise ValueError("취소된 일정")
+    event = {key: record[key] for key in IMPORT_FIELDS if record.get(key) is not None}
+    if include_attendees and record.get("attendees"):
+        event["attendees"] = [
+            {"emailAddress": attendee.get("emailAddress"), "type": attendee.get("type", "required")}
+            for attendee in record["attendees"]
+        ]
+    event["transactionId"] = _transaction_id(
+        record.get("iCalUId") or record.get("id") or "", event_time(record, "start")
+    )
+    return event
+
+# ---------------------------------------------------------------- 내보내기/가져오기
+
+async def export_events(outlook_client, path: str, start_date: str, end_date: str, fmt: Optional[str] = None,
+                        checkpoint_path: Optional[str] = None, resume: bool = False) -> Dict[str, Any]:
+    """범위 내 일정을 페이지 단위로 파일에 바로 기록 (메모리 사용량은 페이지 크기로 고정)
+
+    페이지마다 체크포인트(파일 위치, 마지막으로 쓴 시작 시각과 ID)를 저장하며,
+    resume=True이면 체크포인트 이후부터 이어서 씁니다. 완료되면 체크포인트를 삭제합니다.
+    """
+    checkpoint_path = checkpoint_path or path + ".checkpoint.json"
+    state = _resume_state(checkpoint_path, "export", path, resume)
+    if state:
+        fmt, start_date, end_date = state["format"], state["start_date"], state["end_date"]
+        # 마지막 체크포인트 이후에 쓴 내용은 버리고 이어서 씀
+        with open(path, "r+b") as f:
+            f.truncate(state["offset"])
+        logger.info("내보내기 재개: %d개 이후", state["count"], extra={"fields": {"path": path}})
+    fmt = detect_format(path, fmt)
+    serialize = event_to_ics if fmt == "ics" else event_to_ndjson
+
+    count = state["count"] if state else 0
+    last_start, last_ids = (state["last_start"], state["last_ids"]) if state else ("", [])
+    resume_start, resume_ids = last_start, set(last_ids)
+
+    with open(path, "ab" if state else "wb") as f:
+        if not state and fmt == "ics":
+            f.write(ICS_HEADER.encode("utf-8"))
+
+        # 재개 시에는 마지막으로 쓴 일정의 시작 시각부터 다시 조회
+        async for page in outlook_client.iter_event_pages(
+            start_date=resume_start + "Z" if resume_start else start_date, end_date=end_date,
+            page_size=config.EXPORT_PAGE_SIZE, max_results=0, fields=EXPORT_FIELDS
+        ):
+            chunk = []
+            for event in page:
+                start = event_time(event, "start")
+                if resume_start and (start < resume_start or (start == resume_start and event["id"] in resume_ids)):
+                    continue
+                chunk.append(serialize(event))
+                if start != last_start:
+                    last_start, last_ids = start, []
+                last_ids.append(event["id"])
+            f.write("".join(chunk).encode("utf-8"))
+            f.flush()
+            count += len(chunk)
+            save_checkpoint(checkpoint_path, {
+                "operation": "export", "path": os.path.abspath(path), "format": fmt,
+                "start_date": start_date, "end_date": end_date, "offset": f.tell(),
+                "count": count, "last_start": last_start, "last_ids": last_ids
+            })
+
+        if fmt == "ics":
+            f.write(ICS_FOOTER.encode("utf-8"))
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    logger.info("내보내기 완료: %d개", count, extra={"fields": {"path": path}})
+    return {"path": path, "format": fmt, "exported": count, "resumed": bool(state)}
+
+async def import_events(outlook_client, path: str, fmt: Optional[str] = None, checkpoint_path: Optional[str] = None,
+                        resume: bool = False, include_attendees: bool = False,
+                        on_created: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Dict[str, Any]:
+    """파일의 일정을 IMPORT_BATCH_SIZE개씩 $batch로 생성 (파일은 일정 단위로 조금씩 읽음)
+
+    배치마다 체크포인트(파일 위치, 누적 건수)를 저장하며, resume=True이면 그 위치부터 읽습니다.
+    일정마다 원본에서 만든 transactionId를 붙이므로 재개/재시도로 같은 일정이 두 번 생성되지 않습니다.
+    include_attendees=False(기본값)이면 참석자에게 초대가 발송되지 않도록 참석자를 제외합니다.
+    """
+    checkpoint_path = checkpoint_path or path + ".checkpoint.json"
+    state = _resume_state(checkpoint_path, "import", path, resume)
+    if state:
+        fmt = state["format"]
+        logger.info("가져오기 재개: %d개 생성 이후", state["created"], extra={"fields": {"path": path}})
+    fmt = detect_format(path, fmt)
+
+    offset = state["offset"] if state else 0
+    created = state["created"] if state else 0
+    failed = state["failed"] if state else 0
+    skipped = state["skipped"] if state else 0
+    errors: List[str] = []
+
+    if fmt == "ics":
+        records = iter_ics_events(path, offset)
+        convert = ics_to_event
+    else:
+        records = iter_ndjson_events(path, offset)
+        convert = ndjson_to_event
+
+    batch: List[Dict[str, Any]] = []
+
+    async def flush(end_offset: int):
+        nonlocal batch, created, failed
+        if batch:
+            results = await outlook_client.batch_create_event_bodies(batch)
+            succeeded = []
+            for body, result in zip(batch, results):
+                if 200 <= result.get("status", 0) < 300:
+                    succeeded.append(result.get("body") or {})
+                else:
+                    failed += 1
+                    message = ((result.get("body") or {}).get("error") or {}).get("message", "알 수 없는 오류")
+                    errors.append(f"{body.get('subject', '')}: {message}")
+                    logger.warning("일정 가져오기 실패 (%s): %s", result.get("status"), message,
+                                   extra={"fields": {"subject": body.get("subject", "")}})
+            created += len(succeeded)
+            if on_created and succeeded:
+                on_created(succeeded)
+            batch = []
+        save_checkpoint(checkpoint_path, {
+            "operation": "import", "path": os.path.abspath(path), "format": fmt,
+            "offset": end_offset, "created": created, "failed": failed, "skipped": skipped
+        })
+
+    end_offset = offset
+    for record, end_offset in records:
+        try:
+            batch.append(convert(record, include_attendees))
+        except (ValueError, KeyError) as e:
+            skipped += 1
+            logger.info("가져오기에서 제외: %s", e)
+        if len(batch) >= config.IMPORT_BATCH_SIZE:
+            await flush(end_offset)
+    await flush(end_offset)
+
+    os.remove(checkpoint_path)
+    logger.info("가져오기 완료: 생성 %d개, 실패 %d개, 제외 %d개", created, failed, skipped,
+                extra={"fields": {"path": path}})
+    return {
+        "path": path, "format": fmt, "created": created, "failed": failed, "skipped": skipped,
+        "errors": errors[:10], "resumed": bool(state)
+    }
+
+# ---------------------------------------------------------------- CLI
+
+async def run_cli(args: argparse.Namespace) -> int:
+    from .auth_manager import AuthManager
+    from .graph_scheduler import graph_scheduler
+    from .http_client import close_http_client
+    from .outlook_client import OutlookClient
+
+    auth_manager = AuthManager()
+    account = await auth_manager.resolve_account(args.account)
+    if not account or not await auth_manager.is_authenticated(account):
+        print("인증이 필요합니다. 먼저 MCP 서버의 /auth/login으로 로그인하세요.")
+        return 1
+    outlook_client = OutlookClient(auth_manager, account)
+
+    try:
+        if args.command == "export":
+            result = await export_events(
+                outlook_client, args.path, args.start, args.end, args.format, args.checkpoint, args.resume
+            )
+        else:
+            result = await import_events(
+                outlook_client, args.path, args.format, args.checkpoint, args.resume, args.include_attendees
+            )
+    finally:
+        await graph_scheduler.drain(config.SHUTDOWN_TIMEOUT)
+        await close_http_client()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+def main():
+    """일정 내보내기/가져오기 CLI"""
+    from .logging_setup import configure_logging
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Outlook 일정 내보내기/가져오기 (NDJSON, iCalendar)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="일정을 파일로 내보내기")
+    export_parser.add_argument("path", help="출력 파일 (.ics 또는 .ndjson)")
+    export_parser.add_argument("--start", required=True, help="시작 (ISO 8601, 예: 2020-01-01T00:00:00Z)")
+    export_parser.add_argument("--end", required=True, help="종료 (ISO 8601)")
+
+    import_parser = subparsers.add_parser("import", help="파일의 일정을 가져오기")
+    import_parser.add_argument("path", help="입력 파일 (.ics 또는 .ndjson)")
+    import_parser.add_argument("--include-attendees", action="store_true",
+                               help="참석자 포함 (참석자에게 초대가 발송됨)")
+
+    for subparser in (export_parser, import_parser):
+        subparser.add_argument("--format", choices=FORMATS, help="파일 형식 (기본값: 확장자로 판단)")
+        subparser.add_argument("--account", help="계정 (기본값: 기본 계정)")
+        subparser.add_argument("--checkpoint", help="체크포인트 파일 (기본값: <파일>.checkpoint.json)")
+        subparser.add_argument("--resume", action="store_true", help="체크포인트부터 이어서 실행")
+
+    raise SystemExit(asyncio.run(run_cli(parser.parse_args())))
+
+if __name__ == "__main__":
+    main()
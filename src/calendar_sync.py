@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import httpx
+from .config import config
+from .event_store import EventStore, event_db_file
+from .outlook_client import OutlookClient, DEFAULT_EVENT_FIELDS
+from .interval_index import IntervalIndex
+from .search_index import EventSearch
+from .time_utils import event_time, format_utc, normalize_datetime, parse_graph_datetime
+
+logger = logging.getLogger("outlook-mcp")
+
+class CalendarSync:
+    """calendarView 델타 쿼리로 로컬 미러를 유지하고 범위 조회를 미러에서 처리"""
+
+    def __init__(self, outlook_client: OutlookClient, store: Optional[EventStore] = None,
+                 search: Optional[EventSearch] = None):
+        self.outlook_client = outlook_client
+        self._store = store
+        # 동기화한 변경분을 반영할 검색 색인
+        self.search = search
+        self._lock = asyncio.Lock()
+        self._stale = False
+        # 변경 알림 구독이 살아 있으면 주기적 동기화 대신 알림(mark_stale)으로 갱신
+        self.push_enabled = False
+        # 충돌 검사용 인덱스 (처음 필요할 때 미러에서 한 번 만들고 이후 변경분만 반영)
+        self._index: Optional[IntervalIndex] = None
+
+    @property
+    def store(self) -> EventStore:
+        """DB 파일은 처음 사용할 때 생성"""
+        if self._store is None:
+            self._store = EventStore(event_db_file(self.outlook_client.account))
+        return self._store
+
+    def _target_window(self) -> Tuple[str, str]:
+        """오늘 기준 동기화 윈도우"""
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (
+            format_utc(today - timedelta(days=config.SYNC_WINDOW_PAST_DAYS)),
+            format_utc(today + timedelta(days=config.SYNC_WINDOW_FUTURE_DAYS))
+        )
+
+    def _needs_rebase(self, state: Dict[str, Any]) -> bool:
+        """윈도우의 남은 미래 구간이 절반 이하가 되면 윈도우를 다시 잡음"""
+        today = datetime.now(timezone.utc)
+        threshold = format_utc(today + timedelta(days=config.SYNC_WINDOW_FUTURE_DAYS // 2))
+        return state["window_end"] < threshold
+
+    def _window(self) -> Tuple[str, str]:
+        """현재 유효한 동기화 윈도우"""
+        state = self.store.get_sync_state()
+        if state and not self._needs_rebase(state):
+            return state["window_start"], state["window_end"]
+        return self._target_window()
+
+    def covers(self, start_date: Optional[str], end_date: Optional[str]) -> bool:
+        """요청 범위를 미러에서 처리할 수 있는지 확인"""
+        if not config.SYNC_ENABLED or not start_date or not end_date:
+            return False
+        window_start, window_end = self._window()
+        return window_start <= normalize_datetime(start_date) and normalize_datetime(end_date) <= window_end
+
+    def mark_stale(self):
+        """다음 조회 시 델타 동기화를 강제"""
+        self._stale = True
+
+    async def refresh(self, force: bool = False):
+        """미러 갱신 (동시 호출은 하나의 동기화로 합쳐짐)"""
+        async with self._lock:
+            state = self.store.get_sync_state()
+            rebase = state is None or self._needs_rebase(state) or not state["delta_link"]
+
+            if not force and not rebase and not self._stale:
+                if self.push_enabled or time.time() - state["synced_at"] < config.SYNC_INTERVAL:
+                    return
+
+            if rebase:
+                await self._full_sync()
+            else:
+                try:
+                    await self._delta_sync(state)
+                except httpx.HTTPStatusError as e:
+                    # 410 Gone: deltaLink가 만료되어 전체 재동기화 필요
+                    if e.response.status_code != 410:
+                        raise
+                    logger.warning("deltaLink 만료, 전체 재동기화 진행")
+                    await self._full_sync()
+
+            self._stale = False
+
+    async def _full_sync(self):
+        """윈도우 전체를 처음부터 동기화"""
+        window_start, window_end = self._target_window()
+        logger.info("일정 전체 동기화 시작: %s ~ %s", window_start, window_end)
+        self.store.clear()
+        self._index = None
+
+        delta_link = await self._consume(self.outlook_client.iter_calendar_delta(
+            start_date=window_start + "Z", end_date=window_end + "Z"
+        ))
+        self.store.save_sync_state(window_start, window_end, delta_link)
+
+    async def _delta_sync(self, state: Dict[str, Any]):
+        """저장된 deltaLink로 변경분만 반영"""
+        delta_link = await self._consume(self.outlook_client.iter_calendar_delta(delta_link=state["delta_link"]))
+        self.store.save_sync_state(state["window_start"], state["window_end"], delta_link or state["delta_link"])
+
+    async def _consume(self, pages: AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str]]]) -> Optional[str]:
+        """델타 페이지를 미러에 적용하고 최종 deltaLink 반환"""
+        delta_link = None
+        changed = removed = 0
+        async for page, page_delta_link in pages:
+            removed_ids = [item["id"] for item in page if "@removed" in item]
+            updated = [item for item in page if "@removed" not in item]
+            if removed_ids:
+                self.store.delete_events(removed_ids)
+            if updated:
+                self.store.upsert_events(updated)
+            self._update_index(updated, removed_ids)
+            if self.search is not None:
+                self.search.remove(removed_ids)
+                self.search.add(updated)
+            changed += len(updated)
+            removed += len(removed_ids)
+            delta_link = page_delta_link or delta_link
+
+        logger.info("일정 동기화 완료: 변경 %d개, 삭제 %d개", changed, removed)
+        return delta_link
+
+    async def iter_event_pages(self, start_date: str, end_date: str, page_size: Optional[int] = None,
+                               max_results: Optional[int] = None,
+                               fields: Optional[List[str]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """미러에서 범위 내 일정을 페이지 단위로 조회 (OutlookClient.iter_event_pages와 동일한 형태)"""
+        await self.refresh()
+
+        page_size = page_size or config.EVENTS_PAGE_SIZE
+        if max_results is None:
+            max_results = config.EVENTS_MAX_RESULTS
+        remaining = max_results if max_results > 0 else None
+
+        select = list(fields) if fields else list(DEFAULT_EVENT_FIELDS)
+        if "id" not in select:
+            select.insert(0, "id")
+
+        for batch in self.store.iter_range(normalize_datetime(start_date), normalize_datetime(end_date), page_size):
+            # 미러에서 본 일정도 이후 수정 시 If-Match로 보호
+            self.outlook_client.remember_etags(batch, replace=False)
+            if remaining is not None:
+                batch = batch[:remaining]
+                remaining -= len(batch)
+
+            yield [{key: event[key] for key in select if key in event} for event in batch]
+
+            if remaining == 0:
+                break
+
+    def cached_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """미러에 있는 일정 (동기화 전이거나 윈도우 밖이면 None)"""
+        if not config.SYNC_ENABLED or self.store.get_sync_state() is None:
+            return None
+        event = self.store.get_event(event_id)
+        if event:
+            self.outlook_client.remember_etags([event], replace=False)
+        return event
+
+    def apply_write(self, event: Optional[Dict[str, Any]] = None, deleted_id: Optional[str] = None):
+        """서버에서 수행한 쓰기를 미러에 즉시 반영"""
+        if not config.SYNC_ENABLED or self.store.get_sync_state() is None:
+            return
+
+        if deleted_id:
+            self.store.delete_events([deleted_id])
+            self._update_index([], [deleted_id])
+
+        # 반복 일정의 회차는 다음 델타 동기화에서 전개됨
+        if event and event.get("id") and event.get("type", "singleInstance") == "singleInstance":
+            self.store.upsert_events([event])
+            self._update_index([event], [])
+
+        self.mark_stale()
+
+    def _update_index(self, updated: List[Dict[str, Any]], removed_ids: List[str]):
+        """충돌 검사 인덱스에 변경분 반영 (아직 만들지 않았으면 무시)"""
+        if self._index is None:
+            return
+        for event_id in removed_ids:
+            self._index.remove(event_id)
+        for event in updated:
+            if is_blocking(event):
+                self._index.add(
+                    event["id"],
+                    parse_graph_datetime(event_time(event, "start")).timestamp(),
+                    parse_graph_datetime(event_time(event, "end")).timestamp(),
+                    summarize_event(event)
+                )
+            else:
+                self._index.remove(event["id"])
+
+    async def _get_index(self) -> IntervalIndex:
+        """미러를 갱신하고 충돌 검사 인덱스 반환"""
+        await self.refresh()
+        if self._index is None:
+            self._index = IntervalIndex()
+            window_start, window_end = self._window()
+            for batch in self.store.iter_range(window_start, window_end, 500):
+                self._update_index(batch, [])
+            logger.info("충돌 검사 인덱스 생성: %d개 일정", len(self._index))
+        return self._index
+
+    async def find_conflicts(self, slots: List[Tuple[str, str]],
+                             exclude_id: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """시간대별로 겹치는 일정 목록 반환 (동기화 윈도우 밖이면 Graph에서 조회)"""
+        results = []
+        for start_date, end_date in slots:
+            if self.covers(start_date, end_date):
+                index = await self._get_index()
+                results.append(index.overlaps(
+                    parse_graph_datetime(start_date).timestamp(),
+                    parse_graph_datetime(end_date).timestamp(),
+                    exclude=exclude_id
+                ))
+            else:
+                events = await self.outlook_client.get_events(
+                    start_date, end_date, max_results=0, fields=CONFLICT_FIELDS
+                )
+                results.append([
+                    summarize_event(event) for event in events
+                    if is_blocking(event) and event.get("id") != exclude_id
+                ])
+        return results
+
+# 충돌 검사에 필요한 필드
+CONFLICT_FIELDS = ["id", "subject", "start", "end", "showAs", "isCancelled"]
+
+def is_blocking(event: Dict[str, Any]) -> bool:
+    """다른 일정과 겹치면 충돌로 보는 일정인지 (취소/한가함 표시 제외)"""
+    return not event.get("isCancelled") and event.get("showAs") != "free"
+
+def summarize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """충돌 보고용 요약"""
+    return {
+        "id": event.get("id"),
+        "subject": event.get("subject", "제목 없음"),
+        "start": event_time(event, "start"),
+        "end": event_time(event, "end")
+    }
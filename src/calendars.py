@@ -0,0 +1,183 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+from .config import config
+from .time_utils import event_time
+
+logger = logging.getLogger("outlook-mcp")
+
+# 사용자가 요청할 수 있는 '모든 캘린더' 값
+ALL_CALENDARS = "all"
+
+async def merge_sorted_pages(streams: List[AsyncIterator[List[Dict[str, Any]]]],
+                             key: Callable[[Dict[str, Any]], Any], max_concurrency: int = 4,
+                             on_error: Optional[Callable[[int, Exception], None]] = None,
+                             buffer_pages: int = 2) -> AsyncIterator[Dict[str, Any]]:
+    """각각 key 순으로 정렬된 페이지 스트림들을 힙으로 k-way 병합
+
+    스트림마다 백그라운드 작업이 페이지를 미리 받아 두되(최대 buffer_pages개), 동시에 받는 페이지 수는
+    max_concurrency로 제한합니다. 모든 스트림의 첫 페이지가 오면 바로 결과를 내보내기 시작하므로
+    느린 캘린더가 끝날 때까지 기다리지 않습니다. on_error가 있으면 실패한 스트림만 빼고 계속합니다.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=buffer_pages) for _ in streams]
+
+    async def produce(stream: AsyncIterator[List[Dict[str, Any]]], queue: asyncio.Queue):
+        # 세마포어는 페이지를 받는 동안만 잡음 (큐가 차서 기다리는 스트림이 다른 스트림을 막지 않도록)
+        try:
+            while True:
+                async with semaphore:
+                    try:
+                        page = await stream.__anext__()
+                    except StopAsyncIteration:
+                        break
+                await queue.put(page)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    tasks = [asyncio.create_task(produce(stream, queue)) for stream, queue in zip(streams, queues)]
+    pages: List[Optional[Iterator]] = [None] * len(streams)
+
+    async def next_event(index: int) -> Optional[Dict[str, Any]]:
+        """스트림의 다음 일정 (끝났거나 실패해 제외했으면 None)"""
+        while True:
+            if pages[index] is not None:
+                event = next(pages[index], None)
+                if event is not None:
+                    return event
+            page = await queues[index].get()
+            if page is None:
+                return None
+            if isinstance(page, Exception):
+                if on_error is None:
+                    raise page
+                on_error(index, page)
+                return None
+            pages[index] = iter(page)
+
+    try:
+        heads = await asyncio.gather(*(next_event(index) for index in range(len(streams))))
+        # (정렬 키, 스트림 번호, 일정): 스트림 번호가 서로 달라 일정끼리는 비교하지 않음
+        heap = [(key(event), index, event) for index, event in enumerate(heads) if event is not None]
+        heapq.heapify(heap)
+        while heap:
+            _, index, event = heap[0]
+            yield event
+            following = await next_event(index)
+            if following is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (key(following), index, following))
+    finally:
+        # 소비자가 중간에 멈추면(최대 개수 도달 등) 남은 조회를 취소
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for stream in streams:
+            await stream.aclose()
+
+async def _tag_pages(stream: AsyncIterator[List[Dict[str, Any]]], name: str) -> AsyncIterator[List[Dict[str, Any]]]:
+    """일정마다 캘린더 이름을 덧붙임"""
+    try:
+        async for page in stream:
+            for event in page:
+                event["calendar"] = name
+            yield page
+    finally:
+        await stream.aclose()
+
+class CalendarFanout:
+    """여러 캘린더(내 캘린더, 공유 캘린더, 그룹 캘린더)를 동시에 조회해 시작 시각 순으로 병합
+
+    캘린더 목록은 CALENDAR_LIST_TTL초 동안 캐시합니다.
+    """
+
+    def __init__(self, outlook_client):
+        self.outlook_client = outlook_client
+        self._calendars: Optional[List[Dict[str, Any]]] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def calendars(self) -> List[Dict[str, Any]]:
+        """캘린더 목록 (동시 호출은 한 번만 조회)"""
+        async with self._lock:
+            if self._calendars is None or time.monotonic() - self._loaded_at > config.CALENDAR_LIST_TTL:
+                self._calendars = await self.outlook_client.get_calendars()
+                self._loaded_at = time.monotonic()
+            return self._calendars
+
+    def invalidate(self):
+        """캘린더 목록 캐시 비우기"""
+        self._calendars = None
+
+    async def select(self, names: List[str]) -> List[Dict[str, Any]]:
+        """이름 또는 ID로 캘린더 선택 ('all'이면 전부)"""
+        calendars = await self.calendars()
+        if any(name.lower() == ALL_CALENDARS for name in names):
+            return calendars
+
+        selected = []
+        for name in names:
+            matches = [
+                calendar for calendar in calendars
+                if calendar["id"] == name or calendar["name"].lower() == name.lower()
+            ]
+            if not matches:
+                raise ValueError(f"캘린더를 찾을 수 없습니다: {name} (list_calendars로 목록 확인)")
+            selected.extend(match for match in matches if match not in selected)
+        return selected
+
+    async def iter_event_pages(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                               page_size: Optional[int] = None, max_results: Optional[int] = None,
+                               fields: Optional[List[str]] = None,
+                               calendars: Optional[List[str]] = None,
+                               failed: Optional[List[str]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """선택한 캘린더의 일정을 병합해 페이지 단위로 반환 (OutlookClient.iter_event_pages와 같은 형태)
+
+        일정마다 calendar(캘린더 이름)를 덧붙입니다. 권한이 없는 등 조회에 실패한 캘린더는 건너뛰고
+        failed 목록에 이름을 추가합니다.
+        """
+        page_size = page_size or config.EVENTS_PAGE_SIZE
+        if max_results is None:
+            max_results = config.EVENTS_MAX_RESULTS
+        selected = await self.select(calendars or [ALL_CALENDARS])
+        # calendar는 Graph 필드가 아니라 병합할 때 덧붙이는 값
+        graph_fields = [field for field in fields if field != "calendar"] if fields else None
+
+        def on_error(index: int, error: Exception):
+            if failed is not None:
+                failed.append(selected[index]["name"])
+            logger.warning("캘린더 조회 실패, 건너뜀: %s", error, extra={"fields": {"calendar": selected[index]["name"]}})
+
+        # 캘린더마다 최대 max_results개만 받으면 병합 결과의 앞부분은 정확함
+        streams = [
+            _tag_pages(self.outlook_client.iter_event_pages(
+                start_date=start_date, end_date=end_date, page_size=page_size,
+                max_results=max_results, fields=graph_fields, calendar=calendar["path"]
+            ), calendar["name"])
+            for calendar in selected
+        ]
+        merged = merge_sorted_pages(
+            streams, key=lambda event: event_time(event, "start"),
+            max_concurrency=config.CALENDAR_MAX_CONCURRENCY, on_error=on_error
+        )
+
+        page: List[Dict[str, Any]] = []
+        count = 0
+        try:
+            async for event in merged:
+                page.append(event)
+                count += 1
+                if max_results > 0 and count >= max_results:
+                    break
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+        finally:
+            await merged.aclose()
+        if page:
+            yield page
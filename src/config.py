@@ -17,16 +17,143 @@ class Config:
         "https://graph.microsoft.com/Calendars.ReadWrite",
         "https://graph.microsoft.com/User.Read"
     ]
+    # 공유 캘린더 일정 조회 (Calendars.Read.Shared), Microsoft 365 그룹 캘린더 조회 (Group.Read.All, 관리자 동의 필요)
+    # 켜면 권한이 늘어나므로 기존 계정은 다시 로그인해야 함
+    SHARED_CALENDARS: bool = os.getenv("SHARED_CALENDARS", "false").lower() == "true"
+    GROUP_CALENDARS: bool = os.getenv("GROUP_CALENDARS", "false").lower() == "true"
+    if SHARED_CALENDARS:
+        SCOPES.append("https://graph.microsoft.com/Calendars.Read.Shared")
+    if GROUP_CALENDARS:
+        SCOPES.append("https://graph.microsoft.com/Group.Read.All")
 
     # 서버 설정
     HOST: str = os.getenv("HOST", "localhost")
     PORT: int = int(os.getenv("PORT", "8000"))
+    # 통합 모드의 웹 서버 시작 시점: auto(로그인이 필요할 때만), always, never
+    WEB_SERVER: str = os.getenv("WEB_SERVER", "auto").lower()
+    # MCP HTTP 전송 (`outlook-mcp http`): 접속 키("키=계정,키=계정", 비우면 HOST가 localhost일 때만 시작하고 기본 계정 사용),
+    # 동시에 처리할 최대 요청 수 (넘으면 503), 세션 없이 요청마다 처리할지 (부하 분산기 뒤에 여러 개 띄울 때)
+    MCP_HTTP_KEYS: str = os.getenv("MCP_HTTP_KEYS", "")
+    MCP_HTTP_MAX_INFLIGHT: int = int(os.getenv("MCP_HTTP_MAX_INFLIGHT", "64"))
+    MCP_HTTP_STATELESS: bool = os.getenv("MCP_HTTP_STATELESS", "false").lower() == "true"
+    # `outlook-mcp http`의 워커 프로세스 수 (2 이상이면 세션 없는 streamable HTTP만 제공, SSE 제외)
+    MCP_HTTP_WORKERS: int = int(os.getenv("MCP_HTTP_WORKERS", "1"))
+    # 종료 시 진행 중인 웹/Graph 요청을 기다리는 최대 시간 (초, 넘으면 취소)
+    SHUTDOWN_TIMEOUT: float = float(os.getenv("SHUTDOWN_TIMEOUT", "10"))
 
-    # 토큰 저장 경로
+    # 로깅 (출력은 별도 스레드에서 처리): 수준, 형식(text 또는 json), 도구별 샘플링 비율("get_events=0.1,*=1",
+    # 경고 이상은 항상 기록), 가릴 필드 이름(도구 인자 등), 필드 문자열 최대 길이
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text").lower()
+    LOG_SAMPLING: str = os.getenv("LOG_SAMPLING", "")
+    LOG_REDACT_FIELDS: str = os.getenv("LOG_REDACT_FIELDS", "attendees,body,emailAddress")
+    LOG_MAX_FIELD_LENGTH: int = int(os.getenv("LOG_MAX_FIELD_LENGTH", "200"))
+
+    # 토큰 저장 경로 (TOKEN_FILE은 단일 사용자 시절 파일로, 있으면 TOKEN_DB_FILE로 가져옴)
     TOKEN_FILE: str = os.getenv("TOKEN_FILE", "token.json")
+    TOKEN_DB_FILE: str = os.getenv("TOKEN_DB_FILE", "tokens.db")
+
+    # 워커 프로세스가 공유하는 상태 저장소 (토큰, OAuth state, 공유 응답 캐시, 구독, 프로세스 간 잠금)
+    # sqlite면 TOKEN_DB_FILE(WAL)을 쓰고, "모듈:클래스"면 StateBackend 구현을 불러옴
+    STATE_BACKEND: str = os.getenv("STATE_BACKEND", "sqlite")
+    # 프로세스 간 잠금 유지 시간(주인이 죽으면 이 시간 뒤 풀림)과 잠금 대기 시간 (초)
+    STATE_LOCK_TTL: float = float(os.getenv("STATE_LOCK_TTL", "30"))
+    STATE_LOCK_TIMEOUT: float = float(os.getenv("STATE_LOCK_TIMEOUT", "15"))
+    # 로그인 시작 후 callback까지 허용하는 시간 (초)
+    OAUTH_STATE_TTL: float = float(os.getenv("OAUTH_STATE_TTL", "600"))
+    # 읽기 응답 캐시를 상태 저장소로 워커끼리 공유할지 (무효화도 모든 워커에 반영)
+    SHARED_CACHE: bool = os.getenv("SHARED_CACHE", "false").lower() == "true"
+
+    # 다중 계정 설정 (DEFAULT_ACCOUNT가 비어 있으면 가장 최근 로그인한 계정 사용)
+    DEFAULT_ACCOUNT: str = os.getenv("DEFAULT_ACCOUNT", "")
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "100"))
+    TOKEN_CACHE_IDLE: float = float(os.getenv("TOKEN_CACHE_IDLE", "3600"))
+
+    # 토큰 갱신 설정 (초)
+    TOKEN_EXPIRY_MARGIN: float = float(os.getenv("TOKEN_EXPIRY_MARGIN", "60"))
+    TOKEN_REFRESH_AHEAD: float = float(os.getenv("TOKEN_REFRESH_AHEAD", "300"))
+
+    # Microsoft Graph API (벤치마크 등에서 로컬 모의 서버로 바꿔 쓸 수 있음)
+    GRAPH_API_ENDPOINT: str = os.getenv("GRAPH_API_ENDPOINT", "https://graph.microsoft.com/v1.0")
+    AUTHORITY: str = os.getenv("AUTHORITY", f"https://login.microsoftonline.com/{AZURE_TENANT_ID}")
+
+    # 일정 조회 페이지 설정 (EVENTS_MAX_RESULTS=0이면 제한 없음)
+    EVENTS_PAGE_SIZE: int = int(os.getenv("EVENTS_PAGE_SIZE", "50"))
+    EVENTS_MAX_RESULTS: int = int(os.getenv("EVENTS_MAX_RESULTS", "500"))
+
+    # 도구 출력 크기 한도 (바이트, 0이면 제한 없음)
+    OUTPUT_MAX_BYTES: int = int(os.getenv("OUTPUT_MAX_BYTES", "60000"))
+
+    # 읽기 도구 응답 캐시 (초, TTL=0이면 저장하지 않고 동시 요청 합치기만 적용)
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+
+    # 계정별로 기억할 일정 ETag 수 (조건부 조회 If-None-Match, 수정 시 If-Match)
+    ETAG_CACHE_SIZE: int = int(os.getenv("ETAG_CACHE_SIZE", "2000"))
+
+    # 일정 전문 검색 색인 (SQLite FTS5, 시작할 때 과거/미래 범위를 백그라운드에서 색인하고 주기적으로 다시 색인)
+    SEARCH_ENABLED: bool = os.getenv("SEARCH_ENABLED", "true").lower() == "true"
+    SEARCH_DB_FILE: str = os.getenv("SEARCH_DB_FILE", "search.db")
+    SEARCH_HISTORY_DAYS: int = int(os.getenv("SEARCH_HISTORY_DAYS", "1095"))
+    SEARCH_FUTURE_DAYS: int = int(os.getenv("SEARCH_FUTURE_DAYS", "365"))
+    SEARCH_REINDEX_HOURS: float = float(os.getenv("SEARCH_REINDEX_HOURS", "24"))
+    SEARCH_PAGE_SIZE: int = int(os.getenv("SEARCH_PAGE_SIZE", "100"))
+    SEARCH_MAX_RESULTS: int = int(os.getenv("SEARCH_MAX_RESULTS", "20"))
+
+    # 여러 캘린더 동시 조회 (get_events의 calendars 인자): 동시에 받는 페이지 수, 캘린더 목록 캐시 초
+    CALENDAR_MAX_CONCURRENCY: int = int(os.getenv("CALENDAR_MAX_CONCURRENCY", "4"))
+    CALENDAR_LIST_TTL: float = float(os.getenv("CALENDAR_LIST_TTL", "300"))
+
+    # 일정 내보내기/가져오기 (NDJSON, iCalendar): 내보내기 페이지 크기, 가져오기 $batch 묶음 크기,
+    # MCP 도구가 읽고 쓸 수 있는 디렉터리 (도구의 path는 이 안의 상대 경로만 허용, CLI는 제한 없음)
+    EXPORT_PAGE_SIZE: int = int(os.getenv("EXPORT_PAGE_SIZE", "100"))
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "100"))
+    EXPORT_DIR: str = os.getenv("EXPORT_DIR", "exports")
+
+    # Graph 변경 알림 (WEBHOOK_URL은 외부에서 /webhooks/graph로 접근 가능한 HTTPS 주소, 비우면 사용 안 함)
+    # 구독이 살아 있는 동안 주기적 동기화를 멈추고 읽기 응답을 PUSH_CACHE_TTL초 동안 캐시
+    WEBHOOK_URL: str = os.getenv("WEBHOOK_URL", "")
+    WEBHOOK_CLIENT_STATE: str = os.getenv("WEBHOOK_CLIENT_STATE", "")
+    SUBSCRIPTION_LIFETIME_MINUTES: int = int(os.getenv("SUBSCRIPTION_LIFETIME_MINUTES", "4230"))
+    SUBSCRIPTION_RENEW_AHEAD: float = float(os.getenv("SUBSCRIPTION_RENEW_AHEAD", "3600"))
+    PUSH_CACHE_TTL: float = float(os.getenv("PUSH_CACHE_TTL", "3600"))
+
+    # 반복 일정 로컬 전개 (동기화 윈도우 밖의 RECURRENCE_MIN_DAYS일 이상 조회에 사용, 마스터 캐시 초)
+    RECURRENCE_EXPANSION: bool = os.getenv("RECURRENCE_EXPANSION", "true").lower() == "true"
+    RECURRENCE_MIN_DAYS: int = int(os.getenv("RECURRENCE_MIN_DAYS", "62"))
+    RECURRENCE_CACHE_TTL: float = float(os.getenv("RECURRENCE_CACHE_TTL", "300"))
+
+    # 로컬 일정 미러 (calendarView 델타 동기화)
+    SYNC_ENABLED: bool = os.getenv("SYNC_ENABLED", "true").lower() == "true"
+    SYNC_DB_FILE: str = os.getenv("SYNC_DB_FILE", "events.db")
+    SYNC_WINDOW_PAST_DAYS: int = int(os.getenv("SYNC_WINDOW_PAST_DAYS", "30"))
+    SYNC_WINDOW_FUTURE_DAYS: int = int(os.getenv("SYNC_WINDOW_FUTURE_DAYS", "180"))
+    SYNC_INTERVAL: float = float(os.getenv("SYNC_INTERVAL", "60"))
+
+    # Graph 요청 스케줄러 (메일박스 단위 속도/동시성 제한, 스로틀링 재시도)
+    GRAPH_RATE_LIMIT: float = float(os.getenv("GRAPH_RATE_LIMIT", "15"))
+    GRAPH_RATE_BURST: float = float(os.getenv("GRAPH_RATE_BURST", "20"))
+    GRAPH_MAX_CONCURRENCY: int = int(os.getenv("GRAPH_MAX_CONCURRENCY", "4"))
+    GRAPH_MAX_RETRIES: int = int(os.getenv("GRAPH_MAX_RETRIES", "3"))
+    GRAPH_BACKOFF_BASE: float = float(os.getenv("GRAPH_BACKOFF_BASE", "1"))
+    GRAPH_BACKOFF_MAX: float = float(os.getenv("GRAPH_BACKOFF_MAX", "30"))
+
+    # JSON $batch 동시 전송 수
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+    # 회의 시간 찾기 (근무 시간은 WORKING_TIME_ZONE 기준)
+    SCHEDULE_CHUNK_SIZE: int = int(os.getenv("SCHEDULE_CHUNK_SIZE", "20"))
+    WORKING_TIME_ZONE: str = os.getenv("WORKING_TIME_ZONE", "UTC")
+    WORKING_HOURS_START: str = os.getenv("WORKING_HOURS_START", "09:00")
+    WORKING_HOURS_END: str = os.getenv("WORKING_HOURS_END", "18:00")
 
-    # Microsoft Graph API
-    GRAPH_API_ENDPOINT: str = "https://graph.microsoft.com/v1.0"
-    AUTHORITY: str = f"https://login.microsoftonline.com/{AZURE_TENANT_ID}"
+    # HTTP 커넥션 풀 설정
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "120"))
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+    HTTP_WARMUP: bool = os.getenv("HTTP_WARMUP", "true").lower() == "true"
 
 config = Config()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from .config import config
+from .time_utils import event_time
+
+def event_db_file(account: Optional[str] = None) -> str:
+    """계정별 미러 DB 파일 경로 (계정 미지정 시 SYNC_DB_FILE)"""
+    if not account:
+        return config.SYNC_DB_FILE
+    base, ext = os.path.splitext(config.SYNC_DB_FILE)
+    return f"{base}-{hashlib.sha1(account.encode()).hexdigest()[:12]}{ext}"
+
+class EventStore:
+    """Graph 일정의 로컬 SQLite 미러"""
+
+    def __init__(self, db_file: Optional[str] = None):
+        self.db_file = db_file or config.SYNC_DB_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        """테이블 및 인덱스 생성"""
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id TEXT PRIMARY KEY,
+                    start TEXT NOT NULL,
+                    end TEXT NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_events_start ON events (start);
+                CREATE INDEX IF NOT EXISTS idx_events_end ON events (end);
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    name TEXT PRIMARY KEY,
+                    window_start TEXT NOT NULL,
+                    window_end TEXT NOT NULL,
+                    delta_link TEXT,
+                    synced_at REAL NOT NULL
+                );
+            """)
+
+    def upsert_events(self, events: Iterable[Dict[str, Any]]):
+        """일정 추가 또는 갱신"""
+        rows = [
+            (event["id"], event_time(event, "start"), event_time(event, "end"), json.dumps(event, ensure_ascii=False))
+            for event in events
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO events (id, start, end, data) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def delete_events(self, event_ids: Iterable[str]):
+        """일정 삭제"""
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM events WHERE id = ?", [(event_id,) for event_id in event_ids])
+
+    def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """ID로 일정 조회"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM events WHERE id = ?", (event_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def iter_range(self, start: str, end: str, batch_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+        """범위와 겹치는 일정을 시작 시간 순으로 batch_size개씩 반환 (start/end는 UTC 정렬용 문자열)"""
+        last_start, last_id = "", ""
+        while True:
+            # 키셋 페이지네이션으로 큰 범위도 일정한 메모리로 읽음
+            with self._lock:
+                rows = self._conn.execute(
+                    """
+                    SELECT id, start, data FROM events
+                    WHERE start < ? AND end > ? AND (start, id) > (?, ?)
+                    ORDER BY start, id LIMIT ?
+                    """,
+                    (end, start, last_start, last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield [json.loads(row["data"]) for row in rows]
+            last_start, last_id = rows[-1]["start"], rows[-1]["id"]
+
+    def get_sync_state(self, name: str = "calendar") -> Optional[Dict[str, Any]]:
+        """동기화 상태 (윈도우, deltaLink) 조회"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return dict(row) if row else None
+
+    def save_sync_state(self, window_start: str, window_end: str, delta_link: Optional[str],
+                        name: str = "calendar"):
+        """동기화 상태 저장"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (name, window_start, window_end, delta_link, synced_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (name, window_start, window_end, delta_link, time.time())
+            )
+
+    def clear(self):
+        """미러 전체 삭제 (전체 재동기화 전)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events")
+            self._conn.execute("DELETE FROM sync_state")
+
+    def close(self):
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,145 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+# 출력 형식별 기본 필드 (id는 항상 포함)
+DEFAULT_OUTPUT_FIELDS = ["subject", "start", "end", "location", "id"]
+
+def field_value(event: Dict[str, Any], field: str) -> str:
+    """중첩된 Graph 필드를 한 줄 문자열로 변환"""
+    value = event.get(field)
+    if value is None:
+        return ""
+    if field in ("start", "end"):
+        # Graph의 소수점 이하 7자리(.0000000)는 정보가 없으므로 제거
+        return value.get("dateTime", "").split(".")[0]
+    if field == "location":
+        return value.get("displayName", "")
+    if field == "body":
+        return value.get("content", "")
+    if field == "organizer":
+        return value.get("emailAddress", {}).get("address", "")
+    if field == "attendees":
+        return ", ".join(a.get("emailAddress", {}).get("address", "") for a in value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+class EventFormatter(ABC):
+    """일정 목록 출력 형식기 (한 번 훑으면서 출력 한도를 넘는 일정은 건너뛰고 개수만 셈)"""
+
+    def __init__(self, fields: Optional[List[str]] = None, max_bytes: int = 0):
+        self.fields = list(fields) if fields else list(DEFAULT_OUTPUT_FIELDS)
+        if "id" not in self.fields:
+            self.fields.append("id")
+        self.max_bytes = max_bytes
+        self.parts: List[str] = []
+        self.size = 0
+        self.count = 0
+        self.truncated = 0
+
+    def header(self) -> str:
+        return ""
+
+    @abstractmethod
+    def render(self, event: Dict[str, Any]) -> str:
+        """일정 하나를 출력 문자열로 변환"""
+
+    def add(self, event: Dict[str, Any]):
+        """일정 추가 (출력 한도를 넘으면 생략 개수만 증가)"""
+        if self.truncated:
+            self.truncated += 1
+            return
+
+        part = self.render(event)
+        part_size = len(part.encode("utf-8"))
+        if self.max_bytes and self.size + part_size > self.max_bytes:
+            self.truncated += 1
+            return
+
+        self.parts.append(part)
+        self.size += part_size
+        self.count += 1
+
+    def footer(self) -> str:
+        if self.truncated:
+            return f"\n... 출력 한도({self.max_bytes}바이트) 초과로 {self.truncated}개 일정 생략"
+        return ""
+
+    def finish(self) -> str:
+        """최종 출력 (한 번만 join)"""
+        return self.header() + "".join(self.parts) + self.footer()
+
+class TextFormatter(EventFormatter):
+    """기존 한국어 레이아웃"""
+
+    LABELS = {
+        "subject": "제목", "start": "시작", "end": "종료", "location": "장소",
+        "bodyPreview": "내용", "attendees": "참석자", "organizer": "주최자", "calendar": "캘린더", "id": "ID"
+    }
+
+    def __init__(self, fields: Optional[List[str]] = None, max_bytes: int = 0):
+        super().__init__(fields, max_bytes)
+        # 기존 출력과 같이 id를 마지막에 표시
+        self.fields = [field for field in self.fields if field != "id"] + ["id"]
+
+    def header(self) -> str:
+        return "일정 목록:\n\n"
+
+    def render(self, event: Dict[str, Any]) -> str:
+        lines = []
+        for field in self.fields:
+            value = field_value(event, field)
+            if field in ("subject", "start", "end", "id") or value:
+                if field == "subject":
+                    value = value or "제목 없음"
+                elif field in ("start", "end"):
+                    value = value or "시간 정보 없음"
+                lines.append(f"{self.LABELS.get(field, field)}: {value}")
+        lines.append("-" * 50)
+        return "\n".join(lines) + "\n"
+
+class CompactFormatter(EventFormatter):
+    """일정당 한 줄 (필드는 ' | '로 구분)"""
+
+    def render(self, event: Dict[str, Any]) -> str:
+        return " | ".join(field_value(event, field).replace("\n", " ") for field in self.fields) + "\n"
+
+class TableFormatter(EventFormatter):
+    """마크다운 표"""
+
+    def header(self) -> str:
+        return "| " + " | ".join(self.fields) + " |\n|" + "---|" * len(self.fields) + "\n"
+
+    def render(self, event: Dict[str, Any]) -> str:
+        cells = (field_value(event, field).replace("|", "\\|").replace("\n", " ") for field in self.fields)
+        return "| " + " | ".join(cells) + " |\n"
+
+class JsonFormatter(EventFormatter):
+    """{"events": [...], "count": n, "truncated": k} 형태의 JSON"""
+
+    def render(self, event: Dict[str, Any]) -> str:
+        projected = {field: event[field] for field in self.fields if field in event}
+        separator = "," if self.parts else ""
+        return separator + json.dumps(projected, ensure_ascii=False, separators=(",", ":"))
+
+    def header(self) -> str:
+        return '{"events":['
+
+    def footer(self) -> str:
+        return f'],"count":{self.count},"truncated":{self.truncated}}}'
+
+FORMATTERS = {
+    "text": TextFormatter,
+    "compact": CompactFormatter,
+    "table": TableFormatter,
+    "json": JsonFormatter
+}
+
+def create_formatter(output_format: str = "text", fields: Optional[List[str]] = None,
+                     max_bytes: int = 0) -> EventFormatter:
+    """출력 형식 이름으로 형식기 생성"""
+    formatter_class = FORMATTERS.get(output_format)
+    if formatter_class is None:
+        raise ValueError(f"지원하지 않는 출력 형식: {output_format} (가능: {', '.join(FORMATTERS)})")
+    return formatter_class(fields, max_bytes)
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+import httpx
+from .config import config
+from .metrics import GRAPH_IN_FLIGHT, GRAPH_QUEUED, GRAPH_THROTTLED
+
+logger = logging.getLogger("outlook-mcp")
+
+# 재시도 대상 상태 코드 (스로틀링/일시적 장애)
+RETRYABLE_STATUS = {429, 503, 504}
+
+# 같은 요청을 다시 보내도 결과가 같은 메서드만 자동 재시도
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt: int) -> float:
+    """지수 백오프 + full jitter"""
+    ceiling = min(config.GRAPH_BACKOFF_MAX, config.GRAPH_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+class TokenBucket:
+    """초당 rate개, 최대 capacity개까지 누적되는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class MailboxLimiter:
+    """메일박스별 속도/동시성 제한과 통계"""
+
+    def __init__(self):
+        self.bucket = TokenBucket(config.GRAPH_RATE_LIMIT, config.GRAPH_RATE_BURST)
+        self.semaphore = asyncio.Semaphore(config.GRAPH_MAX_CONCURRENCY)
+        # Retry-After를 받으면 해당 시각까지 메일박스 전체 요청을 멈춤
+        self.blocked_until = 0.0
+        self.queued = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.last_retry_after: Optional[float] = None
+
+    def stats(self) -> Dict[str, Any]:
+        """튜닝용 통계"""
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "last_retry_after": self.last_retry_after,
+            "blocked_for": max(0.0, self.blocked_until - time.monotonic())
+        }
+
+class GraphScheduler:
+    """모든 Graph 요청 앞단의 스케줄러 (토큰 버킷 + 동시성 제한 + Retry-After 재시도)"""
+
+    def __init__(self):
+        self._mailboxes: Dict[str, MailboxLimiter] = {}
+        # 종료 시 완료를 기다릴 요청 태스크
+        self._active: Set[asyncio.Task] = set()
+        self._closing = False
+
+    def _limiter(self, mailbox: str) -> MailboxLimiter:
+        limiter = self._mailboxes.get(mailbox)
+        if limiter is None:
+            limiter = MailboxLimiter()
+            self._mailboxes[mailbox] = limiter
+        return limiter
+
+    async def execute(self, mailbox: str, method: str, send: Callable[[], Awaitable[httpx.Response]],
+                      idempotent: Optional[bool] = None) -> httpx.Response:
+        """요청 실행 (멱등 요청만 스로틀링 시 자동 재시도)
+
+        getSchedule처럼 조회 전용 POST는 idempotent=True로 재시도를 허용할 수 있습니다.
+        """
+        if self._closing:
+            raise Exception("서버 종료 중이라 Graph 요청을 보낼 수 없습니다")
+
+        task = asyncio.current_task()
+        self._active.add(task)
+        try:
+            return await self._execute(mailbox, method, send, idempotent)
+        finally:
+            self._active.discard(task)
+
+    async def _execute(self, mailbox: str, method: str, send: Callable[[], Awaitable[httpx.Response]],
+                       idempotent: Optional[bool]) -> httpx.Response:
+        limiter = self._limiter(mailbox)
+        retryable = method.upper() in IDEMPOTENT_METHODS if idempotent is None else idempotent
+        attempt = 0
+
+        while True:
+            limiter.queued += 1
+            dequeued = False
+            try:
+                async with limiter.semaphore:
+                    limiter.queued -= 1
+                    dequeued = True
+
+                    wait = limiter.blocked_until - time.monotonic()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    await limiter.bucket.acquire()
+
+                    limiter.in_flight += 1
+                    limiter.requests += 1
+                    try:
+                        response = await send()
+                    finally:
+                        limiter.in_flight -= 1
+            finally:
+                # 대기 중 취소된 경우에도 큐 길이를 맞춤
+                if not dequeued:
+                    limiter.queued -= 1
+
+            if response.status_code not in RETRYABLE_STATUS:
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            limiter.throttled += 1
+            GRAPH_THROTTLED.labels(str(response.status_code)).inc()
+            if retry_after is not None:
+                limiter.last_retry_after = retry_after
+                limiter.blocked_until = max(limiter.blocked_until, time.monotonic() + retry_after)
+
+            if not retryable or attempt >= config.GRAPH_MAX_RETRIES:
+                logger.warning("Graph 스로틀링 (%s), 재시도 안 함: %s", response.status_code, method,
+                               extra={"fields": {"mailbox": mailbox}})
+                return response
+
+            delay = retry_after if retry_after is not None else backoff_delay(attempt)
+            logger.warning(
+                "Graph 스로틀링 (%s), %.1f초 후 재시도 (%d/%d): %s", response.status_code, delay,
+                attempt + 1, config.GRAPH_MAX_RETRIES, method, extra={"fields": {"mailbox": mailbox}}
+            )
+            attempt += 1
+            limiter.retries += 1
+            await asyncio.sleep(delay)
+
+    async def drain(self, timeout: float):
+        """새 요청을 막고 진행 중인 요청이 끝나길 기다림 (timeout이 지나면 취소)"""
+        self._closing = True
+        pending = {task for task in self._active if not task.done() and task is not asyncio.current_task()}
+        if not pending:
+            return
+
+        logger.info("진행 중인 Graph 요청 %d개 완료 대기 (최대 %.0f초)", len(pending), timeout)
+        _, pending = await asyncio.wait(pending, timeout=timeout)
+        if pending:
+            logger.warning("종료 대기 시간 초과로 Graph 요청 %d개 취소", len(pending))
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """메일박스별 통계"""
+        return {mailbox: limiter.stats() for mailbox, limiter in self._mailboxes.items()}
+
+    def gauge(self, attribute: str) -> Dict[tuple, float]:
+        """메일박스별 MailboxLimiter 속성 값 (/metrics 수집용)"""
+        return {(mailbox,): getattr(limiter, attribute) for mailbox, limiter in self._mailboxes.items()}
+
+# 프로세스 전역 스케줄러
+graph_scheduler = GraphScheduler()
+
+GRAPH_IN_FLIGHT.set_function(lambda: graph_scheduler.gauge("in_flight"))
+GRAPH_QUEUED.set_function(lambda: graph_scheduler.gauge("queued"))
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from typing import Dict
+import httpx
+from .config import config
+
+logger = logging.getLogger("outlook-mcp")
+
+# 이벤트 루프별 공유 클라이언트 (httpx 커넥션은 생성된 루프에 묶여 있음)
+_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+def _http2_available() -> bool:
+    """h2 패키지 설치 여부 확인"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _create_client() -> httpx.AsyncClient:
+    """커넥션 풀 설정이 적용된 AsyncClient 생성"""
+    limits = httpx.Limits(
+        max_connections=config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY
+    )
+    timeout = httpx.Timeout(config.HTTP_TIMEOUT, connect=config.HTTP_CONNECT_TIMEOUT)
+
+    http2 = config.HTTP2_ENABLED and _http2_available()
+    if config.HTTP2_ENABLED and not http2:
+        logger.warning("h2 패키지가 없어 HTTP/1.1로 동작합니다 (pip install 'httpx[http2]')")
+
+    return httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout)
+
+def get_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공유 HTTP 클라이언트 반환"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _create_client()
+        _clients[loop] = client
+    return client
+
+async def warm_up_http_client():
+    """Graph/로그인 엔드포인트에 미리 연결하여 DNS/TCP/TLS 비용을 선반영"""
+    if not config.HTTP_WARMUP:
+        return
+
+    client = get_http_client()
+    urls = [
+        config.GRAPH_API_ENDPOINT,
+        f"{config.AUTHORITY}/v2.0/.well-known/openid-configuration"
+    ]
+    results = await asyncio.gather(*(client.head(url) for url in urls), return_exceptions=True)
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.warning("커넥션 예열 실패: %s (%s)", url, result)
+        else:
+            logger.info("커넥션 예열 완료: %s (%s)", url, result.http_version)
+
+async def close_http_client():
+    """현재 이벤트 루프의 공유 HTTP 클라이언트 종료"""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        logger.info("HTTP 커넥션 풀 종료")
@@ -0,0 +1,54 @@
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Tuple
+
+class IntervalIndex:
+    """시작 시간 정렬 리스트 기반 구간 인덱스
+
+    가장 긴 구간 길이를 함께 기록해 두면, [start, end)와 겹치는 구간은 시작 시간이
+    start - max_length 이상 end 미만인 항목 중에서만 찾으면 되므로 이진 탐색으로 범위를 좁힐 수 있습니다.
+    시간 값은 비교 가능한 숫자(예: epoch 초)를 사용합니다.
+    """
+
+    def __init__(self):
+        self._starts: List[Tuple[float, str]] = []
+        self._items: Dict[str, Tuple[float, float, Any]] = {}
+        self._max_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, key: str, start: float, end: float, value: Any = None):
+        """구간 추가 (같은 key가 있으면 교체)"""
+        self.remove(key)
+        self._items[key] = (start, end, value)
+        insort(self._starts, (start, key))
+        self._max_length = max(self._max_length, end - start)
+
+    def remove(self, key: str):
+        """구간 삭제"""
+        item = self._items.pop(key, None)
+        if item is None:
+            return
+        position = bisect_left(self._starts, (item[0], key))
+        if position < len(self._starts) and self._starts[position] == (item[0], key):
+            del self._starts[position]
+
+    def clear(self):
+        """전체 삭제"""
+        self._starts.clear()
+        self._items.clear()
+        self._max_length = 0.0
+
+    def overlaps(self, start: float, end: float, exclude: Optional[str] = None) -> List[Any]:
+        """[start, end)와 겹치는 구간의 value 목록 (시작 시간 순)"""
+        low = bisect_left(self._starts, (start - self._max_length, ""))
+        high = bisect_left(self._starts, (end, ""))
+
+        result = []
+        for _, key in self._starts[low:high]:
+            if key == exclude:
+                continue
+            item_start, item_end, value = self._items[key]
+            if item_start < end and item_end > start:
+                result.append(value)
+        return result
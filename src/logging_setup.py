@@ -0,0 +1,164 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, Optional
+from .config import config
+
+# 기존 텍스트 로그 형식
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 목록 필드는 이 개수까지만 기록
+MAX_LIST_ITEMS = 10
+
+# 도구 호출 하나(와 그 호출이 보낸 Graph 요청)를 묶는 상관 ID, 도구 이름, 이 호출의 로그를 남길지
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+_tool: ContextVar[Optional[str]] = ContextVar("tool", default=None)
+_sampled: ContextVar[bool] = ContextVar("sampled", default=True)
+
+_listener: Optional[QueueListener] = None
+# configure_logging()에서 설정을 읽어 채움
+_sampling_rates: Dict[str, float] = {}
+_redact_fields: frozenset = frozenset()
+
+def parse_sampling(value: str) -> Dict[str, float]:
+    """LOG_SAMPLING ("도구=비율,*=비율") -> {도구: 비율}"""
+    rates = {}
+    for item in filter(None, (item.strip() for item in value.split(","))):
+        tool, separator, rate = item.partition("=")
+        if not separator:
+            raise ValueError(f"LOG_SAMPLING 형식 오류 (도구=비율): {item}")
+        rates[tool.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+def current_correlation_id() -> Optional[str]:
+    """현재 도구 호출의 상관 ID (도구 호출 밖이면 None)"""
+    return _correlation_id.get()
+
+@contextmanager
+def tool_call_context(tool: str) -> Iterator[str]:
+    """도구 호출 동안 상관 ID와 샘플링 여부 지정 (하위 태스크에도 전달됨)"""
+    rate = _sampling_rates.get(tool, _sampling_rates.get("*", 1.0))
+    tokens = [
+        (_correlation_id, _correlation_id.set(str(uuid.uuid4()))),
+        (_tool, _tool.set(tool)),
+        (_sampled, _sampled.set(rate >= 1.0 or random.random() < rate))
+    ]
+    try:
+        yield _correlation_id.get()
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+def redact(value: Any, depth: int = 0) -> Any:
+    """로그 필드 정리: LOG_REDACT_FIELDS 키는 가리고, 긴 문자열과 목록은 자름 (원본은 그대로 두고 새 값 반환)"""
+    if depth > 5:
+        return "..."
+    if isinstance(value, dict):
+        return {
+            key: "***" if key in _redact_fields else redact(item, depth + 1)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        items = [redact(item, depth + 1) for item in value[:MAX_LIST_ITEMS]]
+        if len(value) > MAX_LIST_ITEMS:
+            items.append(f"...(+{len(value) - MAX_LIST_ITEMS}개)")
+        return items
+    if isinstance(value, str) and len(value) > config.LOG_MAX_FIELD_LENGTH:
+        return value[:config.LOG_MAX_FIELD_LENGTH] + f"...(+{len(value) - config.LOG_MAX_FIELD_LENGTH}자)"
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # 그 밖의 객체는 참조를 남기지 않도록 문자열로 바꿈
+    return redact(str(value), depth + 1)
+
+class ContextFilter(logging.Filter):
+    """로그를 남긴 쪽(이벤트 루프)에서 상관 ID를 붙이고 필드를 정리된 복사본으로 바꿈
+
+    샘플링에서 빠진 도구 호출의 WARNING 미만 로그는 버립니다. 필드는 여기서 복사해 두므로
+    호출한 쪽이 이후 인자를 바꿔도 리스너 스레드가 쓰는 값에는 영향이 없습니다.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING and not _sampled.get():
+            return False
+        record.correlation_id = _correlation_id.get()
+        record.tool = _tool.get()
+        fields = getattr(record, "fields", None)
+        if fields:
+            record.fields = redact(fields)
+        return True
+
+class DeferredQueueHandler(QueueHandler):
+    """레코드를 포맷하지 않고 그대로 큐에 넣음 (메시지 조합과 직렬화는 리스너 스레드에서)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 레코드"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key in ("correlation_id", "tool"):
+            if getattr(record, key, None):
+                entry[key] = getattr(record, key)
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry["fields"] = fields
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """기존 텍스트 형식 뒤에 상관 ID와 정리된 필드를 덧붙임"""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        correlation_id = getattr(record, "correlation_id", None)
+        if correlation_id:
+            line += f" [{correlation_id}]"
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + json.dumps(fields, ensure_ascii=False, default=str)
+        return line
+
+def configure_logging():
+    """루트 로거를 큐 핸들러로 설정하고 stderr 출력은 리스너 스레드에서 처리 (여러 번 호출해도 한 번만 적용)"""
+    global _listener, _sampling_rates, _redact_fields
+    if _listener is not None:
+        return
+
+    _sampling_rates = parse_sampling(config.LOG_SAMPLING)
+    _redact_fields = frozenset(filter(None, (field.strip() for field in config.LOG_REDACT_FIELDS.split(","))))
+
+    # stdio 모드에서는 stdout이 MCP 프로토콜이므로 stderr로 출력
+    output = logging.StreamHandler()
+    output.setFormatter(JsonFormatter() if config.LOG_FORMAT == "json" else TextFormatter())
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(config.LOG_LEVEL.upper())
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    # 종료 시 큐에 남은 로그를 모두 출력
+    atexit.register(_listener.stop)
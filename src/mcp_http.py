@@ -0,0 +1,152 @@
+import logging
+import secrets
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+from mcp.server import Server
+from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from starlette.types import Receive, Scope, Send
+from .config import config
+from .metrics import MCP_HTTP_REJECTED
+
+logger = logging.getLogger("outlook-mcp")
+
+# 접속 키 없이 MCP HTTP 전송을 열 수 있는 주소
+LOOPBACK_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+def parse_access_keys(value: str) -> Dict[str, str]:
+    """MCP_HTTP_KEYS ("키=계정,키=계정") -> {키: 계정}"""
+    keys = {}
+    for item in filter(None, (item.strip() for item in value.split(","))):
+        key, separator, account = item.partition("=")
+        if not separator or not key or not account:
+            raise ValueError(f"MCP_HTTP_KEYS 형식 오류 (키=계정): {item}")
+        keys[key.strip()] = account.strip()
+    return keys
+
+def check_http_exposure():
+    """MCP_HTTP_KEYS 없이 루프백이 아닌 주소에 MCP HTTP 전송을 열려고 하면 거부 (저장된 모든 계정이 노출됨)"""
+    if not parse_access_keys(config.MCP_HTTP_KEYS) and config.HOST not in LOOPBACK_HOSTS:
+        raise ValueError(
+            f"MCP_HTTP_KEYS 없이 {config.HOST}에 MCP HTTP 전송을 열 수 없습니다. "
+            "접속 키를 설정하거나 HOST를 localhost로 지정하세요."
+        )
+
+def request_account(request) -> Tuple[Optional[str], bool]:
+    """HTTP로 들어온 MCP 요청의 계정 -> (접속 키에 묶인 계정, 접속 키로 고정되었는지) (키가 없으면 (None, False))"""
+    if request is None:
+        return None, False
+    state = request.scope.get("state") or {}
+    if state.get("mcp_account"):
+        return state["mcp_account"], True
+    return None, False
+
+class _Endpoint:
+    """Starlette Route에 ASGI 앱을 그대로 연결 (함수가 아니면 요청/응답 변환 없이 호출됨)"""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await self.handler(scope, receive, send)
+
+class McpHttpTransport:
+    """웹 앱에 붙이는 MCP HTTP 전송 (streamable HTTP: /mcp, 이전 SSE 방식: /sse + /messages/)
+
+    모든 세션이 같은 이벤트 루프에서 돌며 Graph 커넥션 풀, 스케줄러, 캐시를 공유합니다.
+    MCP_HTTP_KEYS가 있으면 Authorization: Bearer <키>로 계정을 고정합니다. 키가 없으면 루프백 주소에서만
+    열 수 있고, stdio처럼 기본 계정(또는 도구의 account 인자)을 씁니다. 처리 중인 요청이 MCP_HTTP_MAX_INFLIGHT개를 넘으면
+    503과 Retry-After로 거절합니다. 워커가 여러 개면 다음 요청이 다른 워커로 갈 수 있으므로 세션 없는
+    streamable HTTP만 제공합니다 (SSE 제외).
+    """
+
+    def __init__(self, server: Server):
+        check_http_exposure()
+        self.server = server
+        self.keys = parse_access_keys(config.MCP_HTTP_KEYS)
+        self.sse = SseServerTransport("/messages/")
+        self.session_manager: Optional[StreamableHTTPSessionManager] = None
+        self.in_flight = 0
+        self.multi_worker = config.MCP_HTTP_WORKERS > 1
+
+
+    @property
+    def routes(self) -> list:
+        routes = [Route("/mcp", endpoint=_Endpoint(self.handle_streamable), methods=["GET", "POST", "DELETE"])]
+        if not self.multi_worker:
+            routes += [
+                Route("/sse", endpoint=_Endpoint(self.handle_sse), methods=["GET"]),
+                Mount("/messages", app=self.handle_messages)
+            ]
+        return routes
+
+    @asynccontextmanager
+    async def run(self) -> AsyncIterator[None]:
+        """웹 앱 수명 동안 세션 관리자 실행 (세션 관리자는 한 번만 실행할 수 있어 시작할 때마다 새로 만듦)"""
+        self.session_manager = StreamableHTTPSessionManager(
+            app=self.server, stateless=config.MCP_HTTP_STATELESS or self.multi_worker
+        )
+        async with self.session_manager.run():
+            logger.info("MCP HTTP 전송 시작: /mcp (streamable HTTP)" + ("" if self.multi_worker else ", /sse (SSE)"))
+            yield
+        self.session_manager = None
+
+    def _authorize(self, scope: Scope) -> Optional[JSONResponse]:
+        """접속 키 확인 후 계정을 scope에 기록 (거절할 때만 응답 반환)"""
+        if not self.keys:
+            return None
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        account = None
+        if scheme.lower() == "bearer":
+            account = next(
+                (account for key, account in self.keys.items() if secrets.compare_digest(key, token.strip())), None
+            )
+        if account is None:
+            MCP_HTTP_REJECTED.labels("unauthorized").inc()
+            return JSONResponse({"error": "접속 키가 필요합니다"}, status_code=401,
+                                headers={"WWW-Authenticate": "Bearer"})
+        scope.setdefault("state", {})["mcp_account"] = account
+        return None
+
+    async def _guarded(self, scope: Scope, receive: Receive, send: Send, handler, limited: bool = True):
+        rejected = self._authorize(scope)
+        if rejected is None and limited and self.in_flight >= config.MCP_HTTP_MAX_INFLIGHT:
+            # 요청을 쌓아 두지 않고 바로 거절해 클라이언트가 재시도하도록 함
+            MCP_HTTP_REJECTED.labels("overloaded").inc()
+            rejected = JSONResponse({"error": "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도하세요"},
+                                    status_code=503, headers={"Retry-After": "1"})
+        if rejected is not None:
+            await rejected(scope, receive, send)
+            return
+
+        if not limited:
+            await handler(scope, receive, send)
+            return
+        self.in_flight += 1
+        try:
+            await handler(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    async def handle_streamable(self, scope: Scope, receive: Receive, send: Send):
+        """streamable HTTP (GET은 서버 알림용 장기 스트림이므로 동시 처리 한도에서 제외)"""
+        if self.session_manager is None:
+            await JSONResponse({"error": "MCP HTTP 전송이 시작되지 않았습니다"}, status_code=503)(scope, receive, send)
+            return
+        await self._guarded(scope, receive, send, self.session_manager.handle_request,
+                            limited=scope["method"] != "GET")
+
+    async def handle_sse(self, scope: Scope, receive: Receive, send: Send):
+        """SSE 연결 하나가 MCP 세션 하나 (연결이 끊길 때까지 유지)"""
+        async def run_session(scope: Scope, receive: Receive, send: Send):
+            async with self.sse.connect_sse(scope, receive, send) as (read_stream, write_stream):
+                await self.server.run(read_stream, write_stream, self.server.create_initialization_options())
+
+        await self._guarded(scope, receive, send, run_session, limited=False)
+
+    async def handle_messages(self, scope: Scope, receive: Receive, send: Send):
+        """SSE 세션으로 보내는 클라이언트 메시지 (응답은 SSE 스트림으로 감)"""
+        await self._guarded(scope, receive, send, self.sse.handle_post_message)
@@ -1,17 +1,18 @@
 import asyncio
 import json
 import logging
-from datetime import datetime
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, time, timedelta
 from typing import Any, Sequence
-import uvicorn
-from fastapi import FastAPI, Request, HTTPException, Query
-from fastapi.responses import HTMLResponse, RedirectResponse
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from urllib.parse import urlencode
+from zoneinfo import ZoneInfo
+
+from .config import config
+from .logging_setup import configure_logging, tool_call_context
+
+# 로깅 설정 (포맷과 출력은 리스너 스레드에서 처리)
+configure_logging()
 logger = logging.getLogger("outlook-mcp")
 
 from mcp.server import Server
@@ -23,90 +24,234 @@ from mcp.types import (
     EmbeddedResource
 )
 
-from .config import config
 from .auth_manager import AuthManager
-from .outlook_client import OutlookClient
+from .outlook_client import EventConflictError, OutlookClient
+from .calendar_sync import CalendarSync
+from .recurrence import RecurrenceEngine
+from .subscriptions import REMOTE_CHANGE, SubscriptionManager
+from .search_index import EventSearch
+from .calendars import CalendarFanout
+from .calendar_io import FORMATS, export_events, import_events, resolve_tool_path
+from .http_client import warm_up_http_client, close_http_client
+from .graph_scheduler import graph_scheduler
+from .availability import find_free_slots
+from .formatters import create_formatter, FORMATTERS
+from .time_utils import event_time, format_utc, normalize_datetime, parse_graph_datetime
+from .metrics import CACHE_REQUESTS, TOOL_ERRORS, register_tools, tool_label, track_tool
+from .response_cache import ResponseCache, TimeRange
 
 # MCP 서버 초기화
 logger.info("MCP 서버 초기화 중...")
 mcp_server = Server("outlook-calendar")
 auth_manager = AuthManager()
-outlook_client = OutlookClient()
 logger.info("MCP 서버 초기화 완료")
 
-# FastAPI 앱 (OAuth callback용)
-app = FastAPI(title="Outlook Calendar MCP Server")
-
-# 전역 상태 저장용
-auth_state = {}
-
-@app.get("/")
-async def root():
-    """서버 상태 확인"""
-    is_authenticated = await auth_manager.is_authenticated()
-    return {
-        "message": "Outlook Calendar MCP Server",
-        "authenticated": is_authenticated,
-        "auth_url": "/auth/login" if not is_authenticated else None
-    }
-
-@app.get("/auth/login")
-async def login():
-    """OAuth 로그인 시작"""
-    logger.info("OAuth 로그인 시작")
-    auth_url, state = auth_manager.get_authorization_url()
-    auth_state[state] = True
-
-    return HTMLResponse(f"""
-    <html>
-        <head><title>Outlook Calendar 인증</title></head>
-        <body>
-            <h1>Outlook Calendar 인증</h1>
-            <p>아래 링크를 클릭하여 Microsoft 계정으로 로그인하세요:</p>
-            <a href="{auth_url}" target="_blank">Microsoft 로그인</a>
-        </body>
-    </html>
-    """)
-
-@app.get("/auth/callback")
-async def auth_callback(code: str = Query(...), state: str = Query(...)):
-    """OAuth callback 처리"""
-    logger.info(f"OAuth callback 받음: state={state}")
-    if state not in auth_state:
-        logger.error("잘못된 state 값")
-        raise HTTPException(status_code=400, detail="잘못된 state 값")
+# 계정별 Graph 클라이언트와 로컬 미러 (HTTP 커넥션 풀과 스케줄러는 공유)
+outlook_clients: dict[str, OutlookClient] = {}
+calendar_syncs: dict[str, CalendarSync] = {}
+recurrence_engines: dict[str, RecurrenceEngine] = {}
+event_searches: dict[str, EventSearch] = {}
+calendar_fanouts: dict[str, CalendarFanout] = {}
+
+def get_outlook_client(account: str) -> OutlookClient:
+    """계정의 OutlookClient 반환"""
+    if account not in outlook_clients:
+        outlook_clients[account] = OutlookClient(auth_manager, account)
+    return outlook_clients[account]
+
+def get_calendar_sync(account: str) -> CalendarSync:
+    """계정의 CalendarSync 반환"""
+    if account not in calendar_syncs:
+        calendar_syncs[account] = CalendarSync(get_outlook_client(account), search=get_event_search(account))
+    return calendar_syncs[account]
+
+def get_event_search(account: str) -> EventSearch:
+    """계정의 EventSearch 반환"""
+    if account not in event_searches:
+        event_searches[account] = EventSearch(get_outlook_client(account))
+    return event_searches[account]
+
+def get_calendar_fanout(account: str) -> CalendarFanout:
+    """계정의 CalendarFanout 반환"""
+    if account not in calendar_fanouts:
+        calendar_fanouts[account] = CalendarFanout(get_outlook_client(account))
+    return calendar_fanouts[account]
+
+def get_recurrence_engine(account: str) -> RecurrenceEngine:
+    """계정의 RecurrenceEngine 반환"""
+    if account not in recurrence_engines:
+        recurrence_engines[account] = RecurrenceEngine(get_outlook_client(account))
+    return recurrence_engines[account]
+
+def use_recurrence_engine(start_date: str | None, end_date: str | None) -> bool:
+    """반복 일정을 로컬에서 전개할 만큼 긴 범위 조회인지 (양 끝이 모두 있어야 함)"""
+    if not config.RECURRENCE_EXPANSION or not start_date or not end_date:
+        return False
+    span = parse_graph_datetime(end_date) - parse_graph_datetime(start_date)
+    return span >= timedelta(days=config.RECURRENCE_MIN_DAYS)
+
+# 읽기 도구(get_events, find_meeting_times) 응답 캐시
+response_cache = ResponseCache()
+
+def share_response_cache():
+    """SHARED_CACHE면 응답 캐시를 상태 저장소로 다른 워커와 공유 (읽기 도구 결과는 TextContent 목록)"""
+    if config.SHARED_CACHE:
+        response_cache.share(
+            auth_manager.token_store,
+            lambda contents: [content.text for content in contents],
+            lambda texts: [TextContent(type="text", text=text) for text in texts]
+        )
+
+# 캐시 키에 반영할 get_events 기본 인자 (생략한 요청과 기본값을 명시한 요청을 같은 키로)
+GET_EVENTS_DEFAULTS = {
+    "format": "text",
+    "max_results": config.EVENTS_MAX_RESULTS,
+    "max_output_bytes": config.OUTPUT_MAX_BYTES
+}
+
+def read_cache_key(account: str, name: str, arguments: dict) -> tuple:
+    """읽기 도구 캐시 키 (날짜는 UTC로 정규화, 출력에 영향이 없는 page_size는 제외)"""
+    normalized = {key: value for key, value in arguments.items() if key != "page_size"}
+    for key in ("start_date", "end_date"):
+        if normalized.get(key):
+            normalized[key] = normalize_datetime(normalized[key])
+    return account, name, json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+def request_range(start_date: str | None, end_date: str | None) -> TimeRange:
+    """조회 범위 (지정하지 않은 쪽은 무한대)"""
+    return (
+        parse_graph_datetime(start_date).timestamp() if start_date else float("-inf"),
+        parse_graph_datetime(end_date).timestamp() if end_date else float("inf")
+    )
 
+def event_range(event: dict) -> TimeRange:
+    """일정의 시간 범위"""
+    return (
+        parse_graph_datetime(event_time(event, "start")).timestamp(),
+        parse_graph_datetime(event_time(event, "end")).timestamp()
+    )
+
+def apply_write(account: str, event: dict | None = None, deleted_id: str | None = None, created: bool = False):
+    """쓰기 결과를 로컬 미러와 응답 캐시에 반영 (변경 전후 시간 범위와 겹치는 캐시만 무효화)"""
+    calendar_sync = get_calendar_sync(account)
+
+    # 반복 일정은 회차 범위를 알 수 없으므로 계정 전체 무효화
+    ranges: list[TimeRange] | None = []
+    if event and event.get("type", "singleInstance") != "singleInstance":
+        ranges = None
+    elif event:
+        ranges.append(event_range(event))
+
+    # 수정/삭제는 변경 전 범위도 무효화 (미러에 없으면 알 수 없으므로 계정 전체)
+    if ranges is not None and not created:
+        previous = calendar_sync.cached_event(deleted_id or event["id"])
+        if previous is None:
+            ranges = None
+        else:
+            ranges.append(event_range(previous))
+
+    # 삭제된 일정이 반복 일정일 수 있으므로 마스터 캐시도 비움
+    if event is None or event.get("type", "singleInstance") != "singleInstance":
+        get_recurrence_engine(account).invalidate()
+
+    calendar_sync.apply_write(event=event, deleted_id=deleted_id)
+    response_cache.invalidate(account, ranges)
+
+    search = get_event_search(account)
+    if deleted_id:
+        search.remove([deleted_id])
+    if event and event.get("id"):
+        search.add([event])
+
+# Graph 변경 알림 (WEBHOOK_URL을 설정한 경우)
+_sync_tasks: dict[str, asyncio.Task] = {}
+
+def apply_notification(account: str, event_id: str | None = None, change_type: str | None = None):
+    """변경 알림을 캐시에 반영 (바뀐 뒤의 시간 범위를 알 수 없으므로 계정 전체 무효화)
+
+    다른 워커가 받은 알림(REMOTE_CHANGE)이면 공유 캐시는 그 워커가 이미 무효화했으므로 이 워커의 캐시만 비웁니다.
+    """
+    calendar_sync = get_calendar_sync(account)
+    calendar_sync.mark_stale()
+    get_recurrence_engine(account).invalidate()
+    # 동기화 윈도우 밖의 삭제도 검색 결과에 남지 않도록 바로 반영 (수정은 동기화/재색인에서 반영)
+    if event_id and change_type == "deleted":
+        get_event_search(account).remove([event_id])
+    response_cache.invalidate(account, propagate=change_type != REMOTE_CHANGE)
+
+    # 알림이 몰려 와도 델타 동기화는 한 번만 미리 실행 (다음 조회가 기다리지 않도록)
+    if config.SYNC_ENABLED and account not in _sync_tasks:
+        task = asyncio.create_task(_sync_after_notification(calendar_sync))
+        _sync_tasks[account] = task
+        task.add_done_callback(lambda _: _sync_tasks.pop(account, None))
+
+async def _sync_after_notification(calendar_sync: CalendarSync):
     try:
-        token_data = await auth_manager.exchange_code_for_token(code)
-        del auth_state[state]
-        logger.info("OAuth 인증 성공")
-
-        return HTMLResponse("""
-        <html>
-            <head><title>인증 완료</title></head>
-            <body>
-                <h1>인증 완료!</h1>
-                <p>성공적으로 인증되었습니다. 이제 창을 닫으셔도 됩니다.</p>
-                <script>window.close();</script>
-            </body>
-        </html>
-        """)
+        await calendar_sync.refresh()
     except Exception as e:
-        logger.error(f"OAuth 인증 실패: {str(e)}")
-        raise HTTPException(status_code=400, detail=f"인증 실패: {str(e)}")
+        logger.warning("변경 알림 후 동기화 실패: %s", e)
+
+subscription_manager = SubscriptionManager(get_outlook_client, apply_notification, lambda: auth_manager.token_store)
+
+def get_app():
+    """OAuth 웹 앱 반환 (FastAPI는 처음 필요할 때만 import)"""
+    global _app
+    if _app is None:
+        from .web_app import create_app
+        _app = create_app(
+            auth_manager, subscription_manager if subscription_manager.enabled else None, mcp_http_transport
+        )
+    return _app
+
+_app = None
+
+# HTTP 모드(`outlook-mcp http`)에서 웹 앱에 붙이는 MCP 전송
+mcp_http_transport = None
 
-@app.get("/auth/logout")
-async def logout():
-    """로그아웃"""
-    logger.info("로그아웃 요청")
-    await auth_manager.clear_token()
-    return {"message": "로그아웃되었습니다."}
+def __getattr__(name: str):
+    """기존 `src.mcp_server:app` 참조 호환"""
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def format_conflicts(conflicts: list, indent: str = "") -> str:
+    """겹치는 일정 목록을 텍스트로 변환"""
+    return "\n".join(
+        f"{indent}- {conflict['subject']} ({conflict['start']} ~ {conflict['end']}, ID: {conflict['id']})"
+        for conflict in conflicts
+    )
+
+def format_event_version(event: dict) -> str:
+    """충돌 시 보여줄 최신 일정 요약"""
+    start = (event.get("start") or {}).get("dateTime", "")
+    end = (event.get("end") or {}).get("dateTime", "")
+    return f"{event.get('subject', '')} ({start} ~ {end}, ID: {event.get('id', '')})"
+
+def is_batch_success(result: dict) -> bool:
+    """$batch 개별 응답 성공 여부"""
+    return 200 <= result.get("status", 0) < 300
+
+def format_batch_results(action: str, results: list) -> str:
+    """$batch 결과를 항목별 성공/실패로 요약"""
+    succeeded = sum(1 for result in results if is_batch_success(result))
+    lines = [f"일정 {action} 결과: 성공 {succeeded}개, 실패 {len(results) - succeeded}개", ""]
+
+    for index, result in enumerate(results, 1):
+        body = result.get("body") or {}
+        if is_batch_success(result):
+            detail = f"{body.get('subject', '')} (ID: {body.get('id', '')})" if body.get("id") else "완료"
+            lines.append(f"{index}. 성공: {detail}")
+        else:
+            message = body.get("error", {}).get("message", "알 수 없는 오류")
+            lines.append(f"{index}. 실패 ({result.get('status')}): {message}")
+            if result.get("current"):
+                lines.append(f"   현재 버전: {format_event_version(result['current'])}")
+
+    return "\n".join(lines)
 
 # MCP 서버 도구 정의
-@mcp_server.list_tools()
-async def handle_list_tools() -> list[Tool]:
-    """사용 가능한 도구 목록 반환"""
-    logger.info("도구 목록 요청됨")
+def tool_definitions() -> list[Tool]:
+    """사용 가능한 도구 목록"""
     tools = [
         Tool(
             name="authenticate",
@@ -119,7 +264,7 @@ async def handle_list_tools() -> list[Tool]:
         ),
         Tool(
             name="get_events",
-            description="일정을 조회합니다.",
+            description="일정을 조회합니다. 시작/종료 날짜를 모두 지정하면 반복 일정의 각 회차까지 조회합니다.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -130,11 +275,83 @@ async def handle_list_tools() -> list[Tool]:
                     "end_date": {
                         "type": "string",
                         "description": "종료 날짜 (ISO 8601 형식, 예: 2024-01-31T23:59:59Z)"
+                    },
+                    "page_size": {
+                        "type": "integer",
+                        "description": f"페이지당 조회 개수 (선택사항, 기본값: {config.EVENTS_PAGE_SIZE})"
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": f"최대 조회 개수 (선택사항, 기본값: {config.EVENTS_MAX_RESULTS}, 0이면 제한 없음)"
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "조회/출력할 필드 목록 (선택사항, 예: subject, start, end, location, bodyPreview, attendees)"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(FORMATTERS),
+                        "description": "출력 형식 (선택사항, 기본값: text). 일정이 많으면 compact/json/table 권장"
+                    },
+                    "max_output_bytes": {
+                        "type": "integer",
+                        "description": f"출력 크기 한도(바이트, 약 4바이트=1토큰) (선택사항, 기본값: {config.OUTPUT_MAX_BYTES}, 0이면 제한 없음)"
+                    },
+                    "calendars": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "조회할 캘린더 이름 또는 ID 목록, all이면 모든 캘린더 (선택사항, 기본값: 기본 캘린더). 여러 캘린더를 동시에 조회해 시작 시각 순으로 합치며 fields에 calendar를 넣으면 캘린더 이름도 출력"
                     }
                 },
                 "required": []
             }
         ),
+        Tool(
+            name="list_calendars",
+            description="내 캘린더, 공유 캘린더, 그룹 캘린더 목록을 조회합니다 (get_events의 calendars 인자에 사용).",
+            inputSchema={
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        ),
+        Tool(
+            name="search_events",
+            description="제목, 내용, 장소, 참석자에서 검색어로 일정을 찾습니다 (로컬 색인, 관련도 순). 기간을 모를 때 get_events 대신 사용하세요.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "검색어 (예: 3분기 예산 회의)"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "이 시각 이후에 끝나는 일정만 (ISO 8601 형식, 선택사항)"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "이 시각 이전에 시작하는 일정만 (ISO 8601 형식, 선택사항)"
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": f"최대 결과 수 (선택사항, 기본값: {config.SEARCH_MAX_RESULTS})"
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "출력할 필드 목록 (선택사항, 예: subject, start, end, location, bodyPreview, attendees)"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(FORMATTERS),
+                        "description": "출력 형식 (선택사항, 기본값: text)"
+                    }
+                },
+                "required": ["query"]
+            }
+        ),
         Tool(
             name="create_event",
             description="새 일정을 생성합니다.",
@@ -165,6 +382,10 @@ async def handle_list_tools() -> list[Tool]:
                         "type": "array",
                         "items": {"type": "string"},
                         "description": "참석자 이메일 목록 (선택사항)"
+                    },
+                    "check_conflicts": {
+                        "type": "boolean",
+                        "description": "겹치는 일정이 있으면 생성하지 않고 알려줌 (선택사항, 기본값: false)"
                     }
                 },
                 "required": ["subject", "start_time", "end_time"]
@@ -213,11 +434,217 @@ async def handle_list_tools() -> list[Tool]:
                     "location": {
                         "type": "string",
                         "description": "장소 (선택사항)"
+                    },
+                    "check_conflicts": {
+                        "type": "boolean",
+                        "description": "시간 변경 시 겹치는 일정이 있으면 수정하지 않고 알려줌 (선택사항, 기본값: false)"
                     }
                 },
                 "required": ["event_id"]
             }
         ),
+        Tool(
+            name="check_conflicts",
+            description="여러 후보 시간대에 대해 겹치는 기존 일정을 한 번에 확인합니다.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "slots": {
+                        "type": "array",
+                        "description": "확인할 시간대 목록",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "start_time": {"type": "string", "description": "시작 시간 (ISO 8601 형식)"},
+                                "end_time": {"type": "string", "description": "종료 시간 (ISO 8601 형식)"}
+                            },
+                            "required": ["start_time", "end_time"]
+                        }
+                    }
+                },
+                "required": ["slots"]
+            }
+        ),
+        Tool(
+            name="batch_create_events",
+            description="여러 일정을 한 번에 생성합니다.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "events": {
+                        "type": "array",
+                        "description": "생성할 일정 목록",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "subject": {"type": "string", "description": "일정 제목"},
+                                "start_time": {"type": "string", "description": "시작 시간 (ISO 8601 형식)"},
+                                "end_time": {"type": "string", "description": "종료 시간 (ISO 8601 형식)"},
+                                "body": {"type": "string", "description": "일정 내용 (선택사항)"},
+                                "location": {"type": "string", "description": "장소 (선택사항)"},
+                                "attendees": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "참석자 이메일 목록 (선택사항)"
+                                }
+                            },
+                            "required": ["subject", "start_time", "end_time"]
+                        }
+                    }
+                },
+                "required": ["events"]
+            }
+        ),
+        Tool(
+            name="batch_update_events",
+            description="여러 일정을 한 번에 수정합니다.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "updates": {
+                        "type": "array",
+                        "description": "수정할 일정 목록",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "event_id": {"type": "string", "description": "수정할 일정의 ID"},
+                                "subject": {"type": "string", "description": "일정 제목 (선택사항)"},
+                                "start_time": {"type": "string", "description": "시작 시간 (ISO 8601 형식, 선택사항)"},
+                                "end_time": {"type": "string", "description": "종료 시간 (ISO 8601 형식, 선택사항)"},
+                                "body": {"type": "string", "description": "일정 내용 (선택사항)"},
+                                "location": {"type": "string", "description": "장소 (선택사항)"}
+                            },
+                            "required": ["event_id"]
+                        }
+                    }
+                },
+                "required": ["updates"]
+            }
+        ),
+        Tool(
+            name="batch_delete_events",
+            description="여러 일정을 한 번에 삭제합니다.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "event_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "삭제할 일정 ID 목록"
+                    }
+                },
+                "required": ["event_ids"]
+            }
+        ),
+        Tool(
+            name="export_events",
+            description="기간 내 일정을 서버의 파일(NDJSON 또는 iCalendar .ics)로 내보냅니다. 반복 일정은 회차별로 기록됩니다.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "출력 파일 경로 (서버의 내보내기 디렉터리 기준 상대 경로, 예: export.ics)"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "시작 날짜 (ISO 8601 형식)"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "종료 날짜 (ISO 8601 형식)"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(FORMATS),
+                        "description": "파일 형식 (선택사항, 기본값: 확장자로 판단)"
+                    },
+                    "resume": {
+                        "type": "boolean",
+                        "description": "중단된 내보내기를 체크포인트부터 이어서 실행 (선택사항, 기본값: false)"
+                    }
+                },
+                "required": ["path", "start_date", "end_date"]
+            }
+        ),
+        Tool(
+            name="import_events",
+            description="서버의 파일(NDJSON 또는 iCalendar .ics)에 있는 일정을 가져와 생성합니다.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "입력 파일 경로 (서버의 내보내기 디렉터리 기준 상대 경로)"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(FORMATS),
+                        "description": "파일 형식 (선택사항, 기본값: 확장자로 판단)"
+                    },
+                    "resume": {
+                        "type": "boolean",
+                        "description": "중단된 가져오기를 체크포인트부터 이어서 실행 (선택사항, 기본값: false)"
+                    },
+                    "include_attendees": {
+                        "type": "boolean",
+                        "description": "참석자 포함 (참석자에게 초대가 발송됨, 선택사항, 기본값: false)"
+                    }
+                },
+                "required": ["path"]
+            }
+        ),
+        Tool(
+            name="find_meeting_times",
+            description="참석자들의 바쁜 시간을 조회하여 모두 참석 가능한 회의 시간 후보를 찾습니다.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "attendees": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "참석자 이메일 목록"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "검색 시작 (ISO 8601 형식, 예: 2024-01-01T00:00:00Z)"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "검색 종료 (ISO 8601 형식, 예: 2024-01-14T00:00:00Z)"
+                    },
+                    "duration_minutes": {
+                        "type": "integer",
+                        "description": "회의 길이(분) (선택사항, 기본값: 30)"
+                    },
+                    "max_candidates": {
+                        "type": "integer",
+                        "description": "반환할 후보 수 (선택사항, 기본값: 5)"
+                    },
+                    "time_zone": {
+                        "type": "string",
+                        "description": f"근무 시간 기준 시간대 (IANA, 선택사항, 기본값: {config.WORKING_TIME_ZONE})"
+                    },
+                    "work_start": {
+                        "type": "string",
+                        "description": f"근무 시작 시각 (HH:MM, 선택사항, 기본값: {config.WORKING_HOURS_START})"
+                    },
+                    "work_end": {
+                        "type": "string",
+                        "description": f"근무 종료 시각 (HH:MM, 선택사항, 기본값: {config.WORKING_HOURS_END})"
+                    },
+                    "include_weekends": {
+                        "type": "boolean",
+                        "description": "주말 포함 여부 (선택사항, 기본값: false)"
+                    },
+                    "include_self": {
+                        "type": "boolean",
+                        "description": "내 일정도 함께 고려할지 여부 (선택사항, 기본값: true)"
+                    }
+                },
+                "required": ["attendees", "start_date", "end_date"]
+            }
+        ),
         Tool(
             name="get_user_info",
             description="현재 로그인한 사용자 정보를 조회합니다.",
@@ -228,70 +655,209 @@ async def handle_list_tools() -> list[Tool]:
             }
         )
     ]
-    logger.info(f"총 {len(tools)}개의 도구 반환")
+
+    # 모든 도구에서 계정 선택 가능
+    for tool in tools:
+        tool.inputSchema["properties"]["account"] = {
+            "type": "string",
+            "description": "사용할 계정 이메일 (선택사항, 기본값: 기본 계정)"
+        }
+    return tools
+
+# 지표의 tool 레이블은 등록된 도구 이름만 사용 (클라이언트가 보낸 임의의 이름으로 시계열이 늘지 않도록)
+register_tools(tool.name for tool in tool_definitions())
+
+@mcp_server.list_tools()
+async def handle_list_tools() -> list[Tool]:
+    """사용 가능한 도구 목록 반환"""
+    logger.info("도구 목록 요청됨")
+    tools = tool_definitions()
+    logger.info("총 %d개의 도구 반환", len(tools))
     return tools
 
 @mcp_server.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> list[TextContent | ImageContent | EmbeddedResource]:
-    """도구 실행 처리"""
-    logger.info(f"도구 실행 요청: {name}, 인자: {arguments}")
+    """도구 실행 처리 (호출마다 상관 ID를 붙여 Graph 요청 로그와 연결)"""
+    with tool_call_context(name), track_tool(name):
+        # 인자는 로그를 남기는 시점에 정리된 복사본으로 바뀌므로 이후 pop 등의 변경에 영향받지 않음
+        logger.info("도구 실행 요청: %s", name, extra={"fields": {"arguments": arguments or {}}})
+        return await dispatch_tool(name, arguments)
+
+async def dispatch_tool(name: str, arguments: dict) -> list[TextContent | ImageContent | EmbeddedResource]:
+    """도구별 처리"""
     try:
+        requested_account = arguments.pop("account", None)
+
+        # HTTP로 들어온 요청은 접속 키에 묶인 계정만 사용 (키가 없으면 루프백 전용이므로 stdio와 같이 처리)
+        if mcp_http_transport is not None:
+            from .mcp_http import request_account
+            try:
+                request = getattr(mcp_server.request_context, "request", None)
+            except LookupError:
+                request = None
+            http_account, bound = request_account(request)
+            if bound:
+                if requested_account and requested_account != http_account:
+                    return [TextContent(type="text", text=f"이 접속 키로는 {http_account} 계정만 사용할 수 있습니다.")]
+                requested_account = http_account
+            elif mcp_http_transport.keys:
+                return [TextContent(type="text", text="접속 키로 인증되지 않은 요청입니다.")]
+
+        account = await auth_manager.resolve_account(requested_account)
+        login_url = f"http://{config.HOST}:{config.PORT}/auth/login"
+        if requested_account:
+            login_url += "?" + urlencode({"account": requested_account})
+
         if name == "authenticate":
             logger.info("인증 상태 확인 중...")
-            is_authenticated = await auth_manager.is_authenticated()
+            is_authenticated = account is not None and await auth_manager.is_authenticated(account)
             if is_authenticated:
                 logger.info("이미 인증된 상태")
-                user_info = await outlook_client.get_user_info()
+                user_info = await get_outlook_client(account).get_user_info()
                 return [TextContent(
                     type="text",
-                    text=f"이미 인증되어 있습니다. 사용자: {user_info.get('displayName', 'Unknown')}"
+                    text=f"이미 인증되어 있습니다. 사용자: {user_info.get('displayName', 'Unknown')} ({account})"
                 )]
             else:
                 logger.info("인증 필요")
+                ensure_web_server()
                 return [TextContent(
                     type="text",
-                    text=f"인증이 필요합니다. 다음 URL을 방문하세요: http://{config.HOST}:{config.PORT}/auth/login"
+                    text=f"인증이 필요합니다. 다음 URL을 방문하세요: {login_url}"
                 )]
 
         # 인증 확인
-        if not await auth_manager.is_authenticated():
-            logger.warning(f"인증되지 않은 상태에서 {name} 도구 실행 시도")
+        if account is None or not await auth_manager.is_authenticated(account):
+            logger.warning("인증되지 않은 상태에서 %s 도구 실행 시도", name)
+            ensure_web_server()
             return [TextContent(
                 type="text",
-                text=f"인증이 필요합니다. 먼저 authenticate 도구를 사용하거나 http://{config.HOST}:{config.PORT}/auth/login을 방문하세요."
+                text=f"인증이 필요합니다. 먼저 authenticate 도구를 사용하거나 {login_url}을 방문하세요."
             )]
 
+        outlook_client = get_outlook_client(account)
+        calendar_sync = get_calendar_sync(account)
+        push_enabled = subscription_manager.active(account)
+        calendar_sync.push_enabled = push_enabled
+
         if name == "get_events":
-            logger.info("일정 조회 시작")
-            events = await outlook_client.get_events(
-                start_date=arguments.get("start_date"),
-                end_date=arguments.get("end_date")
+            arguments = {**GET_EVENTS_DEFAULTS, **arguments}
+
+            async def load_events() -> list[TextContent]:
+                logger.info("일정 조회 시작")
+                max_results = arguments["max_results"]
+
+                query = {
+                    "start_date": arguments.get("start_date"),
+                    "end_date": arguments.get("end_date"),
+                    "page_size": arguments.get("page_size"),
+                    "max_results": max_results,
+                    "fields": arguments.get("fields")
+                }
+                failed_calendars: list[str] = []
+
+                # 여러 캘린더는 동시에 조회해 병합 (로컬 미러와 반복 일정 전개는 기본 캘린더만 다룸)
+                # 동기화 윈도우 안의 범위 조회는 로컬 미러, 그 밖의 긴 범위는 반복 일정 로컬 전개로 처리
+                if arguments.get("calendars"):
+                    source = get_calendar_fanout(account)
+                    pages = source.iter_event_pages(
+                        **query, calendars=arguments["calendars"], failed=failed_calendars
+                    )
+                else:
+                    use_mirror = calendar_sync.covers(arguments.get("start_date"), arguments.get("end_date"))
+                    CACHE_REQUESTS.labels("mirror", "hit" if use_mirror else "miss").inc()
+                    if use_mirror:
+                        source = calendar_sync
+                    elif use_recurrence_engine(arguments.get("start_date"), arguments.get("end_date")):
+                        source = get_recurrence_engine(account)
+                    else:
+                        source = outlook_client
+                    pages = source.iter_event_pages(**query)
+
+                # 페이지가 도착하는 대로 형식기에 넘겨 원본 일정 데이터를 보관하지 않음
+                formatter = create_formatter(
+                    arguments["format"],
+                    fields=arguments.get("fields"),
+                    max_bytes=arguments["max_output_bytes"]
+                )
+                async for page in pages:
+                    # Graph에서 받은 일정은 검색 색인에도 반영 (로컬 전개한 회차는 ID가 달라 제외)
+                    if source is outlook_client:
+                        get_event_search(account).add(page)
+                    for event in page:
+                        formatter.add(event)
+                count = formatter.count + formatter.truncated
+                logger.info("%d개의 일정 조회됨", count)
+
+                warning = f"\n조회하지 못한 캘린더: {', '.join(failed_calendars)}" if failed_calendars else ""
+                if not count:
+                    return [TextContent(type="text", text="일정이 없습니다." + warning)]
+
+                contents = [TextContent(type="text", text=formatter.finish() + warning)]
+                if max_results > 0 and count >= max_results:
+                    contents.append(TextContent(
+                        type="text",
+                        text=f"최대 조회 개수({max_results}개)에 도달했습니다. 기간을 좁히거나 max_results를 늘리세요."
+                    ))
+
+                return contents
+
+            # 같은 조회가 동시에 여러 번 오거나 짧은 시간 안에 반복되면 한 번만 처리
+            # 변경 알림 구독 중에는 알림이 올 때까지 더 오래 캐시
+            return await response_cache.get_or_load(
+                read_cache_key(account, name, arguments), load_events,
+                request_range(arguments.get("start_date"), arguments.get("end_date")),
+                ttl=config.PUSH_CACHE_TTL if push_enabled else None
             )
-            logger.info(f"{len(events)}개의 일정 조회됨")
 
+        elif name == "list_calendars":
+            calendars = await get_calendar_fanout(account).calendars()
+            lines = [f"캘린더 {len(calendars)}개:"]
+            for calendar in calendars:
+                flags = [
+                    flag for flag, enabled in (("기본", calendar["isDefaultCalendar"]), ("편집 가능", calendar["canEdit"]))
+                    if enabled
+                ]
+                owner = f", 소유자: {calendar['owner']}" if calendar["owner"] else ""
+                suffix = f" [{', '.join(flags)}]" if flags else ""
+                lines.append(f"- {calendar['name']}{suffix} (ID: {calendar['id']}{owner})")
+            return [TextContent(type="text", text="\n".join(lines))]
+
+        elif name == "search_events":
+            if not config.SEARCH_ENABLED:
+                return [TextContent(type="text", text="일정 검색이 비활성화되어 있습니다 (SEARCH_ENABLED=false).")]
+
+            event_search = get_event_search(account)
+            # 색인이 한 번도 없을 때만 첫 색인을 기다림 (그 밖에는 지금 색인으로 답하고 백그라운드에서 갱신)
+            first_index = not event_search.indexed
+            events = await event_search.search(
+                arguments["query"],
+                start_date=arguments.get("start_date"),
+                end_date=arguments.get("end_date"),
+                limit=arguments.get("max_results", config.SEARCH_MAX_RESULTS)
+            )
+            logger.info("일정 검색 결과 %d개", len(events))
+            notice = "\n(검색 색인을 처음 만드느라 응답이 늦었습니다. 다음 검색부터는 바로 답합니다.)" if first_index else ""
             if not events:
-                return [TextContent(type="text", text="일정이 없습니다.")]
+                return [TextContent(type="text", text=f"'{arguments['query']}'와 일치하는 일정이 없습니다." + notice)]
 
-            result = "일정 목록:\n\n"
+            formatter = create_formatter(
+                arguments.get("format", "text"), fields=arguments.get("fields"), max_bytes=config.OUTPUT_MAX_BYTES
+            )
             for event in events:
-                start = event.get("start", {}).get("dateTime", "시간 정보 없음")
-                end = event.get("end", {}).get("dateTime", "시간 정보 없음")
-                subject = event.get("subject", "제목 없음")
-                location = event.get("location", {}).get("displayName", "")
-                event_id = event.get("id", "")
-
-                result += f"제목: {subject}\n"
-                result += f"시작: {start}\n"
-                result += f"종료: {end}\n"
-                if location:
-                    result += f"장소: {location}\n"
-                result += f"ID: {event_id}\n"
-                result += "-" * 50 + "\n"
-
-            return [TextContent(type="text", text=result)]
+                formatter.add(event)
+            return [TextContent(type="text", text=formatter.finish() + notice)]
 
         elif name == "create_event":
-            logger.info(f"일정 생성 시작: {arguments['subject']}")
+            logger.info("일정 생성 시작", extra={"fields": {"subject": arguments["subject"]}})
+            if arguments.get("check_conflicts"):
+                conflicts, = await calendar_sync.find_conflicts([(arguments["start_time"], arguments["end_time"])])
+                if conflicts:
+                    return [TextContent(
+                        type="text",
+                        text="겹치는 일정이 있어 생성하지 않았습니다.\n" + format_conflicts(conflicts)
+                    )]
+
             event = await outlook_client.create_event(
                 subject=arguments["subject"],
                 start_time=arguments["start_time"],
@@ -300,7 +866,8 @@ async def handle_call_tool(name: str, arguments: dict) -> list[TextContent | Ima
                 location=arguments.get("location"),
                 attendees=arguments.get("attendees")
             )
-            logger.info(f"일정 생성 완료: {event.get('id')}")
+            apply_write(account, event=event, created=True)
+            logger.info("일정 생성 완료", extra={"fields": {"event_id": event.get("id")}})
 
             return [TextContent(
                 type="text",
@@ -308,21 +875,166 @@ async def handle_call_tool(name: str, arguments: dict) -> list[TextContent | Ima
             )]
 
         elif name == "delete_event":
-            logger.info(f"일정 삭제 시작: {arguments['event_id']}")
+            logger.info("일정 삭제 시작", extra={"fields": {"event_id": arguments["event_id"]}})
             await outlook_client.delete_event(arguments["event_id"])
+            apply_write(account, deleted_id=arguments["event_id"])
             logger.info("일정 삭제 완료")
             return [TextContent(type="text", text="일정이 삭제되었습니다.")]
 
         elif name == "update_event":
             event_id = arguments.pop("event_id")
-            logger.info(f"일정 수정 시작: {event_id}")
-            event = await outlook_client.update_event(event_id, **arguments)
+            logger.info("일정 수정 시작", extra={"fields": {"event_id": event_id}})
+            if arguments.pop("check_conflicts", False) and ("start_time" in arguments or "end_time" in arguments):
+                start_time, end_time = arguments.get("start_time"), arguments.get("end_time")
+                if not start_time or not end_time:
+                    current = await outlook_client.get_event(event_id, ["start", "end"])
+                    start_time = start_time or current["start"]["dateTime"]
+                    end_time = end_time or current["end"]["dateTime"]
+                conflicts, = await calendar_sync.find_conflicts([(start_time, end_time)], exclude_id=event_id)
+                if conflicts:
+                    return [TextContent(
+                        type="text",
+                        text="겹치는 일정이 있어 수정하지 않았습니다.\n" + format_conflicts(conflicts)
+                    )]
+
+            try:
+                event = await outlook_client.update_event(event_id, **arguments)
+            except EventConflictError as error:
+                return [TextContent(
+                    type="text",
+                    text=f"{error}\n현재 버전: {format_event_version(error.event)}\n"
+                         "현재 버전을 확인한 뒤 같은 요청을 다시 보내면 이 버전을 기준으로 수정합니다."
+                )]
+            apply_write(account, event=event)
             logger.info("일정 수정 완료")
             return [TextContent(
                 type="text",
                 text=f"일정이 수정되었습니다.\n제목: {event.get('subject')}\nID: {event.get('id')}"
             )]
 
+        elif name == "check_conflicts":
+            slots = [(slot["start_time"], slot["end_time"]) for slot in arguments["slots"]]
+            logger.info("일정 충돌 확인 시작: %d개 시간대", len(slots))
+            results = await calendar_sync.find_conflicts(slots)
+
+            lines = []
+            for index, ((start_time, end_time), conflicts) in enumerate(zip(slots, results), 1):
+                if conflicts:
+                    lines.append(f"{index}. {start_time} ~ {end_time}: 충돌 {len(conflicts)}개")
+                    lines.append(format_conflicts(conflicts, indent="   "))
+                else:
+                    lines.append(f"{index}. {start_time} ~ {end_time}: 가능")
+            return [TextContent(type="text", text="\n".join(lines))]
+
+        elif name == "batch_create_events":
+            logger.info("일정 일괄 생성 시작: %d개", len(arguments["events"]))
+            results = await outlook_client.batch_create_events(arguments["events"])
+            for result in results:
+                if is_batch_success(result):
+                    apply_write(account, event=result.get("body"), created=True)
+            return [TextContent(type="text", text=format_batch_results("생성", results))]
+
+        elif name == "batch_update_events":
+            logger.info("일정 일괄 수정 시작: %d개", len(arguments["updates"]))
+            results = await outlook_client.batch_update_events(arguments["updates"])
+            for result in results:
+                if is_batch_success(result):
+                    apply_write(account, event=result.get("body"))
+            return [TextContent(type="text", text=format_batch_results("수정", results))]
+
+        elif name == "batch_delete_events":
+            event_ids = arguments["event_ids"]
+            logger.info("일정 일괄 삭제 시작: %d개", len(event_ids))
+            results = await outlook_client.batch_delete_events(event_ids)
+            for event_id, result in zip(event_ids, results):
+                if is_batch_success(result):
+                    apply_write(account, deleted_id=event_id)
+            return [TextContent(type="text", text=format_batch_results("삭제", results))]
+
+        elif name == "export_events":
+            path = resolve_tool_path(arguments["path"])
+            logger.info("일정 내보내기 시작", extra={"fields": {"path": path}})
+            result = await export_events(
+                outlook_client, path, arguments["start_date"], arguments["end_date"],
+                fmt=arguments.get("format"), resume=arguments.get("resume", False)
+            )
+            return [TextContent(
+                type="text",
+                text=f"일정 {result['exported']}개를 내보냈습니다.\n파일: {result['path']} ({result['format']})"
+            )]
+
+        elif name == "import_events":
+            path = resolve_tool_path(arguments["path"])
+            logger.info("일정 가져오기 시작", extra={"fields": {"path": path}})
+
+            def on_created(events: list[dict]):
+                for event in events:
+                    apply_write(account, event=event, created=True)
+
+            result = await import_events(
+                outlook_client, path, fmt=arguments.get("format"),
+                resume=arguments.get("resume", False),
+                include_attendees=arguments.get("include_attendees", False), on_created=on_created
+            )
+            lines = [f"일정을 가져왔습니다: 생성 {result['created']}개, 실패 {result['failed']}개, 제외 {result['skipped']}개"]
+            lines.extend(f"- {error}" for error in result["errors"])
+            return [TextContent(type="text", text="\n".join(lines))]
+
+        elif name == "find_meeting_times":
+            async def load_meeting_times() -> list[TextContent]:
+                attendees = list(dict.fromkeys(arguments["attendees"]))
+                if arguments.get("include_self", True):
+                    if "@" in account:
+                        me = account
+                    else:
+                        user_info = await outlook_client.get_user_info()
+                        me = user_info.get("mail") or user_info.get("userPrincipalName")
+                    if me and me not in attendees:
+                        attendees.append(me)
+
+                logger.info("회의 시간 검색 시작: 참석자 %d명", len(attendees))
+                tz = ZoneInfo(arguments.get("time_zone", config.WORKING_TIME_ZONE))
+                duration = timedelta(minutes=arguments.get("duration_minutes", 30))
+
+                schedules = await outlook_client.get_schedule(attendees, arguments["start_date"], arguments["end_date"])
+                busy = [interval for schedule in schedules.values() for interval in schedule["busy"]]
+                slots = find_free_slots(
+                    busy,
+                    parse_graph_datetime(arguments["start_date"]),
+                    parse_graph_datetime(arguments["end_date"]),
+                    duration,
+                    time.fromisoformat(arguments.get("work_start", config.WORKING_HOURS_START)),
+                    time.fromisoformat(arguments.get("work_end", config.WORKING_HOURS_END)),
+                    tz,
+                    include_weekends=arguments.get("include_weekends", False),
+                    limit=arguments.get("max_candidates", 5)
+                )
+                logger.info("회의 시간 후보 %d개 찾음", len(slots))
+
+                lines = []
+                if slots:
+                    lines.append(f"회의 가능 시간 ({tz.key} 기준, {len(slots)}개):")
+                    for index, (slot_start, slot_end) in enumerate(slots, 1):
+                        local_start, local_end = slot_start.astimezone(tz), slot_end.astimezone(tz)
+                        lines.append(
+                            f"{index}. {local_start:%Y-%m-%d %H:%M} ~ {local_end:%H:%M} "
+                            f"(UTC {format_utc(slot_start)}Z ~ {format_utc(slot_end)}Z)"
+                        )
+                else:
+                    lines.append("조건에 맞는 회의 가능 시간이 없습니다.")
+
+                failed = [f"{email} ({schedule['error']})" for email, schedule in schedules.items() if schedule["error"]]
+                if failed:
+                    lines.append("")
+                    lines.append(f"일정을 확인하지 못한 참석자: {', '.join(failed)}")
+
+                return [TextContent(type="text", text="\n".join(lines))]
+
+            return await response_cache.get_or_load(
+                read_cache_key(account, name, arguments), load_meeting_times,
+                request_range(arguments["start_date"], arguments["end_date"])
+            )
+
         elif name == "get_user_info":
             logger.info("사용자 정보 조회 시작")
             user_info = await outlook_client.get_user_info()
@@ -335,11 +1047,12 @@ async def handle_call_tool(name: str, arguments: dict) -> list[TextContent | Ima
             return [TextContent(type="text", text=result)]
 
         else:
-            logger.warning(f"알 수 없는 도구: {name}")
+            logger.warning("알 수 없는 도구: %s", name)
             return [TextContent(type="text", text=f"알 수 없는 도구: {name}")]
 
     except Exception as e:
-        logger.error(f"도구 실행 중 오류: {str(e)}")
+        TOOL_ERRORS.labels(tool_label(name)).inc()
+        logger.error("도구 실행 중 오류: %s", e)
         return [TextContent(type="text", text=f"오류 발생: {str(e)}")]
 
 async def run_mcp_server():
@@ -351,29 +1064,176 @@ async def run_mcp_server():
         logger.info("MCP 서버가 stdio에서 실행 중입니다")
         await mcp_server.run(read_stream, write_stream, mcp_server.create_initialization_options())
 
+# 같은 이벤트 루프에서 태스크로 도는 OAuth 웹 서버
+_web_server = None
+_web_task = None
+
+def ensure_web_server():
+    """OAuth 로그인용 웹 서버가 없으면 현재 이벤트 루프에서 시작"""
+    global _web_server, _web_task
+    if _web_task is not None or config.WEB_SERVER == "never":
+        return
+
+    from .web_app import create_web_server
+
+    logger.info("웹 서버 시작: http://%s:%s", config.HOST, config.PORT)
+    _web_server = create_web_server(get_app())
+    _web_task = asyncio.create_task(_serve_web(_web_server))
+
+async def _serve_web(server):
+    """웹 서버 실행 (포트 바인딩 실패가 MCP 서버를 종료시키지 않도록 처리)"""
+    global _web_server, _web_task
+    try:
+        await server.serve()
+    except SystemExit:
+        # uvicorn은 시작 실패 시 sys.exit()를 호출함
+        logger.error("웹 서버 시작 실패: %s:%s", config.HOST, config.PORT)
+    finally:
+        if _web_server is server:
+            _web_server = None
+            _web_task = None
+
+async def stop_web_server():
+    """웹 서버 종료 (처리 중인 요청은 SHUTDOWN_TIMEOUT까지 기다림)"""
+    server, task = _web_server, _web_task
+    if task is None:
+        return
+
+    server.should_exit = True
+    try:
+        await asyncio.wait_for(task, timeout=config.SHUTDOWN_TIMEOUT + 1)
+    except asyncio.TimeoutError:
+        logger.warning("웹 서버 종료 대기 시간 초과")
+
+async def start_push_notifications():
+    """WEBHOOK_URL이 있으면 웹 서버를 띄우고 저장된 계정의 변경 알림 구독 시작"""
+    if not subscription_manager.enabled:
+        return
+    ensure_web_server()
+
+    # Graph는 구독 생성 요청 중에 검증 요청을 보내므로 웹 서버가 요청을 받을 수 있을 때까지 대기
+    while _web_server is not None and not _web_server.started:
+        await asyncio.sleep(0.05)
+    if _web_server is None:
+        logger.error("웹 서버가 없어 변경 알림 구독을 시작하지 않습니다")
+        return
+    subscription_manager.start(auth_manager.list_accounts())
+
+def start_search_indexing():
+    """저장된 계정의 검색 색인을 백그라운드에서 준비 (없거나 SEARCH_REINDEX_HOURS가 지난 색인만 다시 만듦)"""
+    if not config.SEARCH_ENABLED:
+        return
+    for account in auth_manager.list_accounts():
+        get_event_search(account).start_reindex()
+
+async def shutdown():
+    """구독, 웹 서버, 백그라운드 작업, 진행 중인 Graph 요청을 정리하고 커넥션 풀 종료"""
+    logger.info("서버 종료 중...")
+    await subscription_manager.stop()
+    await asyncio.gather(*(event_search.stop() for event_search in event_searches.values()))
+    await stop_web_server()
+    await auth_manager.stop_background_refresh()
+    # 변경 알림으로 시작한 델타 동기화는 Graph 요청을 정리하기 전에 멈춤
+    sync_tasks = list(_sync_tasks.values())
+    for task in sync_tasks:
+        task.cancel()
+    await asyncio.gather(*sync_tasks, return_exceptions=True)
+    await graph_scheduler.drain(config.SHUTDOWN_TIMEOUT)
+    await close_http_client()
+
 async def run_integrated_server():
-    """MCP 서버와 웹 서버를 동시에 실행"""
+    """MCP 서버와 웹 서버를 하나의 이벤트 루프에서 함께 실행"""
     logger.info("통합 서버 시작 중...")
 
-    # 웹 서버를 백그라운드에서 실행
-    import threading
-    import uvicorn
+    # 이미 로그인되어 있으면 웹 서버 없이 stdio만으로 시작 (로그인이 필요해지면 그때 시작)
+    if config.WEB_SERVER == "always" or not await auth_manager.is_authenticated():
+        ensure_web_server()
+    else:
+        logger.info("유효한 토큰이 있어 웹 서버 없이 시작합니다")
+
+    # 커넥션 예열은 MCP 서버 시작을 막지 않도록 백그라운드에서 실행
+    share_response_cache()
+    warmup_task = asyncio.create_task(warm_up_http_client())
+    push_task = asyncio.create_task(start_push_notifications())
+    auth_manager.start_background_refresh()
+    start_search_indexing()
+
+    # MCP 서버 실행 (stdin 종료 또는 Ctrl+C 시 정리)
+    try:
+        await run_mcp_server()
+    finally:
+        warmup_task.cancel()
+        push_task.cancel()
+        await shutdown()
+
+async def run_web_only():
+    """웹 서버만 실행"""
+    global _web_server, _web_task
+    from .web_app import create_web_server
+
+    _web_server = create_web_server(get_app())
+    _web_task = asyncio.create_task(_serve_web(_web_server))
+    push_task = asyncio.create_task(start_push_notifications())
+    try:
+        # Ctrl+C로 이 태스크가 취소되어도 웹 서버는 shutdown()에서 정상 종료되도록 보호
+        await asyncio.shield(_web_task)
+    finally:
+        push_task.cancel()
+        await shutdown()
+
+async def run_http_server():
+    """MCP HTTP 전송(streamable HTTP/SSE)을 웹 서버에 붙여 실행 (한 프로세스가 여러 클라이언트 세션을 처리)"""
+    global mcp_http_transport
+    from .mcp_http import McpHttpTransport
+
+    mcp_http_transport = McpHttpTransport(mcp_server)
+    share_response_cache()
+    warmup_task = asyncio.create_task(warm_up_http_client())
+    auth_manager.start_background_refresh()
+    start_search_indexing()
+    try:
+        await run_web_only()
+    finally:
+        warmup_task.cancel()
+
+@asynccontextmanager
+async def http_worker_lifespan():
+    """워커 프로세스 하나의 수명 (uvicorn이 워커마다 앱을 만들고 lifespan으로 시작/종료)"""
+    share_response_cache()
+    warmup_task = asyncio.create_task(warm_up_http_client())
+    auth_manager.start_background_refresh()
+    start_search_indexing()
+    # 소켓은 부모 프로세스가 이미 열어 두었으므로 구독 검증 요청은 시작이 끝나면 처리됨
+    subscription_manager.start(auth_manager.list_accounts())
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+        await shutdown()
 
-    def start_web_server():
-        logger.info(f"웹 서버 시작: http://{config.HOST}:{config.PORT}")
-        uvicorn.run(app, host=config.HOST, port=config.PORT, log_level="warning")
+def create_http_app():
+    """`outlook-mcp http --workers N`에서 uvicorn이 워커마다 호출하는 앱 팩토리
 
-    # 웹 서버를 별도 스레드에서 시작
-    web_thread = threading.Thread(target=start_web_server, daemon=True)
-    web_thread.start()
+    토큰, OAuth state, 구독, (SHARED_CACHE면) 응답 캐시는 상태 저장소로 워커끼리 공유합니다.
+    """
+    global mcp_http_transport, _app
+    from .mcp_http import McpHttpTransport
+    from .web_app import create_app
 
-    # MCP 서버 실행
-    await run_mcp_server()
+    mcp_http_transport = McpHttpTransport(mcp_server)
+    _app = create_app(
+        auth_manager, subscription_manager if subscription_manager.enabled else None, mcp_http_transport,
+        lifespan=http_worker_lifespan
+    )
+    return _app
 
 def run_web_server():
     """웹 서버 실행 (OAuth callback용)"""
-    logger.info(f"웹 서버 시작: http://{config.HOST}:{config.PORT}")
-    uvicorn.run(app, host=config.HOST, port=config.PORT)
+    logger.info("웹 서버 시작: http://%s:%s", config.HOST, config.PORT)
+    try:
+        asyncio.run(run_web_only())
+    except KeyboardInterrupt:
+        pass
 
 def main():
     """메인 엔트리포인트"""
@@ -383,10 +1243,34 @@ def main():
         # 웹 서버 전용 모드
         print(f"웹 서버 시작 중... http://{config.HOST}:{config.PORT}")
         run_web_server()
+    elif len(sys.argv) > 1 and sys.argv[1] == "http":
+        # MCP HTTP 전송 모드 (웹 서버에서 /mcp, /sse로 MCP 제공, --workers N이면 N개 프로세스)
+        workers = config.MCP_HTTP_WORKERS
+        if "--workers" in sys.argv[2:]:
+            workers = int(sys.argv[sys.argv.index("--workers") + 1])
+        from .mcp_http import check_http_exposure
+
+        check_http_exposure()
+        logger.info("MCP HTTP 서버 시작: http://%s:%s/mcp (워커 %d개)", config.HOST, config.PORT, workers)
+        if workers > 1:
+            from .web_app import run_workers
+
+            # 워커 프로세스도 같은 설정으로 시작하도록 환경 변수로 전달
+            os.environ["MCP_HTTP_WORKERS"] = str(workers)
+            config.MCP_HTTP_WORKERS = workers
+            run_workers("src.mcp_server:create_http_app", workers)
+            return
+        try:
+            asyncio.run(run_http_server())
+        except KeyboardInterrupt:
+            pass
     else:
         # 통합 모드 (MCP + 웹 서버)
         logger.info("통합 서버 모드로 시작 (MCP + OAuth 웹서버)")
-        asyncio.run(run_integrated_server())
+        try:
+            asyncio.run(run_integrated_server())
+        except KeyboardInterrupt:
+            pass
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
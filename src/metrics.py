@@ -0,0 +1,231 @@
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+# 요청 지연 시간 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Metric(ABC):
+    """Prometheus 지표 기본 클래스 (레이블 값 조합별 자식 객체를 dict로 관리)"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    @abstractmethod
+    def _new_child(self):
+        """레이블 값 조합 하나의 값 객체 생성"""
+
+    def labels(self, *values: str):
+        """레이블 값 조합의 자식 지표 반환 (처음 본 조합이면 생성)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} 레이블 개수 불일치: {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def samples(self) -> Iterator[Sample]:
+        """(이름 접미사, 레이블, 값) 목록"""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines)
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+class Counter(Metric):
+    """단조 증가 카운터"""
+
+    type = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        """레이블 없는 카운터 증가"""
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in self._children.items():
+            yield "_total", dict(zip(self.labelnames, values)), child.value
+
+class Gauge(Metric):
+    """현재 값 (set_function을 지정하면 수집 시점에 값을 계산)"""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def set_function(self, function: Callable[[], Dict[Tuple[str, ...], float]]):
+        """수집 시 호출할 함수 지정 (레이블 값 조합 -> 값)"""
+        self._function = function
+
+    def samples(self) -> Iterator[Sample]:
+        values = self._function() if self._function else {key: child.value for key, child in self._children.items()}
+        for key, value in values.items():
+            yield "", dict(zip(self.labelnames, key)), value
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        # 마지막 칸은 +Inf
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+class Histogram(Metric):
+    """지연 시간 분포 (버킷별 개수는 수집 시점에 누적)"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in self._children.items():
+            labels = dict(zip(self.labelnames, values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                yield "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield "_count", labels, cumulative
+            yield "_sum", labels, child.sum
+
+class Registry:
+    """지표 목록과 텍스트 노출 형식 출력"""
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식 (0.0.4)"""
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+registry = Registry()
+
+TOOL_CALLS = registry.register(Counter("mcp_tool_calls", "MCP 도구 호출 수", ["tool"]))
+TOOL_ERRORS = registry.register(Counter("mcp_tool_errors", "예외로 끝난 MCP 도구 호출 수", ["tool"]))
+TOOL_DURATION = registry.register(Histogram("mcp_tool_duration_seconds", "MCP 도구 처리 시간", ["tool"]))
+TOOLS_IN_FLIGHT = registry.register(Gauge("mcp_tools_in_flight", "처리 중인 MCP 도구 호출 수"))
+
+GRAPH_REQUESTS = registry.register(Counter(
+    "graph_requests", "Graph 요청 수 (재시도 포함 최종 상태 기준)", ["method", "endpoint", "status"]
+))
+GRAPH_DURATION = registry.register(Histogram(
+    "graph_request_duration_seconds", "Graph 요청 시간 (스케줄러 대기와 재시도 포함)", ["method", "endpoint"]
+))
+GRAPH_IN_FLIGHT = registry.register(Gauge("graph_requests_in_flight", "전송 중인 Graph 요청 수", ["mailbox"]))
+GRAPH_QUEUED = registry.register(Gauge("graph_requests_queued", "스케줄러에서 대기 중인 Graph 요청 수", ["mailbox"]))
+GRAPH_THROTTLED = registry.register(Counter("graph_throttled_responses", "스로틀링/일시 장애 응답 수 (재시도 전 응답 포함)", ["status"]))
+
+TOKEN_REFRESHES = registry.register(Counter("token_refreshes", "토큰 갱신 수", ["result"]))
+TOKEN_REFRESH_DURATION = registry.register(Histogram("token_refresh_duration_seconds", "토큰 갱신 시간"))
+
+CACHE_REQUESTS = registry.register(Counter("cache_requests", "캐시 조회 수", ["cache", "result"]))
+
+WEBHOOK_NOTIFICATIONS = registry.register(Counter(
+    "webhook_notifications", "Graph 변경 알림 수 (changeType, lifecycle, rejected)", ["type"]
+))
+
+MCP_HTTP_REJECTED = registry.register(Counter(
+    "mcp_http_rejected", "거절한 MCP HTTP 요청 수 (unauthorized, overloaded)", ["reason"]
+))
+
+# 경로에서 이 컬렉션 다음 세그먼트는 ID로 보고 {id}로 바꿈 (레이블 종류 수 제한)
+_ID_COLLECTIONS = {"events", "calendars", "calendarGroups", "groups", "users", "subscriptions", "instances", "attachments"}
+
+def endpoint_template(endpoint: str) -> str:
+    """Graph 엔드포인트를 레이블용 템플릿으로 변환 (예: /me/events/AAMk.. -> /me/events/{id})"""
+    path = urlsplit(endpoint).path if "://" in endpoint else endpoint.split("?", 1)[0]
+    segments = path.split("/")
+    if len(segments) > 1 and segments[1] in ("v1.0", "beta"):
+        del segments[1]
+    for index in range(1, len(segments)):
+        if segments[index - 1] in _ID_COLLECTIONS and segments[index] not in ("delta", ""):
+            segments[index] = "{id}"
+    return "/".join(segments)
+
+# 지표 레이블로 쓸 수 있는 도구 이름 (register_tools로 등록, 그 밖의 이름은 UNKNOWN_TOOL로 집계)
+UNKNOWN_TOOL = "unknown"
+_known_tools: frozenset = frozenset()
+
+def register_tools(names: Iterable[str]):
+    """서버가 제공하는 도구 이름 등록"""
+    global _known_tools
+    _known_tools = frozenset(names)
+
+def tool_label(name: str) -> str:
+    """도구 지표의 tool 레이블 (등록되지 않은 이름은 하나로 묶어 시계열 수를 제한)"""
+    return name if name in _known_tools else UNKNOWN_TOOL
+
+@contextmanager
+def track_tool(name: str):
+    """도구 호출 수, 처리 시간, 동시 처리 수 기록"""
+    name = tool_label(name)
+    TOOL_CALLS.labels(name).inc()
+    in_flight = TOOLS_IN_FLIGHT.labels()
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        TOOL_DURATION.labels(name).observe(time.perf_counter() - started)
+        in_flight.dec()
@@ -1,67 +1,338 @@
+import asyncio
+import logging
+import time
 import httpx
-from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from .config import config
 from .auth_manager import AuthManager
+from .http_client import get_http_client
+from .time_utils import format_utc, parse_graph_datetime
+from .graph_scheduler import graph_scheduler, parse_retry_after, backoff_delay, IDEMPOTENT_METHODS, RETRYABLE_STATUS
+from .metrics import CACHE_REQUESTS, GRAPH_DURATION, GRAPH_REQUESTS, endpoint_template
+from .logging_setup import current_correlation_id
+
+logger = logging.getLogger("outlook-mcp")
+
+# 도구 출력에 필요한 기본 필드 ($select)
+DEFAULT_EVENT_FIELDS = ["id", "subject", "start", "end", "location"]
+
+# 시리즈 마스터 조회 필드: 로컬 전개에 필요한 값(cancelledOccurrences는 $select해야만 옴)과
+# 전개한 회차에 복사되어 출력될 수 있는 일정 필드 (exceptionOccurrences는 $expand로 받음)
+SERIES_MASTER_FIELDS = [
+    "id", "iCalUId", "subject", "body", "bodyPreview", "start", "end", "isAllDay", "location", "attendees",
+    "organizer", "showAs", "isCancelled", "categories", "importance", "sensitivity", "type",
+    "recurrence", "originalStartTimeZone", "originalEndTimeZone", "cancelledOccurrences"
+]
+
+# JSON $batch 한 번에 담을 수 있는 최대 요청 수
+GRAPH_BATCH_LIMIT = 20
+
+# getSchedule 한 번에 조회 가능한 최대 기간
+GET_SCHEDULE_MAX_DAYS = 62
+
+# 회의 시간 계산 시 바쁜 것으로 간주하는 상태
+BUSY_STATUSES = {"busy", "tentative", "oof"}
+
+# 본문은 HTML 대신 텍스트로 받음
+PREFER_TEXT_BODY = 'outlook.body-content-type="text"'
+
+# 일정 응답은 텍스트 본문, UTC 시간으로 받음 (쓰기 응답도 그대로 미러에 반영되므로 동일하게)
+PREFER_EVENT = f'{PREFER_TEXT_BODY}, outlook.timezone="UTC"'
+
+class EventConflictError(Exception):
+    """If-Match 충돌 (event: 다시 조회한 최신 일정)"""
+
+    def __init__(self, event_id: str, event: Dict[str, Any]):
+        super().__init__(f"일정이 다른 곳에서 먼저 수정되었습니다. 최신 내용을 확인한 뒤 다시 수정하세요. (ID: {event_id})")
+        self.event = event
 
 class OutlookClient:
-    def __init__(self):
-        self.auth_manager = AuthManager()
+    def __init__(self, auth_manager: Optional[AuthManager] = None, account: Optional[str] = None):
+        self.auth_manager = auth_manager or AuthManager()
         self.graph_endpoint = config.GRAPH_API_ENDPOINT
+        # 계정을 지정하지 않으면 AuthManager의 기본 계정 사용
+        self.account = account
+        # 스로틀링 제한은 메일박스 단위로 적용됨
+        self.mailbox = account or "default"
+        # 프로필은 세션 동안 바뀌지 않으므로 한 번만 조회
+        self._profile: Optional[asyncio.Task] = None
+        # 일정별 최신 @odata.etag (수정 시 If-Match)와 단건 조회 결과 (재조회 시 If-None-Match)
+        self._etags: "OrderedDict[str, str]" = OrderedDict()
+        self._event_bodies: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
 
-    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
-        """Graph API 요청 실행"""
-        token = await self.auth_manager.get_valid_token()
-        if not token:
-            raise Exception("인증되지 않음. 먼저 로그인하세요.")
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                            params: Optional[Dict[str, Any]] = None,
+                            extra_headers: Optional[Dict[str, str]] = None,
+                            idempotent: Optional[bool] = None) -> Dict[str, Any]:
+        """Graph API 요청 실행 (스케줄러를 거쳐 속도 제한과 스로틀링 재시도 적용)"""
+        response = await self._send(method, endpoint, data, params, extra_headers, idempotent)
+        response.raise_for_status()
 
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
+        # DELETE 요청의 경우 빈 응답이 올 수 있음
+        if response.status_code == 204:
+            return {"success": True}
+
+        return response.json()
+
+    async def _send(self, method: str, endpoint: str, data: Optional[Dict] = None,
+                    params: Optional[Dict[str, Any]] = None,
+                    extra_headers: Optional[Dict[str, str]] = None,
+                    idempotent: Optional[bool] = None) -> httpx.Response:
+        """요청을 보내고 상태 코드 확인 없이 응답 반환 (304/412 등을 직접 처리할 때 사용)"""
+        # @odata.nextLink 등 절대 URL은 그대로 사용
+        if endpoint.startswith(("https://", "http://")):
+            url = endpoint
+        else:
+            url = f"{self.graph_endpoint}{endpoint}"
+
+        method = method.upper()
+        if method not in ("GET", "POST", "DELETE", "PATCH"):
+            raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
+
+        # 도구 호출의 상관 ID를 Graph에도 전달 (Graph 쪽 로그/지원 요청에서 같은 ID로 추적)
+        correlation_id = current_correlation_id()
+
+        async def send() -> httpx.Response:
+            # 재시도 대기 중 토큰이 만료될 수 있으므로 매 시도마다 확인
+            token = await self.auth_manager.get_valid_token(self.account)
+            if not token:
+                raise Exception("인증되지 않음. 먼저 로그인하세요.")
+
+            headers = {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json"
+            }
+            if correlation_id:
+                headers["client-request-id"] = correlation_id
+            if extra_headers:
+                headers.update(extra_headers)
+
+            return await get_http_client().request(
+                method, url, headers=headers, params=params,
+                json=data if method in ("POST", "PATCH") else None
+            )
+
+        template = endpoint_template(endpoint)
+        started = time.perf_counter()
+        status = "error"
+        request_id = None
+        try:
+            response = await graph_scheduler.execute(self.mailbox, method, send, idempotent)
+            status = str(response.status_code)
+            request_id = response.headers.get("request-id")
+        finally:
+            elapsed = time.perf_counter() - started
+            GRAPH_DURATION.labels(method, template).observe(elapsed)
+            GRAPH_REQUESTS.labels(method, template, status).inc()
+            logger.debug("Graph %s %s -> %s", method, template, status,
+                         extra={"fields": {"duration_ms": round(elapsed * 1000, 1), "request_id": request_id}})
+        return response
+
+    def remember_etags(self, events: List[Dict[str, Any]], replace: bool = True):
+        """응답에 포함된 일정의 @odata.etag 기록 (ETAG_CACHE_SIZE개까지 LRU, replace=False면 모르는 일정만)"""
+        for event in events:
+            etag = event.get("@odata.etag")
+            if etag and event.get("id") and (replace or event["id"] not in self._etags):
+                self._etags[event["id"]] = etag
+                self._etags.move_to_end(event["id"])
+        while len(self._etags) > config.ETAG_CACHE_SIZE:
+            self._etags.popitem(last=False)
+
+    def _forget_event(self, event_id: str):
+        """삭제된 일정의 ETag와 조회 결과 제거"""
+        self._etags.pop(event_id, None)
+        self._forget_bodies(event_id)
+
+    def _forget_bodies(self, event_id: str):
+        """일정의 조회 결과만 제거 (ETag는 유지)"""
+        for key in [key for key in self._event_bodies if key[0] == event_id]:
+            del self._event_bodies[key]
+
+    def get_etag(self, event_id: str) -> Optional[str]:
+        """마지막으로 본 일정의 ETag"""
+        return self._etags.get(event_id)
+
+    async def iter_event_pages(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                               page_size: Optional[int] = None, max_results: Optional[int] = None,
+                               fields: Optional[List[str]] = None,
+                               calendar: str = "/me") -> AsyncIterator[List[Dict[str, Any]]]:
+        """일정을 페이지 단위로 스트리밍 조회 (@odata.nextLink 추적)
+
+        시작/종료 날짜가 모두 주어지면 반복 일정이 전개되는 calendarView를 사용합니다.
+        calendar는 캘린더 경로입니다 (기본값: /me(기본 캘린더), 예: /me/calendars/{id}, /groups/{id}/calendar).
+        """
+        page_size = page_size or config.EVENTS_PAGE_SIZE
+        if max_results is None:
+            max_results = config.EVENTS_MAX_RESULTS
+
+        select = list(fields) if fields else list(DEFAULT_EVENT_FIELDS)
+        if "id" not in select:
+            select.insert(0, "id")
+
+        params: Optional[Dict[str, Any]] = {
+            "$top": min(page_size, max_results) if max_results > 0 else page_size,
+            "$orderby": "start/dateTime",
+            "$select": ",".join(select)
         }
 
-        url = f"{self.graph_endpoint}{endpoint}"
-
-        async with httpx.AsyncClient() as client:
-            if method.upper() == "GET":
-                response = await client.get(url, headers=headers)
-            elif method.upper() == "POST":
-                response = await client.post(url, headers=headers, json=data)
-            elif method.upper() == "DELETE":
-                response = await client.delete(url, headers=headers)
-            elif method.upper() == "PATCH":
-                response = await client.patch(url, headers=headers, json=data)
-            else:
-                raise ValueError(f"지원하지 않는 HTTP 메서드: {method}")
+        if start_date and end_date:
+            # 범위 조회: 반복 일정의 각 회차까지 포함
+            endpoint: Optional[str] = f"{calendar}/calendarView"
+            params["startDateTime"] = start_date
+            params["endDateTime"] = end_date
+        else:
+            endpoint = f"{calendar}/events"
+            # 날짜 필터 추가
+            if start_date or end_date:
+                filters = []
+                if start_date:
+                    filters.append(f"start/dateTime ge '{start_date}'")
+                if end_date:
+                    filters.append(f"end/dateTime le '{end_date}'")
+                params["$filter"] = " and ".join(filters)
 
-            response.raise_for_status()
+        async for page in self._iter_pages(endpoint, params, {"Prefer": PREFER_TEXT_BODY}, max_results):
+            yield page
 
-            # DELETE 요청의 경우 빈 응답이 올 수 있음
-            if response.status_code == 204:
-                return {"success": True}
+    async def _iter_pages(self, endpoint: Optional[str], params: Optional[Dict[str, Any]],
+                          headers: Dict[str, str], max_results: int = 0) -> AsyncIterator[List[Dict[str, Any]]]:
+        """@odata.nextLink를 따라가며 페이지 반환 (max_results > 0이면 그 개수에서 중단)"""
+        remaining = max_results if max_results > 0 else None
 
-            return response.json()
+        while endpoint:
+            response = await self._make_request("GET", endpoint, params=params, extra_headers=headers)
+            page = response.get("value", [])
+            self.remember_etags(page)
+            if remaining is not None:
+                page = page[:remaining]
+                remaining -= len(page)
 
-    async def get_events(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+            if page:
+                yield page
+
+            if remaining == 0:
+                break
+
+            # nextLink에 쿼리 파라미터가 모두 포함되어 있음
+            endpoint = response.get("@odata.nextLink")
+            params = None
+
+    async def iter_single_events(self, start_date: str, end_date: str, page_size: Optional[int] = None,
+                                 fields: Optional[List[str]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """범위와 겹치는 단일 일정(반복 일정 제외)을 시작 시간 순으로 페이지 단위 조회 (시간은 UTC)"""
+        select = list(fields) if fields else list(DEFAULT_EVENT_FIELDS)
+        if "id" not in select:
+            select.insert(0, "id")
+
+        params = {
+            "$top": page_size or config.EVENTS_PAGE_SIZE,
+            "$orderby": "start/dateTime",
+            "$select": ",".join(select),
+            "$filter": f"type eq 'singleInstance' and start/dateTime lt '{end_date}' and end/dateTime gt '{start_date}'"
+        }
+        headers = {"Prefer": PREFER_EVENT}
+        async for page in self._iter_pages("/me/events", params, headers):
+            yield page
+
+    async def get_series_masters(self) -> List[Dict[str, Any]]:
+        """반복 일정 마스터 전체와 각 시리즈의 취소/예외 회차 조회 (시간은 UTC)"""
+        params = {
+            "$filter": "type eq 'seriesMaster'",
+            "$select": ",".join(SERIES_MASTER_FIELDS),
+            "$expand": "exceptionOccurrences",
+            "$top": config.EVENTS_PAGE_SIZE
+        }
+        headers = {"Prefer": PREFER_EVENT}
+        masters = []
+        async for page in self._iter_pages("/me/events", params, headers):
+            masters.extend(page)
+        return masters
+
+    async def get_events(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                         page_size: Optional[int] = None, max_results: Optional[int] = None,
+                         fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """일정 조회"""
-        endpoint = "/me/events"
+        events = []
+        async for page in self.iter_event_pages(start_date, end_date, page_size, max_results, fields):
+            events.extend(page)
+        return events
 
-        # 날짜 필터 추가
-        if start_date or end_date:
-            filters = []
-            if start_date:
-                filters.append(f"start/dateTime ge '{start_date}'")
-            if end_date:
-                filters.append(f"end/dateTime le '{end_date}'")
-            endpoint += f"?$filter={' and '.join(filters)}"
+    async def get_calendars(self) -> List[Dict[str, Any]]:
+        """캘린더 목록 (내 캘린더와 추가한 공유 캘린더, GROUP_CALENDARS이면 Microsoft 365 그룹 캘린더 포함)
 
-        response = await self._make_request("GET", endpoint)
-        return response.get("value", [])
+        항목: id, name, owner, canEdit, isDefaultCalendar, path(iter_event_pages의 calendar 인자)
+        """
+        calendars = []
+        params = {"$select": "id,name,owner,canEdit,isDefaultCalendar", "$top": 100}
+        async for page in self._iter_pages("/me/calendars", params, {}):
+            for calendar in page:
+                calendars.append({
+                    "id": calendar["id"],
+                    "name": calendar.get("name", ""),
+                    "owner": (calendar.get("owner") or {}).get("address", ""),
+                    "canEdit": calendar.get("canEdit", False),
+                    "isDefaultCalendar": calendar.get("isDefaultCalendar", False),
+                    "path": "/me" if calendar.get("isDefaultCalendar") else f"/me/calendars/{calendar['id']}"
+                })
 
-    async def create_event(self, subject: str, start_time: str, end_time: str,
+        if config.GROUP_CALENDARS:
+            params = {"$select": "id,displayName,mail,groupTypes", "$top": 100}
+            try:
+                async for page in self._iter_pages("/me/memberOf/microsoft.graph.group", params, {}):
+                    for group in page:
+                        # 캘린더는 Microsoft 365 그룹(Unified)에만 있음
+                        if "Unified" not in (group.get("groupTypes") or []):
+                            continue
+                        calendars.append({
+                            "id": group["id"],
+                            "name": group.get("displayName", ""),
+                            "owner": group.get("mail", ""),
+                            "canEdit": False,
+                            "isDefaultCalendar": False,
+                            "path": f"/groups/{group['id']}/calendar"
+                        })
+            except httpx.HTTPStatusError as e:
+                logger.warning("그룹 캘린더 목록 조회 실패 (Group.Read.All 권한 필요): %s", e)
+        return calendars
+
+    async def iter_calendar_delta(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                                  delta_link: Optional[str] = None) -> AsyncIterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """calendarView 델타 조회 (페이지별 변경분과 마지막 페이지의 deltaLink 반환)
+
+        delta_link가 없으면 start_date~end_date 윈도우를 처음부터 동기화합니다.
+        """
+        if delta_link:
+            endpoint: Optional[str] = delta_link
+            params: Optional[Dict[str, Any]] = None
+        else:
+            endpoint = "/me/calendarView/delta"
+            params = {"startDateTime": start_date, "endDateTime": end_date}
+
+        # 로컬 미러의 시간 비교를 위해 UTC로 통일
+        headers = {
+            "Prefer": f'{PREFER_EVENT}, odata.maxpagesize={config.EVENTS_PAGE_SIZE}'
+        }
+
+        while endpoint:
+            response = await self._make_request("GET", endpoint, params=params, extra_headers=headers)
+            next_delta_link = response.get("@odata.deltaLink")
+            page = response.get("value", [])
+            self.remember_etags(page)
+            for item in page:
+                if "@removed" in item:
+                    self._forget_event(item["id"])
+            yield page, next_delta_link
+
+            endpoint = response.get("@odata.nextLink")
+            params = None
+
+    @staticmethod
+    def _build_event_data(subject: str, start_time: str, end_time: str,
                           body: Optional[str] = None, location: Optional[str] = None,
                           attendees: Optional[List[str]] = None) -> Dict[str, Any]:
-        """일정 생성"""
+        """일정 생성 요청 본문 구성"""
         event_data = {
             "subject": subject,
             "start": {
@@ -96,17 +367,11 @@ class OutlookClient:
                 } for email in attendees
             ]
 
-        return await self._make_request("POST", "/me/events", event_data)
-
-    async def delete_event(self, event_id: str) -> Dict[str, Any]:
-        """일정 삭제"""
-        endpoint = f"/me/events/{event_id}"
-        return await self._make_request("DELETE", endpoint)
-
-    async def update_event(self, event_id: str, **kwargs) -> Dict[str, Any]:
-        """일정 수정"""
-        endpoint = f"/me/events/{event_id}"
+        return event_data
 
+    @staticmethod
+    def _build_update_data(**kwargs) -> Dict[str, Any]:
+        """일정 수정 요청 본문 구성"""
         update_data = {}
 
         if "subject" in kwargs:
@@ -135,8 +400,340 @@ class OutlookClient:
                 "displayName": kwargs["location"]
             }
 
-        return await self._make_request("PATCH", endpoint, update_data)
+        return update_data
+
+    async def create_event(self, subject: str, start_time: str, end_time: str,
+                          body: Optional[str] = None, location: Optional[str] = None,
+                          attendees: Optional[List[str]] = None) -> Dict[str, Any]:
+        """일정 생성"""
+        event_data = self._build_event_data(subject, start_time, end_time, body, location, attendees)
+        event = await self._make_request("POST", "/me/events", event_data, extra_headers={"Prefer": PREFER_EVENT})
+        self.remember_etags([event])
+        return event
+
+    async def get_event(self, event_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """일정 하나 조회 (전에 받은 결과가 있으면 If-None-Match로 바뀌었을 때만 본문을 받음)"""
+        select = ",".join(fields) if fields else ""
+        key = (event_id, select)
+        cached = self._event_bodies.get(key)
+
+        headers = {"Prefer": PREFER_EVENT}
+        if cached and cached.get("@odata.etag"):
+            headers["If-None-Match"] = cached["@odata.etag"]
+
+        response = await self._send(
+            "GET", f"/me/events/{event_id}", params={"$select": select} if select else None, extra_headers=headers
+        )
+        if response.status_code == 304 and cached:
+            CACHE_REQUESTS.labels("etag", "hit").inc()
+            self._event_bodies.move_to_end(key)
+            return cached
+
+        if response.status_code == 404:
+            self._forget_event(event_id)
+        response.raise_for_status()
+        CACHE_REQUESTS.labels("etag", "miss").inc()
+
+        event = response.json()
+        self.remember_etags([event])
+        self._event_bodies[key] = event
+        while len(self._event_bodies) > config.ETAG_CACHE_SIZE:
+            self._event_bodies.popitem(last=False)
+        return event
+
+    async def delete_event(self, event_id: str) -> Dict[str, Any]:
+        """일정 삭제"""
+        endpoint = f"/me/events/{event_id}"
+        result = await self._make_request("DELETE", endpoint)
+        self._forget_event(event_id)
+        return result
+
+    async def update_event(self, event_id: str, if_match: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """일정 수정
+
+        마지막으로 본 ETag(또는 if_match)를 If-Match로 보내, 그 사이 다른 곳에서 바뀐 일정을
+        덮어쓰지 않습니다. 충돌하면 최신 일정을 다시 조회해 EventConflictError로 돌려주며,
+        이때 새 ETag가 기록되므로 다음 수정도 If-Match로 보호됩니다.
+        조회한 적이 없는 일정은 ETag 없이 수정합니다.
+        """
+        endpoint = f"/me/events/{event_id}"
+        update_data = self._build_update_data(**kwargs)
+
+        headers = {"Prefer": PREFER_EVENT}
+        etag = if_match or self._etags.get(event_id)
+        if etag:
+            headers["If-Match"] = etag
+        response = await self._send("PATCH", endpoint, update_data, extra_headers=headers)
+        if response.status_code == 412:
+            # 412 Precondition Failed: 마지막으로 본 뒤 다른 곳에서 수정됨
+            self._forget_bodies(event_id)
+            raise EventConflictError(event_id, await self.get_event(event_id))
+        response.raise_for_status()
+
+        event = response.json()
+        self._forget_event(event_id)
+        self.remember_etags([event])
+        return event
+
+    @staticmethod
+    def _split_batches(requests: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """dependsOn으로 연결된 요청은 같은 배치에 두고 최대 20개씩 나눔"""
+        # 의존 관계로 연결된 요청끼리 그룹화 (union-find)
+        parent = {request["id"]: request["id"] for request in requests}
+
+        def find(request_id: str) -> str:
+            while parent[request_id] != request_id:
+                parent[request_id] = parent[parent[request_id]]
+                request_id = parent[request_id]
+            return request_id
+
+        for request in requests:
+            for dependency in request.get("dependsOn", []):
+                if dependency not in parent:
+                    raise ValueError(f"존재하지 않는 요청에 의존합니다: {request['id']} -> {dependency}")
+                parent[find(request["id"])] = find(dependency)
+
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for request in requests:
+            groups.setdefault(find(request["id"]), []).append(request)
+
+        batches: List[List[Dict[str, Any]]] = []
+        for group in groups.values():
+            if len(group) > GRAPH_BATCH_LIMIT:
+                raise ValueError(f"서로 의존하는 요청은 {GRAPH_BATCH_LIMIT}개를 넘을 수 없습니다.")
+            if batches and len(batches[-1]) + len(group) <= GRAPH_BATCH_LIMIT:
+                batches[-1].extend(group)
+            else:
+                batches.append(list(group))
+        return batches
+
+    @staticmethod
+    def _batch_retry_after(item: Dict[str, Any]) -> Optional[float]:
+        """$batch 개별 응답의 Retry-After 헤더 (대소문자 무시)"""
+        headers = {key.lower(): value for key, value in (item.get("headers") or {}).items()}
+        return parse_retry_after(headers.get("retry-after"))
+
+    async def batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """JSON $batch로 여러 요청을 묶어 실행
+
+        각 요청은 id, method, url(예: /me/events)과 선택적으로 body, dependsOn을 가집니다.
+        독립적인 배치는 동시에 전송되며, 결과는 요청 순서대로 id/status/body를 반환합니다.
+        """
+        if not requests:
+            return []
+
+        requests = [
+            {**request, "headers": {"Content-Type": "application/json", **(request.get("headers") or {})}}
+            if request.get("body") is not None else request
+            for request in requests
+        ]
+
+        semaphore = asyncio.Semaphore(config.BATCH_MAX_CONCURRENCY)
+
+        async def send(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                response = await self._make_request("POST", "/$batch", {"requests": chunk})
+                return response.get("responses", [])
+
+        async def run(pending: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            chunks = self._split_batches(pending)
+            results = await asyncio.gather(*(send(chunk) for chunk in chunks))
+            return [item for chunk_result in results for item in chunk_result]
+
+        responses = {item["id"]: item for item in await run(requests)}
+
+        # 스로틀링된 개별 항목 중 멱등이고 의존 관계가 없는 항목만 재시도
+        # (transactionId가 있는 일정 생성은 Graph가 중복 생성을 막으므로 멱등으로 취급)
+        for attempt in range(config.GRAPH_MAX_RETRIES):
+            throttled = [
+                request for request in requests
+                if (request["method"].upper() in IDEMPOTENT_METHODS or (request.get("body") or {}).get("transactionId"))
+                and not request.get("dependsOn")
+                and responses.get(request["id"], {}).get("status") in RETRYABLE_STATUS
+            ]
+            if not throttled:
+                break
+
+            retry_afters = [
+                value for value in (self._batch_retry_after(responses[request["id"]]) for request in throttled)
+                if value is not None
+            ]
+            delay = max(retry_afters) if retry_afters else backoff_delay(attempt)
+            await asyncio.sleep(delay)
+
+            responses.update({item["id"]: item for item in await run(throttled)})
+
+        return [
+            responses.get(request["id"], {"id": request["id"], "status": 0, "body": {"error": {"message": "응답 없음"}}})
+            for request in requests
+        ]
+
+    async def batch_create_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """여러 일정을 $batch로 생성 (events 항목은 create_event 인자와 동일)"""
+        return await self.batch_create_event_bodies([
+            self._build_event_data(
+                event["subject"], event["start_time"], event["end_time"],
+                event.get("body"), event.get("location"), event.get("attendees")
+            )
+            for event in events
+        ])
+
+    async def batch_create_event_bodies(self, bodies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Graph 일정 본문 목록을 그대로 $batch로 생성 (가져오기용)"""
+        requests = [
+            {
+                "id": str(index), "method": "POST", "url": "/me/events",
+                "body": body, "headers": {"Prefer": PREFER_EVENT}
+            }
+            for index, body in enumerate(bodies)
+        ]
+        results = await self.batch(requests)
+        self.remember_etags([
+            result["body"] for result in results
+            if 200 <= result.get("status", 0) < 300 and isinstance(result.get("body"), dict)
+        ])
+        return results
+
+    async def batch_update_events(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """여러 일정을 $batch로 수정 (updates 항목은 event_id와 update_event 인자)"""
+        requests = []
+        for index, update in enumerate(updates):
+            fields = {key: value for key, value in update.items() if key != "event_id"}
+            request = {
+                "id": str(index),
+                "method": "PATCH",
+                "url": f"/me/events/{update['event_id']}",
+                "body": self._build_update_data(**fields),
+                "headers": {"Prefer": PREFER_EVENT}
+            }
+            etag = self._etags.get(update["event_id"])
+            if etag:
+                request["headers"]["If-Match"] = etag
+            requests.append(request)
+
+        results = await self.batch(requests)
+        conflicts = []
+        for update, result in zip(updates, results):
+            if result.get("status") == 412:
+                # 충돌한 일정은 최신 버전을 다시 조회해 새 ETag를 기록하고 결과에 붙임
+                self._forget_bodies(update["event_id"])
+                conflicts.append((update["event_id"], result))
+                continue
+            self._forget_event(update["event_id"])
+            if 200 <= result.get("status", 0) < 300 and isinstance(result.get("body"), dict):
+                self.remember_etags([result["body"]])
+
+        if conflicts:
+            current = await asyncio.gather(
+                *(self.get_event(event_id) for event_id, _ in conflicts), return_exceptions=True
+            )
+            for (event_id, result), event in zip(conflicts, current):
+                if isinstance(event, dict):
+                    result["current"] = event
+                else:
+                    self._forget_event(event_id)
+        return results
+
+    async def batch_delete_events(self, event_ids: List[str]) -> List[Dict[str, Any]]:
+        """여러 일정을 $batch로 삭제"""
+        requests = [
+            {"id": str(index), "method": "DELETE", "url": f"/me/events/{event_id}"}
+            for index, event_id in enumerate(event_ids)
+        ]
+        results = await self.batch(requests)
+        # 실패한 항목(412, 429 등)은 일정이 남아 있으므로 ETag와 조회 결과를 유지
+        for event_id, result in zip(event_ids, results):
+            if 200 <= result.get("status", 0) < 300:
+                self._forget_event(event_id)
+        return results
+
+    async def get_schedule(self, emails: List[str], start_date: str, end_date: str,
+                           interval_minutes: int = 30) -> Dict[str, Dict[str, Any]]:
+        """여러 사람의 바쁜 시간 조회 (getSchedule)
+
+        참석자는 SCHEDULE_CHUNK_SIZE명, 기간은 최대 62일 단위로 나누어 동시에 요청합니다.
+        반환값은 이메일별 {"busy": [(start, end), ...], "error": 메시지 또는 None}입니다.
+        """
+        range_start = parse_graph_datetime(start_date)
+        range_end = parse_graph_datetime(end_date)
+
+        spans = []
+        span_start = range_start
+        while span_start < range_end:
+            span_end = min(span_start + timedelta(days=GET_SCHEDULE_MAX_DAYS), range_end)
+            spans.append((span_start, span_end))
+            span_start = span_end
+
+        chunk_size = config.SCHEDULE_CHUNK_SIZE
+        chunks = [emails[i:i + chunk_size] for i in range(0, len(emails), chunk_size)]
+
+        async def fetch(chunk: List[str], span: Tuple[datetime, datetime]) -> List[Dict[str, Any]]:
+            body = {
+                "schedules": chunk,
+                "startTime": {"dateTime": format_utc(span[0]), "timeZone": "UTC"},
+                "endTime": {"dateTime": format_utc(span[1]), "timeZone": "UTC"},
+                "availabilityViewInterval": interval_minutes
+            }
+            response = await self._make_request(
+                "POST", "/me/calendar/getSchedule", body,
+                extra_headers={"Prefer": 'outlook.timezone="UTC"'}, idempotent=True
+            )
+            return response.get("value", [])
+
+        results = await asyncio.gather(*(fetch(chunk, span) for chunk in chunks for span in spans))
+
+        schedules: Dict[str, Dict[str, Any]] = {email: {"busy": [], "error": None} for email in emails}
+        for result in results:
+            for schedule in result:
+                entry = schedules.setdefault(schedule["scheduleId"], {"busy": [], "error": None})
+                if schedule.get("error"):
+                    entry["error"] = schedule["error"].get("message", "조회 실패")
+                    continue
+                for item in schedule.get("scheduleItems", []):
+                    if item.get("status") in BUSY_STATUSES:
+                        entry["busy"].append((
+                            parse_graph_datetime(item["start"]["dateTime"]),
+                            parse_graph_datetime(item["end"]["dateTime"])
+                        ))
+        return schedules
 
     async def get_user_info(self) -> Dict[str, Any]:
-        """사용자 정보 조회"""
-        return await self._make_request("GET", "/me")
\ No newline at end of file
+        """사용자 정보 조회 (세션 동안 캐시, 동시 호출은 한 요청으로 합침)"""
+        if self._profile is None:
+            self._profile = asyncio.ensure_future(self._make_request("GET", "/me"))
+            CACHE_REQUESTS.labels("profile", "miss").inc()
+        else:
+            CACHE_REQUESTS.labels("profile", "hit").inc()
+
+        profile = self._profile
+        try:
+            return await asyncio.shield(profile)
+        except Exception:
+            # 실패한 결과는 캐시하지 않음
+            if self._profile is profile:
+                self._profile = None
+            raise
+
+    async def create_subscription(self, notification_url: str, client_state: str, expiration: str,
+                                  resource: str = "/me/events",
+                                  change_type: str = "created,updated,deleted") -> Dict[str, Any]:
+        """변경 알림 구독 생성 (Graph가 notification_url로 validationToken 검증 요청을 보냄)"""
+        data = {
+            "changeType": change_type,
+            "notificationUrl": notification_url,
+            "lifecycleNotificationUrl": notification_url,
+            "resource": resource,
+            "expirationDateTime": expiration,
+            "clientState": client_state
+        }
+        return await self._make_request("POST", "/subscriptions", data)
+
+    async def renew_subscription(self, subscription_id: str, expiration: str) -> Dict[str, Any]:
+        """구독 만료 시간 연장"""
+        return await self._make_request(
+            "PATCH", f"/subscriptions/{subscription_id}", {"expirationDateTime": expiration}
+        )
+
+    async def delete_subscription(self, subscription_id: str) -> Dict[str, Any]:
+        """구독 삭제"""
+        return await self._make_request("DELETE", f"/subscriptions/{subscription_id}")
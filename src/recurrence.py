@@ -0,0 +1,306 @@
+import asyncio
+import calendar
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import httpx
+from .config import config
+from .outlook_client import DEFAULT_EVENT_FIELDS
+from .time_utils import event_time, format_utc, parse_graph_datetime
+
+logger = logging.getLogger("outlook-mcp")
+
+WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6
+}
+
+# relativeMonthly/relativeYearly의 index (last는 마지막)
+INDEXES = {"first": 0, "second": 1, "third": 2, "fourth": 3, "last": -1}
+
+# Graph가 반환하는 Windows 시간대 이름 -> IANA 이름 (자주 쓰는 것만, 나머지는 IANA 이름으로 간주)
+WINDOWS_TIME_ZONES = {
+    "UTC": "UTC",
+    "Korea Standard Time": "Asia/Seoul",
+    "Tokyo Standard Time": "Asia/Tokyo",
+    "China Standard Time": "Asia/Shanghai",
+    "Singapore Standard Time": "Asia/Singapore",
+    "India Standard Time": "Asia/Kolkata",
+    "GMT Standard Time": "Europe/London",
+    "W. Europe Standard Time": "Europe/Berlin",
+    "Romance Standard Time": "Europe/Paris",
+    "Central Europe Standard Time": "Europe/Budapest",
+    "Eastern Standard Time": "America/New_York",
+    "Central Standard Time": "America/Chicago",
+    "Mountain Standard Time": "America/Denver",
+    "Pacific Standard Time": "America/Los_Angeles",
+    "AUS Eastern Standard Time": "Australia/Sydney"
+}
+
+# 로컬 전개에서 마스터로부터 복사하지 않는 필드
+_SERIES_FIELDS = {"recurrence", "exceptionOccurrences", "cancelledOccurrences", "@odata.etag"}
+
+def resolve_time_zone(name: Optional[str]) -> tzinfo:
+    """Graph 시간대 이름을 tzinfo로 변환 (알 수 없으면 UTC)"""
+    if not name:
+        return timezone.utc
+    try:
+        return ZoneInfo(WINDOWS_TIME_ZONES.get(name, name))
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("알 수 없는 시간대 %s, UTC로 전개합니다", name)
+        return timezone.utc
+
+def _add_months(day: date, months: int) -> date:
+    """day가 속한 달에서 months만큼 이동한 달의 1일"""
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+def _clamp_day(year: int, month: int, day_of_month: int) -> date:
+    """달의 일수를 넘는 날짜는 그 달의 마지막 날로 (예: 매월 31일 -> 2월 28일)"""
+    return date(year, month, min(day_of_month, calendar.monthrange(year, month)[1]))
+
+def _relative_day(year: int, month: int, weekdays: Set[int], index: int) -> date:
+    """달에서 weekdays에 해당하는 날 중 index번째 (예: 마지막 금요일, 첫 번째 평일)"""
+    days = [
+        date(year, month, day) for day in range(1, calendar.monthrange(year, month)[1] + 1)
+        if date(year, month, day).weekday() in weekdays
+    ]
+    return days[index] if index < 0 else days[min(index, len(days) - 1)]
+
+def _pattern_candidates(pattern: Dict[str, Any], start: date) -> Iterator[date]:
+    """패턴에 맞는 날짜를 start부터 순서대로 생성 (범위 종료 조건은 적용하지 않음)"""
+    kind = pattern.get("type")
+    interval = max(1, int(pattern.get("interval") or 1))
+    weekdays = {WEEKDAYS[day.lower()] for day in pattern.get("daysOfWeek") or []}
+    index = INDEXES.get((pattern.get("index") or "first").lower(), 0)
+
+    if kind in ("relativeMonthly", "relativeYearly") and not weekdays:
+        raise ValueError(f"{kind} 반복 패턴에 요일(daysOfWeek)이 없습니다")
+
+    if kind == "daily":
+        day = start
+        while True:
+            yield day
+            day += timedelta(days=interval)
+
+    elif kind == "weekly":
+        weekdays = weekdays or {start.weekday()}
+        first_day = WEEKDAYS.get((pattern.get("firstDayOfWeek") or "sunday").lower(), 6)
+        week = start - timedelta(days=(start.weekday() - first_day) % 7)
+        while True:
+            for offset in range(7):
+                day = week + timedelta(days=offset)
+                if day >= start and day.weekday() in weekdays:
+                    yield day
+            week += timedelta(weeks=interval)
+
+    elif kind in ("absoluteMonthly", "relativeMonthly"):
+        month = start.replace(day=1)
+        while True:
+            if kind == "absoluteMonthly":
+                day = _clamp_day(month.year, month.month, int(pattern.get("dayOfMonth") or start.day))
+            else:
+                day = _relative_day(month.year, month.month, weekdays, index)
+            if day >= start:
+                yield day
+            month = _add_months(month, interval)
+
+    elif kind in ("absoluteYearly", "relativeYearly"):
+        month_of_year = int(pattern.get("month") or start.month)
+        year = start.year
+        while True:
+            if kind == "absoluteYearly":
+                day = _clamp_day(year, month_of_year, int(pattern.get("dayOfMonth") or start.day))
+            else:
+                day = _relative_day(year, month_of_year, weekdays, index)
+            if day >= start:
+                yield day
+            year += interval
+
+    else:
+        raise ValueError(f"지원하지 않는 반복 패턴: {kind}")
+
+def occurrence_dates(recurrence: Dict[str, Any], until: date) -> Iterator[date]:
+    """반복 범위(endDate/numbered/noEnd)를 적용한 회차 날짜 (until 이후는 생성하지 않음)"""
+    recurrence_range = recurrence.get("range") or {}
+    start = date.fromisoformat(recurrence_range["startDate"])
+    range_type = recurrence_range.get("type", "noEnd")
+
+    if range_type == "endDate":
+        until = min(until, date.fromisoformat(recurrence_range["endDate"]))
+    # 취소된 회차도 numbered 개수에 포함됨 (Outlook과 동일)
+    remaining = int(recurrence_range.get("numberOfOccurrences") or 0) if range_type == "numbered" else None
+
+    for day in _pattern_candidates(recurrence.get("pattern") or {}, start):
+        if day > until or remaining == 0:
+            return
+        yield day
+        if remaining is not None:
+            remaining -= 1
+
+def _graph_time(value: datetime) -> Dict[str, str]:
+    return {"dateTime": format_utc(value) + ".0000000", "timeZone": "UTC"}
+
+def _overlaps(event: Dict[str, Any], window_start: datetime, window_end: datetime) -> bool:
+    return (parse_graph_datetime(event_time(event, "start")) < window_end
+            and parse_graph_datetime(event_time(event, "end")) > window_start)
+
+def expand_series(master: Dict[str, Any], window_start: datetime, window_end: datetime) -> List[Dict[str, Any]]:
+    """시리즈 마스터를 범위 내 회차로 전개 (취소된 회차 제외, 이동된 회차는 예외 일정으로 대체, 시작 시간 순)
+
+    마스터의 start/end와 예외 일정의 originalStart는 UTC로 조회한 값이어야 합니다.
+    전개한 회차의 ID는 Graph의 취소 회차 표기와 같은 OID.{마스터 ID}.{날짜} 형식입니다.
+    """
+    recurrence = master.get("recurrence") or {}
+    zone = resolve_time_zone(
+        (recurrence.get("range") or {}).get("recurrenceTimeZone") or master.get("originalStartTimeZone")
+    )
+    master_start = parse_graph_datetime(event_time(master, "start"))
+    duration = parse_graph_datetime(event_time(master, "end")) - master_start
+    # 회차 시각은 반복 시간대의 현지 시각 기준 (DST가 바뀌어도 현지 시각 유지)
+    local_time = master_start.astimezone(zone).time()
+
+    cancelled = {
+        occurrence_id.rsplit(".", 1)[-1] for occurrence_id in master.get("cancelledOccurrences") or []
+    }
+    exceptions = master.get("exceptionOccurrences") or []
+    moved = {
+        format_utc(parse_graph_datetime(exception["originalStart"]))
+        for exception in exceptions if exception.get("originalStart")
+    }
+
+    occurrences = []
+    # 범위 끝의 현지 날짜 다음 날까지만 생성 (그 이후 회차는 범위와 겹칠 수 없음)
+    until = (window_end.astimezone(zone) + timedelta(days=1)).date()
+    template = {key: value for key, value in master.items() if key not in _SERIES_FIELDS}
+    for day in occurrence_dates(recurrence, until):
+        start = datetime.combine(day, local_time, tzinfo=zone).astimezone(timezone.utc)
+        end = start + duration
+        if end <= window_start or start >= window_end:
+            continue
+        if day.isoformat() in cancelled or format_utc(start) in moved:
+            continue
+        occurrences.append({
+            **template,
+            "id": f"OID.{master['id']}.{day.isoformat()}",
+            "type": "occurrence",
+            "seriesMasterId": master["id"],
+            "start": _graph_time(start),
+            "end": _graph_time(end),
+            "originalStart": format_utc(start) + "Z"
+        })
+
+    for exception in exceptions:
+        if exception.get("isCancelled") or not _overlaps(exception, window_start, window_end):
+            continue
+        occurrences.append({**exception, "seriesMasterId": master["id"]})
+
+    return sorted(occurrences, key=lambda event: event_time(event, "start"))
+
+class RecurrenceEngine:
+    """반복 일정을 로컬에서 전개하는 장기 범위 조회
+
+    시리즈 마스터와 예외 회차는 한 번만 조회해 캐시하고, 단일 일정만 Graph에서 받아
+    전개한 회차와 시작 시간 순으로 합칩니다. 회차 수에 비례하는 calendarView 페이지 조회를 피합니다.
+    """
+
+    def __init__(self, outlook_client):
+        self.outlook_client = outlook_client
+        self._masters: Optional[List[Dict[str, Any]]] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        # $expand=exceptionOccurrences 등을 지원하지 않는 테넌트면 calendarView로 대체
+        self.disabled = False
+
+    async def masters(self) -> List[Dict[str, Any]]:
+        """시리즈 마스터 목록 (RECURRENCE_CACHE_TTL 동안 재사용)"""
+        async with self._lock:
+            if self._masters is None or time.monotonic() - self._loaded_at > config.RECURRENCE_CACHE_TTL:
+                self._masters = await self.outlook_client.get_series_masters()
+                self._loaded_at = time.monotonic()
+            return self._masters
+
+    def invalidate(self):
+        """반복 일정이 바뀌었을 때 마스터 캐시 삭제"""
+        self._masters = None
+
+    def expand(self, masters: List[Dict[str, Any]], window_start: datetime,
+               window_end: datetime) -> List[Dict[str, Any]]:
+        """마스터 목록을 범위 내 회차로 전개 (전개할 수 없는 시리즈는 건너뜀)"""
+        occurrences = []
+        for master in masters:
+            try:
+                occurrences.extend(expand_series(master, window_start, window_end))
+            except (KeyError, ValueError) as e:
+                logger.warning("반복 일정 전개 실패: %s", e, extra={"fields": {"event_id": master.get("id")}})
+        return sorted(occurrences, key=lambda event: event_time(event, "start"))
+
+    async def iter_event_pages(self, start_date: str, end_date: str, page_size: Optional[int] = None,
+                               max_results: Optional[int] = None,
+                               fields: Optional[List[str]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """범위 내 일정을 페이지 단위로 조회 (OutlookClient.iter_event_pages와 동일한 형태)"""
+        if not self.disabled:
+            try:
+                masters = await self.masters()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 400:
+                    raise
+                logger.warning("반복 일정 마스터 조회를 지원하지 않아 calendarView로 대체합니다: %s", e)
+                self.disabled = True
+
+        if self.disabled:
+            async for page in self.outlook_client.iter_event_pages(
+                start_date=start_date, end_date=end_date, page_size=page_size,
+                max_results=max_results, fields=fields
+            ):
+                yield page
+            return
+
+        page_size = page_size or config.EVENTS_PAGE_SIZE
+        if max_results is None:
+            max_results = config.EVENTS_MAX_RESULTS
+        remaining = max_results if max_results > 0 else None
+
+        select = list(fields) if fields else list(DEFAULT_EVENT_FIELDS)
+        if "id" not in select:
+            select.insert(0, "id")
+
+        occurrences = self.expand(masters, parse_graph_datetime(start_date), parse_graph_datetime(end_date))
+        position = 0
+        page: List[Dict[str, Any]] = []
+
+        def take(event: Dict[str, Any]) -> bool:
+            """페이지에 추가 (max_results에 도달하면 False)"""
+            nonlocal remaining
+            if remaining == 0:
+                return False
+            page.append({key: event[key] for key in select if key in event})
+            if remaining is not None:
+                remaining -= 1
+            return True
+
+        # 단일 일정 페이지와 전개한 회차를 시작 시간 순으로 병합
+        async for singles in self.outlook_client.iter_single_events(start_date, end_date, page_size, select):
+            for event in singles:
+                key = event_time(event, "start")
+                while position < len(occurrences) and event_time(occurrences[position], "start") <= key:
+                    if not take(occurrences[position]):
+                        break
+                    position += 1
+                if not take(event):
+                    break
+            if len(page) >= page_size:
+                yield page
+                page = []
+            if remaining == 0:
+                break
+
+        while position < len(occurrences) and take(occurrences[position]):
+            position += 1
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from .config import config
+from .metrics import CACHE_REQUESTS
+from .state_store import StateBackend
+
+# 캐시 항목이 다루는 시간 범위 (epoch 초, 끝이 없으면 ±inf)
+TimeRange = Tuple[float, float]
+
+# 공유 캐시 항목과 계정별 캐시 버전을 저장하는 상태 저장소 이름공간
+SHARED_NAMESPACE = "response_cache"
+VERSION_NAMESPACE = "response_cache_version"
+
+class ResponseCache:
+    """읽기 도구 결과의 TTL + LRU 캐시
+
+    같은 키의 조회가 동시에 들어오면 하나의 조회만 실행하고 결과를 함께 받습니다.
+    키의 첫 번째 값은 계정이며, 쓰기가 일어나면 해당 계정에서 시간 범위가 겹치는 항목만 무효화합니다.
+    share()로 상태 저장소를 지정하면 다른 워커가 조회한 결과를 함께 쓰고, 무효화할 때 계정의 캐시 버전을
+    바꿔 다른 워커의 메모리 캐시도 다음 조회에서 버리게 합니다.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_entries = config.RESPONSE_CACHE_SIZE if max_entries is None else max_entries
+        self.ttl = config.RESPONSE_CACHE_TTL if ttl is None else ttl
+        # 키 -> (만료 시각, 시간 범위, 값, 저장할 때의 계정 캐시 버전)
+        self._entries: "OrderedDict[Tuple, Tuple[float, TimeRange, Any, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        # 무효화 횟수 (조회 도중 쓰기가 있었으면 결과를 저장하지 않음)
+        self._generation = 0
+        self._shared: Optional[StateBackend] = None
+        self._encode: Callable[[Any], Any] = lambda value: value
+        self._decode: Callable[[Any], Any] = lambda value: value
+
+    def share(self, backend: StateBackend, encode: Callable[[Any], Any], decode: Callable[[Any], Any]):
+        """상태 저장소로 워커끼리 캐시 공유 (encode 결과를 JSON으로 저장하고 decode로 되돌림)"""
+        self._shared = backend
+        self._encode = encode
+        self._decode = decode
+
+    def _version(self, account: str) -> Any:
+        """계정의 공유 캐시 버전 (공유하지 않으면 None)"""
+        if self._shared is None:
+            return None
+        return self._shared.get_value(VERSION_NAMESPACE, account)
+
+    @staticmethod
+    def _shared_key(key: Tuple) -> str:
+        # 계정 접두사로 계정 단위 검색
+        return f"{key[0]}\x1f" + hashlib.sha1(repr(key[1:]).encode("utf-8")).hexdigest()
+
+    async def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[Any]],
+                          time_range: TimeRange = (float("-inf"), float("inf")),
+                          ttl: Optional[float] = None) -> Any:
+        """캐시된 값 반환 (없으면 loader 실행, 같은 키의 동시 호출은 결과 공유, ttl로 항목별 TTL 지정)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            # 다른 워커에서 무효화했으면 버전이 바뀜
+            if entry[0] > time.monotonic() and entry[3] == self._version(key[0]):
+                CACHE_REQUESTS.labels("response", "hit").inc()
+                self._entries.move_to_end(key)
+                return entry[2]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            CACHE_REQUESTS.labels("response", "coalesced").inc()
+        else:
+            CACHE_REQUESTS.labels("response", "miss").inc()
+            # 먼저 호출한 쪽이 취소되어도 나머지 호출은 결과를 받도록 별도 태스크에서 실행
+            task = asyncio.ensure_future(self._load(key, loader, time_range, self.ttl if ttl is None else ttl))
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Tuple, loader: Callable[[], Awaitable[Any]], time_range: TimeRange,
+                    ttl: float) -> Any:
+        generation = self._generation
+        version = self._version(key[0])
+        stored = None
+        try:
+            if self._shared is not None:
+                stored = self._shared.get_value(SHARED_NAMESPACE, self._shared_key(key))
+            if stored is not None:
+                CACHE_REQUESTS.labels("response", "shared_hit").inc()
+                value = self._decode(stored["value"])
+                ttl = min(ttl, stored["expires"] - time.time())
+            else:
+                value = await loader()
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+        if ttl <= 0 or generation != self._generation or version != self._version(key[0]):
+            return value
+        if self.max_entries > 0:
+            self._entries[key] = (time.monotonic() + ttl, time_range, value, version)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if self._shared is not None and stored is None:
+            self._shared.set_value(SHARED_NAMESPACE, self._shared_key(key), {
+                "range": list(time_range), "value": self._encode(value), "expires": time.time() + ttl
+            }, ttl)
+        return value
+
+    def invalidate(self, account: str, time_ranges: Optional[List[TimeRange]] = None, propagate: bool = True):
+        """계정의 캐시 무효화 (time_ranges가 없으면 계정 전체, propagate=False면 이 워커의 메모리 캐시만)"""
+        self._generation += 1
+        # 쓰기 이전에 시작된 조회에는 새 호출을 합치지 않음
+        for key in [key for key in self._inflight if key[0] == account]:
+            del self._inflight[key]
+
+        def overlaps(entry_range) -> bool:
+            return time_ranges is None or any(
+                start < entry_range[1] and end > entry_range[0] for start, end in time_ranges
+            )
+
+        version = None
+        if self._shared is not None and propagate:
+            # 겹치는 공유 항목을 지우고 버전을 바꿔 다른 워커의 메모리 캐시를 무효화
+            # (다른 워커는 남은 공유 항목에서 다시 채우므로 겹치지 않는 범위는 그대로 재사용됨)
+            stale = [
+                shared_key for shared_key, stored in self._shared.scan_values(SHARED_NAMESPACE, f"{account}\x1f")
+                if overlaps(stored["range"])
+            ]
+            self._shared.delete_values(SHARED_NAMESPACE, stale)
+            version = secrets.token_hex(8)
+            self._shared.set_value(VERSION_NAMESPACE, account, version)
+
+        for key, (expires, entry_range, value, _) in list(self._entries.items()):
+            if key[0] != account:
+                continue
+            if overlaps(entry_range):
+                del self._entries[key]
+            elif version is not None:
+                self._entries[key] = (expires, entry_range, value, version)
+
+    def clear(self):
+        """전체 삭제"""
+        self._generation += 1
+        self._inflight.clear()
+        self._entries.clear()
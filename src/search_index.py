@@ -0,0 +1,320 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+from .config import config
+from .state_store import cross_process_lock
+from .time_utils import event_time, format_utc, normalize_datetime
+
+logger = logging.getLogger("outlook-mcp")
+
+# 색인에 보관하는 필드 (검색 결과 출력용, 본문 전체는 저장하지 않음)
+SEARCH_FIELDS = [
+    "id", "subject", "start", "end", "location", "bodyPreview", "attendees",
+    "organizer", "type", "seriesMasterId", "isCancelled"
+]
+
+# bm25 열 가중치: 제목, 본문 미리보기, 장소, 참석자
+_WEIGHTS = (10.0, 1.0, 4.0, 2.0)
+
+_TOKEN = re.compile(r"\w+")
+
+# 다른 워커와 전체 색인을 겹쳐 실행하지 않도록 잡는 잠금 유지 시간 (초, 색인 중 프로세스가 죽으면 이 시간 뒤 풀림)
+REINDEX_LOCK_TTL = 600
+
+def search_db_file(account: Optional[str] = None) -> str:
+    """계정별 검색 색인 DB 파일 경로 (계정 미지정 시 SEARCH_DB_FILE)"""
+    if not account:
+        return config.SEARCH_DB_FILE
+    base, ext = os.path.splitext(config.SEARCH_DB_FILE)
+    return f"{base}-{hashlib.sha1(account.encode()).hexdigest()[:12]}{ext}"
+
+def match_query(query: str, operator: str = "AND") -> str:
+    """검색어를 FTS5 MATCH 식으로 변환 (단어마다 접두어 검색, 예: 회의 -> 회의를/회의실도 일치)"""
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        raise ValueError("검색어가 비어 있습니다")
+    return f" {operator} ".join('"' + token.replace('"', '""') + '"*' for token in tokens)
+
+def _document(event: Dict[str, Any]) -> Dict[str, Any]:
+    document = {key: event[key] for key in SEARCH_FIELDS if key in event}
+    # bodyPreview 없이 본문만 조회한 경우 앞부분만 보관
+    if "bodyPreview" not in document and isinstance(event.get("body"), dict):
+        document["bodyPreview"] = (event["body"].get("content") or "")[:255]
+    return document
+
+def _columns(document: Dict[str, Any]) -> tuple:
+    """FTS 열 값 (제목, 본문 미리보기, 장소, 참석자 이름/주소)"""
+    attendees = " ".join(
+        f"{(attendee.get('emailAddress') or {}).get('name', '')} {(attendee.get('emailAddress') or {}).get('address', '')}"
+        for attendee in document.get("attendees") or []
+    )
+    return (
+        document.get("subject") or "",
+        document.get("bodyPreview") or "",
+        (document.get("location") or {}).get("displayName", ""),
+        attendees
+    )
+
+class SearchIndex:
+    """일정 전문 검색 색인 (SQLite FTS5, 동기화 윈도우와 무관하게 본 적 있는 일정을 모두 보관)"""
+
+    def __init__(self, db_file: Optional[str] = None):
+        self.db_file = db_file or config.SEARCH_DB_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.fts = True
+        self._create_schema()
+
+    def _create_schema(self):
+        """테이블 및 인덱스 생성 (FTS5가 없는 SQLite면 LIKE 검색으로 대체)"""
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    doc_id INTEGER PRIMARY KEY,
+                    id TEXT UNIQUE NOT NULL,
+                    start TEXT NOT NULL,
+                    end TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    indexed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_documents_start ON documents (start);
+                CREATE TABLE IF NOT EXISTS search_state (
+                    name TEXT PRIMARY KEY,
+                    range_start TEXT NOT NULL,
+                    range_end TEXT NOT NULL,
+                    indexed_at REAL NOT NULL
+                );
+            """)
+            try:
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+                    "subject, body, location, attendees, tokenize='unicode61', prefix='2 3')"
+                )
+            except sqlite3.OperationalError as e:
+                logger.warning("SQLite FTS5를 사용할 수 없어 LIKE 검색으로 대체합니다: %s", e)
+                self.fts = False
+
+    def upsert_events(self, events: Iterable[Dict[str, Any]]):
+        """일정 색인 추가 또는 갱신 (일부 필드만 조회한 일정은 기존 값과 합침)"""
+        now = time.time()
+        with self._lock, self._conn:
+            for event in events:
+                if not event.get("id"):
+                    continue
+                row = self._conn.execute("SELECT doc_id, data FROM documents WHERE id = ?", (event["id"],)).fetchone()
+                document = {**json.loads(row["data"]), **_document(event)} if row else _document(event)
+                values = (event_time(document, "start"), event_time(document, "end"),
+                          json.dumps(document, ensure_ascii=False), now)
+                if row:
+                    doc_id = row["doc_id"]
+                    self._conn.execute(
+                        "UPDATE documents SET start = ?, end = ?, data = ?, indexed_at = ? WHERE doc_id = ?",
+                        (*values, doc_id)
+                    )
+                    if self.fts:
+                        self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+                else:
+                    doc_id = self._conn.execute(
+                        "INSERT INTO documents (id, start, end, data, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                        (document["id"], *values)
+                    ).lastrowid
+                if self.fts:
+                    self._conn.execute(
+                        "INSERT INTO documents_fts (rowid, subject, body, location, attendees) VALUES (?, ?, ?, ?, ?)",
+                        (doc_id, *_columns(document))
+                    )
+
+    def delete_events(self, event_ids: Iterable[str]):
+        """일정 색인 삭제"""
+        with self._lock, self._conn:
+            for event_id in event_ids:
+                row = self._conn.execute("SELECT doc_id FROM documents WHERE id = ?", (event_id,)).fetchone()
+                if row is None:
+                    continue
+                self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (row["doc_id"],))
+                if self.fts:
+                    self._conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (row["doc_id"],))
+
+    def delete_stale(self, range_start: str, range_end: str, indexed_before: float) -> int:
+        """재색인 중 다시 보지 못한 범위 내 일정 삭제 (Graph에서 삭제된 일정)"""
+        with self._lock:
+            ids = [row["id"] for row in self._conn.execute(
+                "SELECT id FROM documents WHERE start < ? AND end > ? AND indexed_at < ?",
+                (range_end, range_start, indexed_before)
+            )]
+        self.delete_events(ids)
+        return len(ids)
+
+    def search(self, query: str, start: Optional[str] = None, end: Optional[str] = None,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        """검색어와 일치하는 일정을 관련도 순으로 반환 (start/end는 UTC 정렬용 문자열)
+
+        모든 단어가 들어 있는 일정을 먼저 찾고, 없으면 단어 중 하나라도 들어 있는 일정을 찾습니다.
+        """
+        conditions, params = [], []
+        if start:
+            conditions.append("d.end > ?")
+            params.append(start)
+        if end:
+            conditions.append("d.start < ?")
+            params.append(end)
+        where = "".join(f" AND {condition}" for condition in conditions)
+
+        for operator in ("AND", "OR"):
+            if self.fts:
+                sql = (
+                    f"SELECT d.data FROM documents_fts JOIN documents d ON d.doc_id = documents_fts.rowid "
+                    f"WHERE documents_fts MATCH ?{where} "
+                    f"ORDER BY bm25(documents_fts, {', '.join(map(str, _WEIGHTS))}), d.start DESC LIMIT ?"
+                )
+                args = [match_query(query, operator), *params, limit]
+            else:
+                tokens = _TOKEN.findall(query)
+                if not tokens:
+                    raise ValueError("검색어가 비어 있습니다")
+                likes = f" {operator} ".join("d.data LIKE ?" for _ in tokens)
+                sql = f"SELECT d.data FROM documents d WHERE ({likes}){where} ORDER BY d.start DESC LIMIT ?"
+                args = [*(f"%{token}%" for token in tokens), *params, limit]
+
+            with self._lock:
+                rows = self._conn.execute(sql, args).fetchall()
+            if rows or len(_TOKEN.findall(query)) == 1:
+                break
+        return [json.loads(row["data"]) for row in rows]
+
+    def count(self) -> int:
+        """색인된 일정 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def get_state(self, name: str = "history") -> Optional[Dict[str, Any]]:
+        """색인 범위 조회"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM search_state WHERE name = ?", (name,)).fetchone()
+        return dict(row) if row else None
+
+    def save_state(self, range_start: str, range_end: str, indexed_at: float, name: str = "history"):
+        """색인 범위 저장"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_state (name, range_start, range_end, indexed_at) VALUES (?, ?, ?, ?)",
+                (name, range_start, range_end, indexed_at)
+            )
+
+    def close(self):
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+class EventSearch:
+    """계정의 검색 색인 관리
+
+    SEARCH_HISTORY_DAYS일 전부터 SEARCH_FUTURE_DAYS일 후까지 calendarView를 백그라운드에서 색인하고
+    (SEARCH_REINDEX_HOURS마다 다시 색인), 이후에는 미러 동기화와 쓰기 결과를 반영합니다.
+    검색은 지금 있는 색인으로 바로 답하며, 색인을 한 번도 만들지 않았을 때만 완료를 기다립니다.
+    """
+
+    def __init__(self, outlook_client, index: Optional[SearchIndex] = None):
+        self.outlook_client = outlook_client
+        self._index = index
+        self._reindex_task: Optional[asyncio.Task] = None
+
+    @property
+    def index(self) -> SearchIndex:
+        """DB 파일은 처음 사용할 때 생성"""
+        if self._index is None:
+            self._index = SearchIndex(search_db_file(self.outlook_client.account))
+        return self._index
+
+    def add(self, events: Iterable[Dict[str, Any]]):
+        """조회/동기화/쓰기로 받은 일정 반영"""
+        if config.SEARCH_ENABLED:
+            self.index.upsert_events(events)
+
+    def remove(self, event_ids: Iterable[str]):
+        """삭제된 일정 반영"""
+        if config.SEARCH_ENABLED:
+            self.index.delete_events(event_ids)
+
+    def _target_range(self) -> tuple:
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (
+            format_utc(today - timedelta(days=config.SEARCH_HISTORY_DAYS)),
+            format_utc(today + timedelta(days=config.SEARCH_FUTURE_DAYS))
+        )
+
+    @property
+    def indexed(self) -> bool:
+        """전체 색인을 한 번이라도 만들었는지"""
+        return self.index.get_state() is not None
+
+    def _fresh(self) -> bool:
+        state = self.index.get_state()
+        return bool(state) and time.time() - state["indexed_at"] < config.SEARCH_REINDEX_HOURS * 3600
+
+    def start_reindex(self) -> Optional[asyncio.Task]:
+        """색인이 없거나 오래되었으면 백그라운드 색인 시작 (이미 실행 중이면 그 태스크 반환)"""
+        if self._reindex_task is None and not self._fresh():
+            self._reindex_task = asyncio.create_task(self._reindex())
+            self._reindex_task.add_done_callback(self._reindex_done)
+        return self._reindex_task
+
+    def _reindex_done(self, task: asyncio.Task):
+        self._reindex_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("검색 색인 실패: %s", task.exception())
+
+    async def stop(self):
+        """진행 중인 백그라운드 색인 취소"""
+        task = self._reindex_task
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _reindex(self):
+        """calendarView로 전체 색인 (다른 워커가 다시 색인 중이면 건너뛰고, 첫 색인이면 그 워커가 끝나길 기다림)"""
+        store = self.outlook_client.auth_manager.token_store
+        async with cross_process_lock(
+            store, f"search-index:{self.outlook_client.mailbox}", ttl=REINDEX_LOCK_TTL,
+            timeout=0 if self.indexed else REINDEX_LOCK_TTL
+        ) as acquired:
+            # 기다리는 동안 다른 워커가 끝냈을 수 있음
+            if not acquired or self._fresh():
+                return
+
+            range_start, range_end = self._target_range()
+            started = time.time()
+            logger.info("검색 색인 시작: %s ~ %s", range_start, range_end)
+            count = 0
+            async for page in self.outlook_client.iter_event_pages(
+                start_date=range_start + "Z", end_date=range_end + "Z",
+                page_size=config.SEARCH_PAGE_SIZE, max_results=0, fields=SEARCH_FIELDS
+            ):
+                self.index.upsert_events(page)
+                count += len(page)
+
+            removed = self.index.delete_stale(range_start, range_end, started)
+            self.index.save_state(range_start, range_end, started)
+            logger.info("검색 색인 완료: %d개 색인, %d개 삭제 (%.1f초)", count, removed, time.time() - started)
+
+    async def search(self, query: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                     limit: int = 20) -> List[Dict[str, Any]]:
+        """일정 검색 (관련도 순, 색인이 아직 없을 때만 첫 색인을 기다림)"""
+        task = self.start_reindex()
+        if task is not None and not self.indexed:
+            await asyncio.shield(task)
+        return self.index.search(
+            query,
+            normalize_datetime(start_date) if start_date else None,
+            normalize_datetime(end_date) if end_date else None,
+            limit
+        )
@@ -0,0 +1,100 @@
+import asyncio
+import importlib
+import secrets
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from .config import config
+
+class StateBackend(ABC):
+    """여러 프로세스(워커)가 공유하는 상태 저장소 인터페이스
+
+    토큰, 만료 시간이 있는 키-값(OAuth state, 공유 응답 캐시, 변경 알림 구독), 프로세스 간 잠금을 제공합니다.
+    기본 구현은 SQLite(WAL) 파일인 TokenStore이며, STATE_BACKEND="모듈:클래스"로 다른 구현을 쓸 수 있습니다.
+    """
+
+    # 토큰
+    @abstractmethod
+    def get(self, account: str) -> Optional[Dict[str, Any]]:
+        """계정의 토큰 (없으면 None)"""
+
+    @abstractmethod
+    def put(self, account: str, token_data: Dict[str, Any]):
+        """계정의 토큰 저장"""
+
+    @abstractmethod
+    def delete(self, account: str):
+        """계정의 토큰 삭제"""
+
+    @abstractmethod
+    def list_accounts(self) -> List[str]:
+        """토큰이 저장된 계정 목록"""
+
+    # 키-값 (ttl이 None이면 만료 없음, 만료된 값은 없는 것으로 취급)
+    @abstractmethod
+    def get_value(self, namespace: str, key: str) -> Any:
+        """값 조회 (없거나 만료되었으면 None)"""
+
+    @abstractmethod
+    def set_value(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """값 저장 (JSON으로 직렬화 가능한 값)"""
+
+    @abstractmethod
+    def pop_value(self, namespace: str, key: str) -> Any:
+        """값을 꺼내면서 삭제 (여러 프로세스가 동시에 꺼내도 한 곳만 값을 받음)"""
+
+    @abstractmethod
+    def scan_values(self, namespace: str, prefix: str = "") -> List[Tuple[str, Any]]:
+        """prefix로 시작하는 키의 (키, 값) 목록"""
+
+    @abstractmethod
+    def delete_values(self, namespace: str, keys: List[str]):
+        """여러 키 삭제"""
+
+    # 프로세스 간 잠금 (ttl초가 지나면 주인이 죽은 것으로 보고 풀림)
+    @abstractmethod
+    def try_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """잠금 시도 (이미 다른 주인이 잡고 있으면 False)"""
+
+    @abstractmethod
+    def unlock(self, name: str, owner: str):
+        """owner가 잡은 잠금 해제"""
+
+def create_state_backend() -> StateBackend:
+    """STATE_BACKEND 설정에 맞는 저장소 생성 (sqlite 또는 "모듈:클래스")"""
+    if config.STATE_BACKEND == "sqlite":
+        from .token_store import TokenStore
+        return TokenStore()
+
+    module_name, _, class_name = config.STATE_BACKEND.partition(":")
+    if not class_name:
+        raise ValueError(f"STATE_BACKEND 형식 오류 (sqlite 또는 모듈:클래스): {config.STATE_BACKEND}")
+    backend = getattr(importlib.import_module(module_name), class_name)()
+    if not isinstance(backend, StateBackend):
+        raise ValueError(f"{config.STATE_BACKEND}는 StateBackend가 아닙니다")
+    return backend
+
+@asynccontextmanager
+async def cross_process_lock(backend: StateBackend, name: str, ttl: Optional[float] = None,
+                             timeout: Optional[float] = None) -> AsyncIterator[bool]:
+    """다른 프로세스와 겹치지 않도록 잠금 (timeout 안에 못 잡으면 False로 진행)
+
+    잠금을 쥔 프로세스가 죽어도 ttl초 뒤에는 다른 프로세스가 잡을 수 있습니다.
+    """
+    ttl = config.STATE_LOCK_TTL if ttl is None else ttl
+    timeout = config.STATE_LOCK_TIMEOUT if timeout is None else timeout
+    owner = secrets.token_hex(8)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.02
+
+    acquired = backend.try_lock(name, owner, ttl)
+    while not acquired and loop.time() < deadline:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.5)
+        acquired = backend.try_lock(name, owner, ttl)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            backend.unlock(name, owner)
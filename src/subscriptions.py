@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+import httpx
+from .config import config
+from .metrics import WEBHOOK_NOTIFICATIONS
+from .outlook_client import OutlookClient
+from .state_store import StateBackend, cross_process_lock
+from .time_utils import format_utc, parse_graph_datetime
+
+logger = logging.getLogger("outlook-mcp")
+
+# 구독 ID -> {"account", "expires"}를 저장하는 상태 저장소 이름공간 (어느 워커로 알림이 와도 처리)
+SUBSCRIPTION_NAMESPACE = "subscription"
+
+# 다른 워커가 받은 알림을 on_change로 전달할 때의 changeType
+REMOTE_CHANGE = "remote"
+
+class SubscriptionManager:
+    """계정별 /me/events 변경 알림 구독 관리
+
+    웹 앱의 /webhooks/graph로 들어온 알림을 계정별 on_change 콜백으로 전달하고,
+    만료 SUBSCRIPTION_RENEW_AHEAD초 전에 구독을 연장합니다.
+    구독이 살아 있는 계정은 주기적 동기화 대신 알림으로 캐시를 무효화할 수 있습니다.
+    구독과 비밀 값은 상태 저장소에 두어 여러 워커가 계정당 구독 하나를 함께 씁니다.
+    """
+
+    def __init__(self, get_client: Callable[[str], OutlookClient],
+                 on_change: Callable[[str, Optional[str], Optional[str]], None],
+                 get_store: Callable[[], StateBackend]):
+        self.get_client = get_client
+        self.on_change = on_change
+        self.get_store = get_store
+        # 알림이 우리가 만든 구독에서 온 것인지 확인하는 비밀 값 (설정이 없으면 상태 저장소에서 공유)
+        self._client_state: Optional[str] = config.WEBHOOK_CLIENT_STATE or None
+        # 구독 ID -> {"account", "expires"(epoch 초)}
+        self._subscriptions: Dict[str, Dict[str, Any]] = {}
+        # 계정별로 마지막으로 반영한 변경 표시 (다른 워커가 받은 알림 감지용)
+        self._seen_changes: Dict[str, Optional[str]] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+        # 수명 주기 알림(reauthorizationRequired)으로 시작한 연장 작업
+        self._renewals: Set[asyncio.Task] = set()
+        self._renew_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(config.WEBHOOK_URL)
+
+    @property
+    def client_state(self) -> str:
+        if self._client_state is None:
+            self._client_state = self.get_store().get_value(SUBSCRIPTION_NAMESPACE, "client_state")
+        return self._client_state or ""
+
+    async def _ensure_client_state(self) -> str:
+        """공유 비밀 값이 없으면 생성 (워커들이 동시에 만들지 않도록 잠금)"""
+        if self._client_state is None:
+            store = self.get_store()
+            async with cross_process_lock(store, "subscription:client_state"):
+                value = store.get_value(SUBSCRIPTION_NAMESPACE, "client_state")
+                if value is None:
+                    value = secrets.token_urlsafe(24)
+                    store.set_value(SUBSCRIPTION_NAMESPACE, "client_state", value)
+                self._client_state = value
+        return self._client_state
+
+    def _lookup(self, subscription_id: str) -> Optional[Dict[str, Any]]:
+        """구독 조회 (다른 워커가 만든 구독이면 상태 저장소에서 가져옴)"""
+        subscription = self._subscriptions.get(subscription_id)
+        if subscription is None and subscription_id:
+            subscription = self.get_store().get_value(SUBSCRIPTION_NAMESPACE, f"id:{subscription_id}")
+            if subscription is not None:
+                self._subscriptions[subscription_id] = subscription
+        return subscription
+
+    def _shared_subscription(self, account: str) -> Optional[str]:
+        """다른 워커가 만든 계정 구독을 가져와 ID 반환"""
+        for key, subscription in self.get_store().scan_values(SUBSCRIPTION_NAMESPACE, "id:"):
+            if subscription["account"] == account:
+                self._subscriptions[key[len("id:"):]] = subscription
+                return key[len("id:"):]
+        return None
+
+    def active(self, account: str) -> bool:
+        """계정에 유효한 구독이 있는지 (있으면 다른 워커가 받은 알림도 반영)"""
+        now = time.time()
+        if not any(
+            subscription["account"] == account and subscription["expires"] > now
+            for subscription in self._subscriptions.values()
+        ):
+            return False
+
+        changed = self.get_store().get_value(SUBSCRIPTION_NAMESPACE, f"changed:{account}")
+        if changed != self._seen_changes.get(account):
+            self._seen_changes[account] = changed
+            self.on_change(account, None, REMOTE_CHANGE)
+        return True
+
+    def _mark_changed(self, account: str):
+        """다른 워커가 다음 조회 때 알림을 반영하도록 변경 표시 갱신"""
+        changed = secrets.token_hex(8)
+        self._seen_changes[account] = changed
+        self.get_store().set_value(SUBSCRIPTION_NAMESPACE, f"changed:{account}", changed)
+
+    def start(self, accounts: List[str]):
+        """저장된 계정의 구독 생성과 연장 작업 시작"""
+        if not self.enabled:
+            return
+        for account in accounts:
+            self.add(account)
+        if self._renew_task is None or self._renew_task.done():
+            self._renew_task = asyncio.create_task(self._renew_loop())
+
+    def add(self, account: str):
+        """계정 구독을 백그라운드에서 생성 (이미 있거나 생성 중이면 무시)"""
+        if not self.enabled or self.active(account) or account in self._pending:
+            return
+        task = asyncio.create_task(self._subscribe(account))
+        self._pending[account] = task
+        task.add_done_callback(lambda _: self._pending.pop(account, None))
+
+    def _expiration(self) -> str:
+        expires = datetime.now(timezone.utc) + timedelta(minutes=config.SUBSCRIPTION_LIFETIME_MINUTES)
+        return format_utc(expires) + "Z"
+
+    def _remember(self, account: str, subscription: Dict[str, Any]):
+        remembered = self._subscriptions[subscription["id"]] = {
+            "account": account,
+            "expires": parse_graph_datetime(subscription["expirationDateTime"]).timestamp()
+        }
+        self.get_store().set_value(
+            SUBSCRIPTION_NAMESPACE, f"id:{subscription['id']}", remembered, remembered["expires"] - time.time()
+        )
+
+    def _forget(self, subscription_id: str):
+        self._subscriptions.pop(subscription_id, None)
+        self.get_store().delete_values(SUBSCRIPTION_NAMESPACE, [f"id:{subscription_id}"])
+
+    async def _subscribe(self, account: str):
+        client_state = await self._ensure_client_state()
+        async with cross_process_lock(self.get_store(), f"subscription:{account}"):
+            # 다른 워커가 이미 만든 구독이 있으면 그대로 사용
+            if self._shared_subscription(account) is not None:
+                logger.info("다른 워커의 변경 알림 구독 사용", extra={"fields": {"account": account}})
+                return
+            created = await self._create(account, client_state)
+        if created:
+            # 구독 전에 일어난 변경을 놓치지 않도록 한 번 무효화
+            self.on_change(account, None, None)
+
+    async def _create(self, account: str, client_state: str) -> bool:
+        """구독 생성 (계정 잠금을 쥔 상태에서 호출)"""
+        try:
+            subscription = await self.get_client(account).create_subscription(
+                config.WEBHOOK_URL, client_state, self._expiration()
+            )
+        except Exception as e:
+            logger.error("변경 알림 구독 생성 실패: %s", e, extra={"fields": {"account": account}})
+            return False
+        self._remember(account, subscription)
+        logger.info("변경 알림 구독 생성 (만료 %s)", subscription["expirationDateTime"],
+                    extra={"fields": {"account": account, "subscription_id": subscription.get("id")}})
+        return True
+
+    async def _renew(self, subscription_id: str):
+        subscription = self._lookup(subscription_id)
+        if subscription is None:
+            return
+        account = subscription["account"]
+        async with cross_process_lock(self.get_store(), f"subscription:{account}"):
+            # 기다리는 동안 다른 워커가 연장했으면 그 만료 시각을 사용
+            shared = self.get_store().get_value(SUBSCRIPTION_NAMESPACE, f"id:{subscription_id}")
+            if shared is not None and shared["expires"] - time.time() > config.SUBSCRIPTION_RENEW_AHEAD:
+                self._subscriptions[subscription_id] = shared
+                return
+            await self._renew_locked(subscription_id, account)
+
+    async def _renew_locked(self, subscription_id: str, account: str):
+        try:
+            renewed = await self.get_client(account).renew_subscription(subscription_id, self._expiration())
+            self._remember(account, renewed)
+            logger.info("변경 알림 구독 연장 (만료 %s)", renewed["expirationDateTime"],
+                        extra={"fields": {"account": account, "subscription_id": subscription_id}})
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                logger.error("변경 알림 구독 연장 실패: %s", e, extra={"fields": {"account": account}})
+                return
+            # Graph에서 이미 삭제된 구독: 새로 만들고 그 사이 변경은 무효화로 처리
+            logger.warning("변경 알림 구독이 사라져 다시 생성합니다", extra={"fields": {"account": account}})
+            self._forget(subscription_id)
+            if await self._create(account, self.client_state):
+                self.on_change(account, None, None)
+        except Exception as e:
+            logger.error("변경 알림 구독 연장 실패: %s", e, extra={"fields": {"account": account}})
+
+    async def _renew_loop(self):
+        """만료가 다가온 구독을 연장 (연장에 실패한 구독은 만료 시 주기적 동기화로 돌아감)"""
+        while True:
+            now = time.time()
+            next_check = 600.0
+            for subscription_id, subscription in list(self._subscriptions.items()):
+                delay = subscription["expires"] - now - config.SUBSCRIPTION_RENEW_AHEAD
+                if delay > 0:
+                    next_check = min(next_check, delay)
+                else:
+                    await self._renew(subscription_id)
+            await asyncio.sleep(max(1.0, next_check))
+
+    async def remove(self, account: str):
+        """계정 구독 삭제 (로그아웃 시)"""
+        pending = self._pending.pop(account, None)
+        if pending is not None:
+            pending.cancel()
+        for subscription_id, subscription in list(self._subscriptions.items()):
+            if subscription["account"] != account:
+                continue
+            self._forget(subscription_id)
+            try:
+                await self.get_client(account).delete_subscription(subscription_id)
+            except Exception as e:
+                logger.warning("변경 알림 구독 삭제 실패: %s", e, extra={"fields": {"account": account}})
+
+    async def stop(self):
+        """연장 작업을 멈추고 구독 삭제 (재시작하면 새로 만듦, 여러 워커로 실행 중이면 다른 워커가 쓰도록 남김)"""
+        tasks = [task for task in [self._renew_task, *self._pending.values(), *self._renewals] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._renew_task = None
+        if config.MCP_HTTP_WORKERS > 1:
+            self._subscriptions.clear()
+            return
+        for account in {subscription["account"] for subscription in self._subscriptions.values()}:
+            await self.remove(account)
+
+    def handle(self, notifications: List[Dict[str, Any]]) -> int:
+        """알림 목록 처리 (Graph가 재전송하지 않도록 빠르게 반환, 처리한 알림 수 반환)"""
+        handled = 0
+        for notification in notifications:
+            subscription = self._lookup(notification.get("subscriptionId", ""))
+            if subscription is None or not secrets.compare_digest(
+                notification.get("clientState") or "", self.client_state
+            ):
+                WEBHOOK_NOTIFICATIONS.labels("rejected").inc()
+                logger.warning("알 수 없는 구독의 알림 무시",
+                               extra={"fields": {"subscription_id": notification.get("subscriptionId")}})
+                continue
+
+            account = subscription["account"]
+            lifecycle_event = notification.get("lifecycleEvent")
+            if lifecycle_event:
+                WEBHOOK_NOTIFICATIONS.labels("lifecycle").inc()
+                logger.info("구독 수명 주기 알림: %s", lifecycle_event, extra={"fields": {"account": account}})
+                # missed: 알림이 누락됨, subscriptionRemoved: 다시 만들어야 함, reauthorizationRequired: 연장 필요
+                if lifecycle_event == "subscriptionRemoved":
+                    self._forget(notification["subscriptionId"])
+                    self.add(account)
+                elif lifecycle_event == "reauthorizationRequired":
+                    task = asyncio.create_task(self._renew(notification["subscriptionId"]))
+                    self._renewals.add(task)
+                    task.add_done_callback(self._renewals.discard)
+                self.on_change(account, None, None)
+            else:
+                change_type = notification.get("changeType", "unknown")
+                WEBHOOK_NOTIFICATIONS.labels(change_type).inc()
+                self.on_change(account, (notification.get("resourceData") or {}).get("id"), change_type)
+            self._mark_changed(account)
+            handled += 1
+        return handled
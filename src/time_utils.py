@@ -0,0 +1,33 @@
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+_FRACTION = re.compile(r"\.(\d+)")
+
+def parse_graph_datetime(value: str) -> datetime:
+    """Graph/ISO 8601 문자열을 UTC datetime으로 변환 (시간대가 없으면 UTC로 간주)"""
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+
+    # Graph는 소수점 이하 7자리를 반환하므로 fromisoformat이 받는 6자리로 맞춤
+    value = _FRACTION.sub(lambda m: "." + m.group(1)[:6].ljust(6, "0"), value, count=1)
+
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+def format_utc(dt: datetime) -> str:
+    """UTC 기준 정렬 가능한 문자열로 변환 (예: 2024-01-01T10:00:00)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+def normalize_datetime(value: str) -> str:
+    """ISO 8601 문자열을 UTC 정렬용 문자열로 정규화"""
+    return format_utc(parse_graph_datetime(value))
+
+def event_time(event: Dict[str, Any], key: str) -> str:
+    """일정의 start/end 값을 UTC 정렬용 문자열로 반환"""
+    return normalize_datetime((event.get(key) or {}).get("dateTime", "1970-01-01T00:00:00"))
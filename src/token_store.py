@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .config import config
+from .state_store import StateBackend
+
+logger = logging.getLogger("outlook-mcp")
+
+# 계정을 알 수 없는 기존 token.json은 이 키로 가져옴
+LEGACY_ACCOUNT = "default"
+
+class TokenStore(StateBackend):
+    """계정별 토큰과 공유 상태 저장소 (SQLite WAL, 여러 프로세스에서 공유 가능, 기본 StateBackend)"""
+
+    def __init__(self, db_file: Optional[str] = None):
+        self.db_file = db_file or config.TOKEN_DB_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tokens (
+                    account TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS state_values (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_state_values_expires ON state_values (namespace, expires_at);
+                CREATE TABLE IF NOT EXISTS state_locks (
+                    name TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+            """)
+        self._import_legacy_file()
+
+    def _import_legacy_file(self):
+        """단일 사용자용 TOKEN_FILE이 있으면 저장소로 가져옴"""
+        if not config.TOKEN_FILE or not os.path.exists(config.TOKEN_FILE) or self.list_accounts():
+            return
+        try:
+            with open(config.TOKEN_FILE, 'r') as f:
+                token_data = json.load(f)
+        except Exception:
+            return
+        self.put(token_data.get("account", LEGACY_ACCOUNT), token_data)
+        logger.info("기존 토큰 파일을 계정 저장소로 가져왔습니다.", extra={"fields": {"path": config.TOKEN_FILE}})
+
+    def get(self, account: str) -> Optional[Dict[str, Any]]:
+        """계정 토큰 조회"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM tokens WHERE account = ?", (account,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def put(self, account: str, token_data: Dict[str, Any]):
+        """계정 토큰 저장"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tokens (account, data, updated_at) VALUES (?, ?, ?)",
+                (account, json.dumps(token_data), time.time())
+            )
+
+    def delete(self, account: str):
+        """계정 토큰 삭제"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tokens WHERE account = ?", (account,))
+
+    def list_accounts(self) -> List[str]:
+        """최근 저장 순으로 계정 목록 반환"""
+        with self._lock:
+            rows = self._conn.execute("SELECT account FROM tokens ORDER BY updated_at DESC").fetchall()
+        return [row["account"] for row in rows]
+
+    def get_value(self, namespace: str, key: str) -> Any:
+        """만료되지 않은 값 조회"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state_values WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time())
+            ).fetchone()
+        return json.loads(row["value"]) if row else None
+
+    def set_value(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """값 저장 (같은 이름공간의 만료된 값은 이때 정리)"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM state_values WHERE namespace = ? AND expires_at <= ?", (namespace, now)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state_values (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), now + ttl if ttl is not None else None)
+            )
+
+    def pop_value(self, namespace: str, key: str) -> Any:
+        """값을 꺼내면서 삭제 (DELETE에 성공한 프로세스만 값을 받음)"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM state_values WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            deleted = self._conn.execute(
+                "DELETE FROM state_values WHERE namespace = ? AND key = ?", (namespace, key)
+            ).rowcount
+        if not deleted or (row["expires_at"] is not None and row["expires_at"] <= time.time()):
+            return None
+        return json.loads(row["value"])
+
+    def scan_values(self, namespace: str, prefix: str = "") -> List[Tuple[str, Any]]:
+        """키가 prefix로 시작하는 만료되지 않은 값 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM state_values WHERE namespace = ? AND key >= ? AND key < ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, prefix, prefix + "\U0010ffff", time.time())
+            ).fetchall()
+        return [(row["key"], json.loads(row["value"])) for row in rows]
+
+    def delete_values(self, namespace: str, keys: List[str]):
+        """값 삭제"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM state_values WHERE namespace = ? AND key = ?", [(namespace, key) for key in keys]
+            )
+
+    def try_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """잠금 시도 (비어 있거나 만료된 잠금만 가져옴, 같은 주인이면 연장)"""
+        now = time.time()
+        with self._lock, self._conn:
+            acquired = self._conn.execute(
+                "INSERT INTO state_locks (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE state_locks.expires_at <= ? OR state_locks.owner = excluded.owner",
+                (name, owner, now + ttl, now)
+            ).rowcount
+        return acquired == 1
+
+    def unlock(self, name: str, owner: str):
+        """잠금 해제 (주인일 때만)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM state_locks WHERE name = ? AND owner = ?", (name, owner))
@@ -0,0 +1,165 @@
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from typing import AsyncContextManager, Callable, Optional
+import uvicorn
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+from .config import config
+from .auth_manager import AuthManager
+from .graph_scheduler import graph_scheduler
+from .metrics import registry
+from .subscriptions import SubscriptionManager
+from .mcp_http import McpHttpTransport
+
+logger = logging.getLogger("outlook-mcp")
+
+def create_app(auth_manager: AuthManager, subscriptions: Optional[SubscriptionManager] = None,
+               mcp_transport: Optional[McpHttpTransport] = None,
+               lifespan: Optional[Callable[[], AsyncContextManager]] = None) -> FastAPI:
+    """OAuth 로그인/상태 확인, Graph 변경 알림 수신용 FastAPI 앱 생성
+
+    mcp_transport가 있으면 MCP HTTP 전송도 제공하고, lifespan이 있으면 앱 수명 동안 함께 실행합니다.
+    """
+
+    @asynccontextmanager
+    async def app_lifespan(app: FastAPI):
+        async with AsyncExitStack() as stack:
+            if lifespan is not None:
+                await stack.enter_async_context(lifespan())
+            if mcp_transport is not None:
+                await stack.enter_async_context(mcp_transport.run())
+            yield
+
+    # FastAPI 앱 (OAuth callback용, HTTP 커넥션 풀은 MCP 서버와 공유하므로 여기서 닫지 않음)
+    app = FastAPI(title="Outlook Calendar MCP Server", lifespan=app_lifespan)
+    if mcp_transport is not None:
+        app.router.routes.extend(mcp_transport.routes)
+
+    @app.get("/")
+    async def root():
+        """서버 상태 확인"""
+        is_authenticated = await auth_manager.is_authenticated()
+        return {
+            "message": "Outlook Calendar MCP Server",
+            "authenticated": is_authenticated,
+            "accounts": auth_manager.list_accounts(),
+            "auth_url": "/auth/login" if not is_authenticated else None
+        }
+
+    @app.get("/stats")
+    async def stats():
+        """Graph 스케줄러 통계 (메일박스별 대기열, 스로틀링 횟수)"""
+        return {"graph": graph_scheduler.stats()}
+
+    @app.get("/metrics")
+    async def metrics():
+        """Prometheus 지표 (텍스트 노출 형식)"""
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    @app.get("/auth/login")
+    async def login(account: str | None = Query(None)):
+        """OAuth 로그인 시작 (account를 지정하면 해당 계정으로 로그인 유도)"""
+        logger.info("OAuth 로그인 시작")
+        auth_url, _ = auth_manager.get_authorization_url(login_hint=account)
+
+        return HTMLResponse(f"""
+        <html>
+            <head><title>Outlook Calendar 인증</title></head>
+            <body>
+                <h1>Outlook Calendar 인증</h1>
+                <p>아래 링크를 클릭하여 Microsoft 계정으로 로그인하세요:</p>
+                <a href="{auth_url}" target="_blank">Microsoft 로그인</a>
+            </body>
+        </html>
+        """)
+
+    @app.get("/auth/callback")
+    async def auth_callback(code: str = Query(...), state: str = Query(...)):
+        """OAuth callback 처리 (state는 상태 저장소에 있으므로 로그인을 시작한 워커가 아니어도 됨)"""
+        logger.info("OAuth callback 받음", extra={"fields": {"state": state}})
+        if not auth_manager.consume_state(state):
+            logger.error("잘못된 state 값")
+            raise HTTPException(status_code=400, detail="잘못된 state 값")
+
+        try:
+            token_data = await auth_manager.exchange_code_for_token(code)
+            logger.info("OAuth 인증 성공", extra={"fields": {"account": token_data["account"]}})
+            if subscriptions is not None:
+                subscriptions.add(token_data["account"])
+
+            return HTMLResponse("""
+            <html>
+                <head><title>인증 완료</title></head>
+                <body>
+                    <h1>인증 완료!</h1>
+                    <p>성공적으로 인증되었습니다. 이제 창을 닫으셔도 됩니다.</p>
+                    <script>window.close();</script>
+                </body>
+            </html>
+            """)
+        except Exception as e:
+            logger.error("OAuth 인증 실패: %s", e)
+            raise HTTPException(status_code=400, detail=f"인증 실패: {str(e)}")
+
+    @app.get("/auth/logout")
+    async def logout(account: str | None = Query(None)):
+        """로그아웃 (account 미지정 시 기본 계정)"""
+        logger.info("로그아웃 요청")
+        account = await auth_manager.resolve_account(account)
+        if subscriptions is not None and account:
+            await subscriptions.remove(account)
+        await auth_manager.clear_token(account)
+        return {"message": "로그아웃되었습니다."}
+
+    @app.post("/webhooks/graph")
+    async def graph_notifications(request: Request, validationToken: str | None = Query(None)):
+        """Graph 변경/수명 주기 알림 수신 (구독 생성 시 validationToken을 그대로 돌려줘야 함)"""
+        # 변경 알림을 쓰지 않으면(WEBHOOK_URL 미설정) 검증 요청에도 응답하지 않음
+        if subscriptions is None or not subscriptions.enabled:
+            raise HTTPException(status_code=404, detail="변경 알림을 사용하지 않습니다")
+        if validationToken is not None:
+            return PlainTextResponse(validationToken)
+
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="잘못된 알림 형식")
+        handled = subscriptions.handle(payload.get("value", []))
+        logger.info("Graph 변경 알림 %d개 처리", handled)
+        # 3초 안에 2xx를 받지 못하면 Graph가 재전송하므로 캐시 무효화만 하고 바로 응답
+        return Response(status_code=202)
+
+    return app
+
+class EmbeddedServer(uvicorn.Server):
+    """다른 태스크와 같은 이벤트 루프에서 도는 uvicorn 서버 (종료 신호는 호출 측에서 처리)"""
+
+    @contextmanager
+    def capture_signals(self):
+        yield
+
+    def install_signal_handlers(self):
+        # uvicorn 0.29 이전 버전용
+        pass
+
+def create_web_server(app: FastAPI) -> EmbeddedServer:
+    """현재 이벤트 루프에서 serve()로 실행할 웹 서버 생성"""
+    return EmbeddedServer(uvicorn.Config(
+        app,
+        host=config.HOST,
+        port=config.PORT,
+        log_level="warning",
+        timeout_graceful_shutdown=int(config.SHUTDOWN_TIMEOUT)
+    ))
+
+def run_workers(app_factory: str, workers: int):
+    """앱 팩토리("모듈:함수")로 워커 프로세스 여러 개 실행 (워커 사이 상태는 상태 저장소로 공유)"""
+    uvicorn.run(
+        app_factory,
+        factory=True,
+        workers=workers,
+        host=config.HOST,
+        port=config.PORT,
+        log_level="warning",
+        timeout_graceful_shutdown=int(config.SHUTDOWN_TIMEOUT)
+    )